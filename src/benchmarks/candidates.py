@@ -0,0 +1,100 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from trading.strategies.polymarket.nothing_ever_happens import SpecConfig, select_candidates
+
+"""
+    NothingEverHappens candidate selection: the old groupby('event_id').apply(select_row) vs the vectorized
+    select_candidates, on synthetic market frames with ~3 markets per event, multi-event markets, missing
+    prices / event ids and plenty of equal distances to the target price. the outputs must be identical.
+
+    run from src/:
+        python -m benchmarks.candidates
+"""
+
+
+def synthetic_candidates(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    p1 = rng.integers(1, 100, n) / 100           # on the cent grid -> lots of ties
+    p1[rng.random(n) < 0.01] = np.nan
+    event_ids = np.array([f"event-{i}" for i in rng.integers(0, max(1, n // 3), n)], dtype=object)
+    event_ids[rng.random(n) < 0.01] = None
+    yes_first = rng.random(n) < 0.5
+    return pd.DataFrame({
+        'id': np.arange(n).astype(str),
+        'outcomePrices1': p1,
+        'outcomePrices2': 1 - p1,
+        'clobTokenIds1': [f"token-{i}-a" for i in range(n)],
+        'clobTokenIds2': [f"token-{i}-b" for i in range(n)],
+        'outcomes1': np.where(yes_first, 'Yes', 'No'),
+        'outcomes2': np.where(yes_first, 'No', 'Yes'),
+        'events': [[{}] if r > 0.05 else [{}, {}] for r in rng.random(n)],
+        'event_id': event_ids,
+        'slug': [f"market-{i}" for i in range(n)],
+        'volumeNum': rng.uniform(1e5, 1e7, n),
+    })
+
+
+def legacy_select_candidates(cands: pd.DataFrame, spec) -> pd.DataFrame:
+    """
+    get_candidate_markets before select_candidates.
+    """
+    msk = (cands['outcomePrices1'] < cands['outcomePrices2'])
+    cands['expensivePrice'] = np.maximum(cands['outcomePrices1'], cands['outcomePrices2'])
+    cands['expensiveToken'] = cands['clobTokenIds1']
+    cands.loc[msk, 'expensiveToken'] = cands['clobTokenIds2'][msk]
+    cands['expensiveBet'] = cands['outcomes1']
+    cands.loc[msk, 'expensiveBet'] = cands['outcomes2'][msk]
+    cands['eventCount'] = cands['events'].apply(lambda i: len(i))
+    cands = cands[cands['eventCount'] == 1].reset_index()
+
+    target_price = spec.get('target_price') or (spec['price_lower_bound'] + spec['price_upper_bound']) / 2
+
+    def select_row(grp):
+        msk = (
+            (grp['expensiveBet'] == 'No') &
+            (~pd.isnull(grp['expensivePrice'])) &
+            (grp['expensivePrice'] <= spec['price_upper_bound']) &
+            (grp['expensivePrice'] >= spec['price_lower_bound'])
+        )
+        if not msk.any():
+            return pd.DataFrame()
+
+        _cands = grp[msk]
+        row = _cands.loc[[_cands['expensivePrice'].sub(target_price).abs().idxmin()]]
+        row['event_id'] = grp.name
+        return row
+
+    return (
+        cands.groupby('event_id', group_keys=False)
+            .apply(select_row, include_groups=False)
+            .reset_index(drop=True)
+    )
+
+
+def best_of(fn, repeats: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    spec = SpecConfig().model_dump()
+    for n in (1_000, 10_000, 100_000):
+        frame = synthetic_candidates(n)
+        old = legacy_select_candidates(frame.copy(), spec)
+        new = select_candidates(frame.copy(), spec)
+        pd.testing.assert_frame_equal(old, new)
+
+        legacy_s = best_of(lambda: legacy_select_candidates(frame.copy(), spec), repeats=1 if n >= 100_000 else 3)
+        vectorized_s = best_of(lambda: select_candidates(frame.copy(), spec))
+        print(f"markets {n:7,}   candidates {len(new):6,}   groupby/apply {legacy_s * 1000:9.1f} ms   vectorized {vectorized_s * 1000:7.1f} ms   speedup {legacy_s / vectorized_s:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import ast
+import copy
+import inspect
+import json
+import random
+from typing import Any, Dict, List
+
+import polymarket.gamma_api.client as gamma_client
+
+"""
+    synthetic gamma payloads for the benchmarks, built from the example market object documented at the
+    bottom of polymarket/gamma_api/client.py, plus the original per-dict cleaning loop kept as a reference.
+"""
+
+
+def sample_market() -> Dict[str, Any]:
+    """
+    parses the example get_markets object out of the gamma client's module source.
+    """
+    src = inspect.getsource(gamma_client)
+    start = src.index("{", src.index("Example return object for get_markets:"))
+    end = src.rindex("}") + 1
+    return ast.literal_eval(src[start:end])
+
+
+def synthetic_markets(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    n copies of the sample market with distinct ids/tokens/events and jittered prices, in the same
+    mix of stringified and native values that gamma sends.
+    """
+    rng = random.Random(seed)
+    base = sample_market()
+    out = []
+    for i in range(n):
+        m = copy.deepcopy(base)
+        yes = round(rng.uniform(0.01, 0.99), 3)
+        m['id'] = str(500000 + i)
+        m['slug'] = f"{base['slug']}-{i}"
+        m['conditionId'] = f"0x{i:064x}"
+        m['outcomePrices'] = json.dumps([str(yes), str(round(1 - yes, 3))])
+        m['clobTokenIds'] = json.dumps([str(10**70 + 2 * i), str(10**70 + 2 * i + 1)])
+        m['liquidity'] = str(rng.uniform(1e3, 1e6))
+        m['volume'] = str(rng.uniform(1e4, 1e7))
+        m['spread'] = round(rng.uniform(0.001, 0.2), 3)
+        m['bestBid'] = yes - m['spread'] / 2
+        m['bestAsk'] = yes + m['spread'] / 2
+        m['events'][0]['ticker'] = f"event-{i // 3}"
+        m['events'][0]['slug'] = f"event-{i // 3}"
+        out.append(m)
+    return out
+
+
+def legacy_clean_markets(res: List[Dict[str, Any]], keys) -> Any:
+    """
+    the per-dict cleaning loop get_recent_markets used before markets_to_frame. mutates `res` in place.
+    """
+    import pandas as pd
+
+    for market in res:
+        json_fields = ['outcomes', 'outcomePrices', 'clobTokenIds', 'umaResolutionStatuses']
+        for field in json_fields:
+            if field in market and isinstance(market[field], str):
+                try:
+                    market[field] = json.loads(market[field])
+                except (json.JSONDecodeError, TypeError):
+                    pass
+
+        float_fields = [
+            'liquidity', 'volume', 'volumeNum', 'liquidityNum',
+            'volume24hr', 'volume1wk', 'volume1mo', 'volume1yr',
+            'umaBond', 'umaReward', 'volume24hrClob', 'volume1wkClob',
+            'volume1moClob', 'volume1yrClob', 'volumeClob', 'liquidityClob',
+            'orderPriceMinTickSize', 'orderMinSize', 'rewardsMinSize',
+            'rewardsMaxSpread', 'spread', 'oneDayPriceChange',
+            'oneWeekPriceChange', 'lastTradePrice', 'bestBid', 'bestAsk'
+        ]
+        for field in float_fields:
+            if field in market and isinstance(market[field], str):
+                try:
+                    market[field] = float(market[field])
+                except (ValueError, TypeError):
+                    pass
+
+        bool_fields = [
+            'active', 'closed', 'new', 'featured', 'archived', 'restricted',
+            'enableOrderBook', 'hasReviewedDates', 'acceptingOrders', 'negRisk',
+            'ready', 'funded', 'cyom', 'pagerDutyNotificationEnabled', 'approved',
+            'automaticallyActive', 'clearBookOnStart', 'showGmpSeries',
+            'showGmpOutcome', 'manualActivation', 'negRiskOther', 'pendingDeployment',
+            'deploying', 'rfqEnabled'
+        ]
+        for field in bool_fields:
+            if field in market and isinstance(market[field], str):
+                if market[field].lower() == 'true':
+                    market[field] = True
+                elif market[field].lower() == 'false':
+                    market[field] = False
+
+        int_fields = ['id', 'commentCount']
+        for field in int_fields:
+            if field in market and isinstance(market[field], str):
+                try:
+                    market[field] = int(market[field])
+                except (ValueError, TypeError):
+                    pass
+
+        if 'outcomePrices' in market and isinstance(market['outcomePrices'], list):
+            try:
+                market['outcomePrices'] = [float(price) for price in market['outcomePrices']]
+            except (ValueError, TypeError):
+                pass
+
+        if 'events' in market and isinstance(market['events'], list):
+            for event in market['events']:
+                for field in ['liquidity', 'volume', 'openInterest', 'competitive',
+                              'volume24hr', 'volume1wk', 'volume1mo', 'volume1yr']:
+                    if field in event and isinstance(event[field], str):
+                        try:
+                            event[field] = float(event[field])
+                        except (ValueError, TypeError):
+                            pass
+
+                for field in ['active', 'closed', 'archived', 'new', 'featured',
+                              'restricted', 'enableOrderBook', 'negRisk', 'cyom',
+                              'showAllOutcomes', 'showMarketImages', 'enableNegRisk',
+                              'automaticallyActive', 'negRiskAugmented', 'pendingDeployment',
+                              'deploying']:
+                    if field in event and isinstance(event[field], str):
+                        if event[field].lower() == 'true':
+                            event[field] = True
+                        elif event[field].lower() == 'false':
+                            event[field] = False
+
+        if 'clobRewards' in market and isinstance(market['clobRewards'], list):
+            for reward in market['clobRewards']:
+                for field in ['rewardsAmount', 'rewardsDailyRate']:
+                    if field in reward and isinstance(reward[field], str):
+                        try:
+                            reward[field] = float(reward[field])
+                        except (ValueError, TypeError):
+                            pass
+
+    df = pd.DataFrame(res)[list(keys)]
+
+    list_fields = [
+        'clobTokenIds',
+        'outcomes',
+        'outcomePrices',
+    ]
+    for k in list_fields:
+        tdf = pd.DataFrame(df[k].tolist(), index=df.index)
+        df[[k + str(i + 1) for i in tdf.columns]] = tdf
+
+    return df
@@ -0,0 +1,65 @@
+import os
+import random
+import time
+
+from eth_account import Account
+from py_clob_client.clob_types import CreateOrderOptions, MarketOrderArgs, OrderArgs
+from py_clob_client.order_builder.builder import OrderBuilder
+from py_clob_client.signer import Signer
+
+from polymarket.clob_api.constants import POLYGON
+from polymarket.clob_api.signing import OrderSigner
+
+"""
+    signed orders per second: inline on this interpreter (what create_order does) vs an OrderSigner
+    process pool with 1, 4 and 8 workers. throwaway key, options pre-resolved, no network.
+
+    pool start-up (spawn + per-worker OrderBuilder init) is reported separately and excluded from the rate.
+    scaling is bounded by physical cores - on a single core machine the pool can only add overhead.
+
+    run from src/:
+        python -m benchmarks.order_signing
+"""
+
+
+def sample_orders(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        token_id = str(rng.getrandbits(250))
+        options = CreateOrderOptions(tick_size='0.01', neg_risk=bool(i % 2))
+        if i % 2:
+            args = MarketOrderArgs(token_id=token_id, amount=round(rng.uniform(5, 50), 2), side='BUY', price=round(rng.uniform(0.05, 0.95), 2))
+        else:
+            args = OrderArgs(token_id=token_id, price=round(rng.uniform(0.05, 0.95), 2), size=round(rng.uniform(5, 100), 2), side='SELL')
+        items.append((args, options))
+    return items
+
+
+def main(n: int = 400):
+    private_key = Account.create().key.hex()
+    funder = Account.create().address
+    items = sample_orders(n)
+
+    print(f"orders: {n}   cores: {os.cpu_count()}")
+
+    builder = OrderBuilder(Signer(private_key, POLYGON), sig_type=1, funder=funder)
+    t0 = time.perf_counter()
+    for args, options in items:
+        (builder.create_market_order if isinstance(args, MarketOrderArgs) else builder.create_order)(args, options)
+    inline = n / (time.perf_counter() - t0)
+    print(f"{'inline':12s} {inline:8.0f} orders/s")
+
+    for workers in (1, 4, 8):
+        t0 = time.perf_counter()
+        with OrderSigner(private_key, funder, workers=workers) as signer:
+            startup = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            results = signer.sign_many(items)
+            rate = n / (time.perf_counter() - t0)
+        assert all(error is None for _, error in results)
+        print(f"{f'{workers} workers':12s} {rate:8.0f} orders/s  {rate / inline:5.1f}x   start-up {startup:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import random
+import time
+
+from trading.datamodel.polymarket import LimitOrder, MarketBuy, MarketSell, PolymarketPosition
+from trading.strategies.polymarket.risk import RiskLimits, check_orders
+
+"""
+    pre-trade risk gate throughput over synthetic order batches: mostly market buys spread over a few hundred
+    events, some sells against held positions, some limit buys and duplicates. every limit is binding, so
+    the clip / drop paths are part of the timing.
+
+    run from src/:
+        python -m benchmarks.risk_gate
+"""
+
+
+def sample_batch(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    events = max(1, n // 20)
+    positions = {
+        f"held-{i}": PolymarketPosition(token_id=f"held-{i}", event_id=f"e{i % events}", amount=rng.uniform(10, 500), avg_price=0.9, cur_price=rng.uniform(0.8, 0.99))
+        for i in range(n // 10)
+    }
+    orders = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.1 and positions:
+            token_id = rng.choice(list(positions))
+            orders.append(MarketSell(token_id=token_id, amount_shares=rng.uniform(10, 800)))
+        elif roll < 0.2:
+            orders.append(LimitOrder(token_id=f"t{i}", price=round(rng.uniform(0.5, 0.95), 2), size=rng.uniform(10, 200), side='BUY', event_id=f"e{rng.randrange(events)}"))
+        else:
+            # ~5% duplicates
+            token_id = f"t{rng.randrange(i)}" if i and rng.random() < 0.05 else f"t{i}"
+            orders.append(MarketBuy(token_id=token_id, amount_usd=rng.uniform(1, 300), event_id=f"e{rng.randrange(events)}"))
+    return orders, positions
+
+
+def main():
+    limits = RiskLimits(cash_usd=20000, max_order_usd=250, max_event_usd=1500, min_order_usd=1)
+    for n in (100, 1000, 10000):
+        orders, positions = sample_batch(n)
+        runs = 20 if n < 10000 else 5
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            _, report = check_orders(orders, positions, limits)
+        seconds = (time.perf_counter() - t0) / runs
+        print(f"orders {n:6d}   {seconds * 1000:8.2f} ms / batch   {seconds * 1e6 / n:6.2f} us / order   ({report.summary()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import time
+
+from polymarket.clob_api.client import PolymarketClobClient
+from polymarket.clob_api.constants import Environment
+from polymarket.clob_api.creds import CredsStore
+from polymarket.data_api.client import PolymarketDataClient
+from polymarket.gamma_api.client import PolymarketGammaClient
+from polymarket.registry import ClientRegistry
+
+"""
+    api client setup cost of starting n strategies (the part of PolymarketStrategy.__init__ that talks to the network):
+
+      per strategy      what __init__ used to do: fresh clob / gamma / data clients, creds derived every time
+      registry, cold    shared clients, empty creds cache: one derivation for the whole process
+      registry, warm    shared clients, creds already on disk from an earlier run: no derivation at all
+
+    needs real credentials (POLYMARKET_PRIVATE_KEY, POLYMARKET_PROXY_ADDRESS, POLYMARKET_CLOB_HOST) and network.
+
+    run from src/:
+        python -m benchmarks.strategy_startup
+"""
+
+
+def per_strategy(n: int):
+    for _ in range(n):
+        PolymarketDataClient()
+        PolymarketGammaClient()
+        PolymarketClobClient(creds=None)
+
+
+def with_registry(n: int, store: CredsStore):
+    registry = ClientRegistry(creds=store)
+    for _ in range(n):
+        registry.data()
+        registry.gamma()
+        registry.clob()
+
+
+def main(n: int = 30):
+    if not os.getenv(Environment.POLYMARKET_PRIVATE_KEY):
+        sys.exit("set POLYMARKET_PRIVATE_KEY / POLYMARKET_PROXY_ADDRESS / POLYMARKET_CLOB_HOST to run this benchmark")
+
+    store = CredsStore(tempfile.mkdtemp())
+    runs = {
+        'per strategy': lambda: per_strategy(n),
+        'registry, cold': lambda: with_registry(n, store),
+        'registry, warm': lambda: with_registry(n, store),   # the cold run left the creds on disk
+    }
+    print(f"strategies: {n}")
+    for name, fn in runs.items():
+        t0 = time.perf_counter()
+        fn()
+        seconds = time.perf_counter() - t0
+        print(f"{name:16s} {seconds * 1000:9.0f} ms total  {seconds * 1000 / n:7.1f} ms / strategy")
+
+
+if __name__ == "__main__":
+    main()
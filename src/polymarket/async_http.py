@@ -0,0 +1,59 @@
+import asyncio
+import weakref
+from typing import Optional
+
+import httpx
+
+"""
+    one pooled, keep-alive HTTP/2 httpx client per event loop, shared by every async api client.
+
+    an httpx.AsyncClient is tied to the loop it first did I/O on, so the shared instance is keyed on the
+    running loop. within a loop, hundreds of strategies multiplex their requests over a handful of
+    HTTP/2 connections per host instead of opening their own pools.
+"""
+
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS = 30
+DEFAULT_TIMEOUT_SECONDS = 10
+USER_AGENT = "polymarket-python/0.1"
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def new_async_client(
+    max_connections: int = MAX_CONNECTIONS,
+    max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=timeout,
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
+def shared_async_client() -> httpx.AsyncClient:
+    """
+    the running loop's shared client, created on first use. must be called from inside a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    client: Optional[httpx.AsyncClient] = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = new_async_client()
+        _clients[loop] = client
+    return client
+
+
+async def aclose_shared_client():
+    """
+    closes the running loop's shared client (call on shutdown).
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from prometheus_client import Counter
+
+from polymarket.singleflight import AsyncSingleFlight, SingleFlight, async_single_flight, single_flight
+
+"""
+    process-wide TTL + LRU cache for decoded api responses.
+
+    every PolymarketStrategy builds its own api clients, so without this each strategy under the
+    StrategyManager re-downloads the same market lists, positions and prices every cycle. the cache
+    sits under the clients' _get methods (and the clob price reads) and is shared by all of them, so
+    outbound requests scale with the number of distinct queries instead of the number of strategies.
+
+    cached values are shared between callers -> treat whatever comes back as read-only.
+"""
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("POLYMARKET_RESPONSE_CACHE_SIZE", 2048))
+
+cache_requests = Counter(
+    "polymarket_response_cache_requests",
+    "response cache lookups by endpoint and result (hit / miss)",
+    ["endpoint", "result"],
+)
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> Tuple:
+    """
+    hashable, order-independent form of a request's params. None values are dropped and lists become
+    sorted tuples, so {'id': [2, 1], 'closed': None} and {'id': [1, 2]} share a cache entry.
+    """
+    def norm(v):
+        if isinstance(v, Enum):
+            return v.value
+        if isinstance(v, (list, tuple, set)):
+            return tuple(sorted((norm(i) for i in v), key=repr))
+        if isinstance(v, dict):
+            return normalize_params(v)
+        return v
+
+    if not params:
+        return ()
+    return tuple(sorted((k, norm(v)) for k, v in params.items() if v is not None))
+
+
+class ResponseCache:
+    """
+    size-bounded LRU of (endpoint, params) -> decoded response, each entry with its own expiry.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, str, Tuple, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+        self.evictions = 0
+
+    def get(self, endpoint: str, params: Tuple) -> Tuple[bool, Any]:
+        key = (endpoint, params)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits[endpoint] += 1
+                cache_requests.labels(endpoint, "hit").inc()
+                return True, entry[3]
+            if entry is not None:
+                del self._entries[key]
+            self._misses[endpoint] += 1
+        cache_requests.labels(endpoint, "miss").inc()
+        return False, None
+
+    def put(self, endpoint: str, params: Tuple, value: Any, ttl: float):
+        key = (endpoint, params)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, endpoint, params, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, endpoint: str = None, predicate: Callable[[Dict[str, Any]], bool] = None) -> int:
+        """
+        drops cached entries for `endpoint` (all endpoints if None). `predicate` receives an entry's params
+        as a dict and narrows the drop further, e.g. lambda p: p.get('token_id') == token_id.
+        returns the number of entries removed.
+        """
+        with self._lock:
+            doomed = [
+                key for key, (_, ep, params, _) in self._entries.items()
+                if (endpoint is None or ep == endpoint) and (predicate is None or predicate(dict(params)))
+            ]
+            for key in doomed:
+                del self._entries[key]
+        return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        {endpoint: {'hits': .., 'misses': ..}} plus a '__total__' row with size and evictions.
+        """
+        with self._lock:
+            endpoints = set(self._hits) | set(self._misses)
+            out = {ep: {'hits': self._hits[ep], 'misses': self._misses[ep]} for ep in endpoints}
+            out['__total__'] = {
+                'hits': sum(self._hits.values()),
+                'misses': sum(self._misses.values()),
+                'size': len(self._entries),
+                'evictions': self.evictions,
+            }
+        return out
+
+
+response_cache = ResponseCache()
+
+
+def read_through(
+    cache: Optional[ResponseCache],
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    ttl: float,
+    fetch: Callable[[], Any],
+    flights: Optional[SingleFlight] = single_flight,
+) -> Any:
+    """
+    returns the cached response for (endpoint, params), or calls `fetch` and caches its result for `ttl` seconds.
+    concurrent misses for the same key are coalesced into one `fetch` through `flights`.
+    a falsy ttl or cache skips caching (coalescing still applies).
+    """
+    key = normalize_params(params)
+    caching = bool(ttl) and cache is not None
+    if caching:
+        hit, value = cache.get(endpoint, key)
+        if hit:
+            return value
+
+    def load():
+        value = fetch()
+        if caching:
+            cache.put(endpoint, key, value, ttl)
+        return value
+
+    if flights is None:
+        return load()
+    return flights.do((endpoint, key), load, endpoint)
+
+
+async def aread_through(
+    cache: Optional[ResponseCache],
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    ttl: float,
+    fetch: Callable[[], Awaitable[Any]],
+    flights: Optional[AsyncSingleFlight] = async_single_flight,
+) -> Any:
+    """
+    async twin of read_through - `fetch` is a coroutine function.
+    """
+    key = normalize_params(params)
+    caching = bool(ttl) and cache is not None
+    if caching:
+        hit, value = cache.get(endpoint, key)
+        if hit:
+            return value
+
+    async def load():
+        value = await fetch()
+        if caching:
+            cache.put(endpoint, key, value, ttl)
+        return value
+
+    if flights is None:
+        return await load()
+    return await flights.do((endpoint, key), load, endpoint)
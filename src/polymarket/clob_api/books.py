@@ -0,0 +1,359 @@
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import orjson
+import websocket
+from prometheus_client import Counter
+
+from polymarket.clob_api.constants import BOOK_STALE_SECONDS, MARKET_WS_URL
+from polymarket.clob_api.metadata import TokenMetadataCache, as_tick_size, token_metadata
+from utils.log import logger
+
+"""
+    local order book mirror fed by the clob market websocket.
+
+    the market channel sends a full `book` snapshot per token on subscribe, then `price_change` deltas
+    (a level's new total size, 0 == level gone) and `last_trade_price` / `tick_size_change` events.
+
+    one writer thread (the websocket's) owns the mutable price -> size levels. after every message it
+    publishes an immutable BookSnapshot per touched token by plain dict assignment, so readers
+    (`book`, `top_of_book`, `depth`, `price`) never take a lock and never see a half-applied delta.
+
+    apply_message takes the raw frame (str / bytes / decoded json), so recorded sessions can be replayed
+    into a mirror offline with `replay`.
+"""
+
+RECONNECT_BASE_SECONDS = 0.5
+RECONNECT_CAP_SECONDS = 30.0
+PING_INTERVAL_SECONDS = 10
+
+book_messages = Counter(
+    "polymarket_book_messages",
+    "clob market channel messages applied to the order book mirror",
+    ["event_type"],
+)
+
+
+class Level(NamedTuple):
+    price: float
+    size: float
+
+
+class BookSnapshot(NamedTuple):
+    """
+    immutable view of one token's book. bids best (highest) first, asks best (lowest) first.
+    """
+    token_id: str
+    bids: Tuple[Level, ...]
+    asks: Tuple[Level, ...]
+    timestamp: Optional[int]      # exchange timestamp (ms) of the last applied message
+    received_at: float            # local time.time() of the last applied message
+    last_trade_price: Optional[float] = None
+    tick_size: Optional[float] = None
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.bids[0].price if self.bids else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.asks[0].price if self.asks else None
+
+    @property
+    def mid(self) -> Optional[float]:
+        if not self.bids or not self.asks:
+            return None
+        return (self.bids[0].price + self.asks[0].price) / 2
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.received_at
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Book:
+    """
+    writer-side mutable book for one token.
+    """
+    __slots__ = ('bids', 'asks', 'timestamp', 'last_trade_price', 'tick_size')
+
+    def __init__(self):
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        self.timestamp = None
+        self.last_trade_price = None
+        self.tick_size = None
+
+    def reset(self, bids: Iterable[Dict[str, Any]], asks: Iterable[Dict[str, Any]]):
+        self.bids = {float(l['price']): float(l['size']) for l in bids if float(l['size']) > 0}
+        self.asks = {float(l['price']): float(l['size']) for l in asks if float(l['size']) > 0}
+
+    def set_level(self, side: str, price: float, size: float):
+        levels = self.bids if side.upper() in ('BUY', 'BID') else self.asks
+        if size > 0:
+            levels[price] = size
+        else:
+            levels.pop(price, None)
+
+    def snapshot(self, token_id: str) -> BookSnapshot:
+        return BookSnapshot(
+            token_id=token_id,
+            bids=tuple(Level(p, self.bids[p]) for p in sorted(self.bids, reverse=True)),
+            asks=tuple(Level(p, self.asks[p]) for p in sorted(self.asks)),
+            timestamp=self.timestamp,
+            received_at=time.time(),
+            last_trade_price=self.last_trade_price,
+            tick_size=self.tick_size,
+        )
+
+
+class OrderBookMirror:
+    """
+    per-token books mirrored from the clob market channel. `watch` tokens, `start` the feed, read snapshots.
+    """
+
+    def __init__(self, url: str = MARKET_WS_URL, stale_after_seconds: float = BOOK_STALE_SECONDS, metadata: Optional[TokenMetadataCache] = token_metadata):
+        self.url = url
+        self.stale_after_seconds = stale_after_seconds
+        # live tick_size_change events are forwarded here, so order creation never signs against an old tick
+        self.metadata = metadata
+
+        # readers only ever touch _snapshots (dict reads / whole-value swaps are atomic under the gil)
+        self._snapshots: Dict[str, BookSnapshot] = {}
+        self._books: Dict[str, _Book] = {}
+        # tokens whose book snapshot arrived on the current session: only these are exact while connected.
+        # replaced (not cleared) on every subscribe, so a reader never sees it half-reset
+        self._live: set = set()
+
+        self._watched: set = set()
+        self._subscribed: frozenset = frozenset()
+        self._watch_lock = threading.Lock()
+        self._ws: Optional[websocket.WebSocketApp] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.connected = threading.Event()
+
+    # reads (lock-free) ---------------------------------------------------- #
+
+    def book(self, token_id: str) -> Optional[BookSnapshot]:
+        """
+        latest snapshot for a token, or None if we have none or it's stale. a quiet book is still exact while
+        the feed is up and has re-sent its snapshot since the last (re)subscribe; otherwise (feed down, or
+        reconnected but the fresh snapshot not in yet) it goes stale `stale_after_seconds` after its last update.
+        """
+        snap = self._snapshots.get(token_id)
+        if snap is None:
+            return None
+        if self.connected.is_set() and token_id in self._live:
+            return snap
+        return snap if snap.age <= self.stale_after_seconds else None
+
+    def top_of_book(self, token_id: str) -> Tuple[Optional[float], Optional[float]]:
+        snap = self.book(token_id)
+        return (snap.best_bid, snap.best_ask) if snap else (None, None)
+
+    def depth(self, token_id: str, side: str, levels: Optional[int] = None) -> Tuple[Level, ...]:
+        """
+        best-first levels of one side ('BUY' / 'bids' or 'SELL' / 'asks').
+        """
+        snap = self.book(token_id)
+        if snap is None:
+            return ()
+        book_side = snap.bids if side.upper() in ('BUY', 'BID', 'BIDS') else snap.asks
+        return book_side if levels is None else book_side[:levels]
+
+    def price(self, token_id: str, side: str) -> Optional[float]:
+        """
+        same convention as the clob's /price endpoint: BUY -> best bid, SELL -> best ask. None if not mirrored / stale.
+        """
+        bid, ask = self.top_of_book(token_id)
+        return bid if side.upper() == 'BUY' else ask
+
+    def market_price(self, token_id: str, side: str, amount: float) -> Optional[float]:
+        """
+        the worst price a FOK market order of `amount` (usdc for BUY, shares for SELL) would fill at, walked off
+        the mirrored book the same way ClobClient.calculate_market_price walks a fetched one. None if the book
+        isn't mirrored / stale or is too thin to fill it.
+        """
+        buy = side.upper() == 'BUY'
+        levels = self.depth(token_id, 'SELL' if buy else 'BUY')
+        filled = 0.0
+        for level in levels:
+            filled += level.size * level.price if buy else level.size
+            if filled >= amount:
+                return level.price
+        return None
+
+    def tokens(self) -> List[str]:
+        return list(self._snapshots)
+
+    # writes (websocket thread, or replay) --------------------------------- #
+
+    def apply_message(self, message: Any) -> List[str]:
+        """
+        applies one raw market channel frame (a single event or a list of them). returns the tokens it touched.
+        """
+        if isinstance(message, (str, bytes, bytearray)):
+            if message in ('PONG', b'PONG') or not message:
+                return []
+            message = orjson.loads(message)
+        events = message if isinstance(message, list) else [message]
+
+        touched = set()
+        for event in events:
+            if isinstance(event, dict):
+                touched |= self._apply_event(event)
+        for token_id in touched:
+            self._snapshots[token_id] = self._books[token_id].snapshot(token_id)
+        return list(touched)
+
+    def _book(self, token_id: str) -> _Book:
+        book = self._books.get(token_id)
+        if book is None:
+            book = self._books[token_id] = _Book()
+        return book
+
+    def _apply_event(self, event: Dict[str, Any]) -> set:
+        event_type = event.get('event_type')
+        timestamp = _float(event.get('timestamp'))
+        touched = set()
+
+        if event_type == 'book':
+            book = self._book(event['asset_id'])
+            # older payloads call the sides buys / sells
+            book.reset(event.get('bids', event.get('buys', ())), event.get('asks', event.get('sells', ())))
+            self._live.add(event['asset_id'])
+            touched.add(event['asset_id'])
+
+        elif event_type == 'price_change':
+            # current format: price_changes = [{asset_id, price, size, side, ...}]
+            # older format: one asset_id per event with changes = [{price, size, side}]
+            changes = event.get('price_changes')
+            if changes is None:
+                changes = [{**c, 'asset_id': event.get('asset_id')} for c in event.get('changes', ())]
+            for change in changes:
+                token_id = change.get('asset_id')
+                if token_id not in self._live:
+                    # deltas before this session's snapshot can't be placed - the snapshot will carry them
+                    continue
+                self._books[token_id].set_level(change['side'], float(change['price']), float(change['size']))
+                touched.add(token_id)
+
+        elif event_type == 'last_trade_price':
+            token_id = event.get('asset_id')
+            if token_id in self._books:
+                self._books[token_id].last_trade_price = _float(event.get('price'))
+                touched.add(token_id)
+
+        elif event_type == 'tick_size_change':
+            token_id = event.get('asset_id')
+            if token_id in self._books:
+                self._books[token_id].tick_size = _float(event.get('new_tick_size'))
+                if self.metadata is not None:
+                    self.metadata.update(token_id, tick_size=as_tick_size(event.get('new_tick_size')))
+                touched.add(token_id)
+
+        if event_type:
+            book_messages.labels(event_type).inc()
+        if timestamp is not None:
+            for token_id in touched:
+                self._books[token_id].timestamp = int(timestamp)
+        return touched
+
+    def replay(self, messages: Iterable[Any]) -> int:
+        """
+        feeds recorded frames through apply_message (e.g. the lines of a capture file). returns how many were applied.
+        """
+        n = 0
+        for message in messages:
+            self.apply_message(message)
+            n += 1
+        return n
+
+    # subscription --------------------------------------------------------- #
+
+    def watch(self, token_ids: Iterable[str]):
+        """
+        adds tokens to the subscription. the feed resubscribes (reconnects) when the set grows.
+        """
+        with self._watch_lock:
+            new = {t for t in token_ids if t} - self._watched
+            if not new:
+                return
+            self._watched |= new
+            # _on_open subscribes under this lock: the new tokens either made its asset list or the session is up
+            resubscribe = self._ws is not None and self.connected.is_set()
+        if resubscribe:
+            # the market channel takes its asset list at subscribe time, so start a fresh session
+            self._ws.close()
+
+    def unwatch(self, token_ids: Iterable[str]):
+        """
+        drops tokens from the mirror. takes effect on the wire at the next resubscribe.
+        """
+        token_ids = set(token_ids)
+        with self._watch_lock:
+            self._watched -= token_ids
+        for token_id in token_ids:
+            self._snapshots.pop(token_id, None)
+            self._live.discard(token_id)
+
+    def start(self) -> "OrderBookMirror":
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="clob-book-mirror", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._ws is not None:
+            self._ws.close()
+
+    def _run(self):
+        attempt = 0
+        while not self._stop.is_set():
+            if not self._watched:
+                time.sleep(0.1)
+                continue
+            started = time.monotonic()
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=lambda ws, message: self.apply_message(message),
+                on_error=lambda ws, error: logger.warning(f"book mirror: websocket error: {error}"),
+                on_close=lambda ws, code, reason: self.connected.clear(),
+            )
+            try:
+                self._ws.run_forever(ping_interval=PING_INTERVAL_SECONDS, ping_timeout=PING_INTERVAL_SECONDS / 2)
+            except Exception as e:
+                logger.warning(f"book mirror: feed crashed: {e!r}")
+            self.connected.clear()
+            if self._stop.is_set():
+                break
+
+            # a session that lived a while was healthy (or closed on purpose by watch) - reconnect straight away
+            attempt = 0 if time.monotonic() - started > RECONNECT_CAP_SECONDS or self._watched != self._subscribed else attempt + 1
+            if attempt:
+                time.sleep(random.uniform(0, min(RECONNECT_CAP_SECONDS, RECONNECT_BASE_SECONDS * 2 ** attempt)))
+
+    def _on_open(self, ws: websocket.WebSocketApp):
+        with self._watch_lock:
+            self._subscribed = frozenset(self._watched)
+            # the books we hold predate this session: they're only exact again once their snapshot is re-sent
+            self._live = set()
+            ws.send(orjson.dumps({'assets_ids': sorted(self._subscribed), 'type': 'market'}).decode())
+            self.connected.set()
+        logger.info(f"book mirror: subscribed to {len(self._subscribed)} tokens")
+
+
+order_book_mirror = OrderBookMirror()
@@ -1,19 +1,34 @@
 import os
+import threading
+from typing import Iterable, Optional
 from dotenv import load_dotenv
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import OrderArgs, OrderType
-from polymarket.clob_api.constants import Environment, POLYGON
+from py_clob_client.clob_types import BookParams, MarketOrderArgs, OrderArgs, OrderType, PartialCreateOrderOptions
+from py_clob_client.endpoints import GET_NEG_RISK, GET_TICK_SIZE
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.http_helpers.helpers import get
+from polymarket.hedging import hedged
+from polymarket.ratelimit import limiter_for
+from polymarket.clob_api.constants import Environment, POLYGON, SIGNING_WORKERS
+from polymarket.clob_api.creds import CredsStore, creds_store
+from polymarket.clob_api.metadata import TokenMetadataCache, as_tick_size, token_metadata
+from polymarket.clob_api.orders import OrderTracker
+from polymarket.clob_api.prices import PriceCache, price_cache
+from polymarket.clob_api.signing import OrderSigner
 load_dotenv()
 
+from utils.log import logger
 from utils.runtime_utils import footprint
 
 
 class PolymarketClobClient(ClobClient):
     @footprint()
-    def __init__(self, private_key: str = None, proxy_address: str = None, clob_host: str = None):
+    def __init__(self, private_key: str = None, proxy_address: str = None, clob_host: str = None, metadata: TokenMetadataCache = token_metadata, creds: Optional[CredsStore] = creds_store, prices: Optional[PriceCache] = price_cache):
         self.private_key = private_key or os.getenv(Environment.POLYMARKET_PRIVATE_KEY)
         self.proxy_address = proxy_address or os.getenv(Environment.POLYMARKET_PROXY_ADDRESS)
         self.clob_host = clob_host or os.getenv(Environment.POLYMARKET_CLOB_HOST)
+        self.metadata = metadata
+        self.prices = prices
         # ClobClient(host, key=prk, chain_id=chain_id, signature_type=1, funder=pbk)
         super().__init__(
             self.clob_host,
@@ -22,4 +37,173 @@ class PolymarketClobClient(ClobClient):
             signature_type=1,
             funder=self.proxy_address,
         )
-        self.set_api_creds(self.create_or_derive_api_creds())
+        self.creds_store = creds
+        self.set_api_creds(self.load_or_derive_api_creds())
+        # every clob call below goes through this host's shared adaptive limiter
+        self.limiter = limiter_for(self.host)
+        self._order_signer: Optional[OrderSigner] = None
+        self._order_tracker: Optional[OrderTracker] = None
+        self._lazy_lock = threading.Lock()
+
+    def order_signer(self, workers: int = SIGNING_WORKERS) -> OrderSigner:
+        """
+        This client's process pool signer (same key / funder / signature type), started on first use.
+        """
+        with self._lazy_lock:
+            if self._order_signer is None:
+                self._order_signer = OrderSigner(self.private_key, self.proxy_address, POLYGON, signature_type=1, workers=workers).start()
+        return self._order_signer
+
+    def order_tracker(self) -> OrderTracker:
+        """
+        The resting order tracker for this client's api key (one user channel per key), started on first use.
+        """
+        with self._lazy_lock:
+            if self._order_tracker is None:
+                self._order_tracker = OrderTracker(self).start()
+        return self._order_tracker
+
+    def load_or_derive_api_creds(self):
+        """
+        Api creds from the on-disk cache, falling back to create_or_derive_api_creds (and caching the result).
+        """
+        address = self.get_address()
+        creds = self.creds_store.load(address, self.host) if self.creds_store else None
+        if creds is None:
+            creds = self.create_or_derive_api_creds()
+            if self.creds_store:
+                try:
+                    self.creds_store.save(address, self.host, creds)
+                except OSError as e:
+                    logger.warning(f"clob creds: could not cache api creds: {e}")
+        return creds
+
+    def refresh_api_creds(self):
+        """
+        Drops the cached creds and derives them again (e.g. after the key was revoked / rotated).
+        """
+        if self.creds_store:
+            self.creds_store.clear(self.get_address(), self.host)
+        self.set_api_creds(self.load_or_derive_api_creds())
+
+    def _limited(self, fn, *args, idempotent: bool = True, hedge: Optional[str] = None):
+        """
+        Runs fn(*args) under the host's rate limiter. Reads that pass their endpoint path as `hedge` are also
+        hedged against tail latency - never pass it for posts / cancels.
+        """
+        def request():
+            return hedged(f"{self.host}{hedge}", lambda: fn(*args)) if hedge else fn(*args)
+
+        def call():
+            return self.limiter.call(request, idempotent=idempotent)
+
+        try:
+            return call()
+        except PolyApiException as e:
+            # cached creds that the server no longer accepts: re-derive once and retry. a 401 means the request
+            # was never accepted, so this is safe for posts too
+            if e.status_code != 401 or self.creds is None:
+                raise
+            logger.warning("clob rejected our api creds, re-deriving them")
+            self.refresh_api_creds()
+            return call()
+
+    # cached price reads ------------------------------------------------- #
+    # one entry per (token, side) in the shared PriceCache: callers asking for overlapping tokens within the
+    # staleness bound share prices, and whatever is missing goes out in one get_prices call
+
+    def get_price(self, token_id, side, max_age: Optional[float] = None):
+        """
+        Get the market price for the given token, via the shared price cache. Raises PolyApiException if the
+        clob has no price for it.
+        """
+        def fetch(pairs):
+            return {token_id: {side: self._limited(super(PolymarketClobClient, self).get_price, token_id, side, hedge='/price')['price']}}
+
+        if self.prices is None:
+            return self._limited(super().get_price, token_id, side, hedge='/price')
+        res = self.prices.get_many([(token_id, side)], fetch, max_age)
+        if side not in res.get(token_id, {}):
+            raise PolyApiException(error_msg=f"no {side} price for token {token_id}")
+        return {'price': res[token_id][side]}
+
+    def get_prices(self, params: list[BookParams], max_age: Optional[float] = None):
+        """
+        Get the market prices for a set of (token, side) pairs, via the shared price cache.
+        """
+        def fetch(pairs):
+            return self._limited(super(PolymarketClobClient, self).get_prices, [BookParams(token_id=t, side=s) for t, s in pairs], hedge='/prices')
+
+        if self.prices is None:
+            return self._limited(super().get_prices, params, hedge='/prices')
+        return self.prices.get_many([(p.token_id, p.side) for p in params], fetch, max_age)
+
+    # rate limited reads ------------------------------------------------ #
+    # create_order / create_market_order reach the network through these (tick size, neg risk, book)
+
+    def get_midpoint(self, token_id):
+        return self._limited(super().get_midpoint, token_id, hedge='/midpoint')
+
+    # token metadata ---------------------------------------------------- #
+    # ClobClient memoizes these forever per instance; ours go through the shared, expiring TokenMetadataCache
+    # (also filled from gamma market frames), so a token any strategy has loaded costs no lookup at all
+
+    def get_tick_size(self, token_id: str):
+        tick_size = self.metadata.get(token_id, 'tick_size')
+        if tick_size is None:
+            res = self._limited(get, f"{self.host}{GET_TICK_SIZE}?token_id={token_id}")
+            tick_size = as_tick_size(res["minimum_tick_size"]) or str(res["minimum_tick_size"])
+            self.metadata.update(token_id, tick_size=tick_size)
+        return tick_size
+
+    def get_neg_risk(self, token_id: str) -> bool:
+        neg_risk = self.metadata.get(token_id, 'neg_risk')
+        if neg_risk is None:
+            neg_risk = bool(self._limited(get, f"{self.host}{GET_NEG_RISK}?token_id={token_id}")["neg_risk"])
+            self.metadata.update(token_id, neg_risk=neg_risk)
+        return neg_risk
+
+    def create_order(self, order_args: OrderArgs, options: Optional[PartialCreateOrderOptions] = None):
+        return super().create_order(order_args, options or self.metadata.options(order_args.token_id))
+
+    def create_market_order(self, order_args: MarketOrderArgs, options: Optional[PartialCreateOrderOptions] = None):
+        return super().create_market_order(order_args, options or self.metadata.options(order_args.token_id))
+
+    def get_order_book(self, token_id):
+        return self._limited(super().get_order_book, token_id, hedge='/book')
+
+    def get_order_books(self, params: list[BookParams]):
+        return self._limited(super().get_order_books, params, hedge='/books')
+
+    def get_order(self, order_id):
+        return self._limited(super().get_order, order_id)
+
+    def get_orders(self, *args, **kwargs):
+        return self._limited(lambda: super(PolymarketClobClient, self).get_orders(*args, **kwargs))
+
+    def get_trades(self, *args, **kwargs):
+        return self._limited(lambda: super(PolymarketClobClient, self).get_trades(*args, **kwargs))
+
+    def get_balance_allowance(self, *args, **kwargs):
+        return self._limited(lambda: super(PolymarketClobClient, self).get_balance_allowance(*args, **kwargs))
+
+    # rate limited writes ----------------------------------------------- #
+    # posts are only resent when the server rejected them outright (429), never after a timeout / 5xx
+
+    def post_order(self, order, orderType: OrderType = OrderType.GTC):
+        return self._limited(super().post_order, order, orderType, idempotent=False)
+
+    def post_orders(self, args):
+        return self._limited(super().post_orders, args, idempotent=False)
+
+    def cancel(self, order_id):
+        return self._limited(super().cancel, order_id)
+
+    def cancel_orders(self, order_ids):
+        return self._limited(super().cancel_orders, order_ids)
+
+    def invalidate_prices(self, token_ids: Iterable[str]) -> int:
+        """
+        Drops cached prices of the given tokens. Call after our own fills.
+        """
+        return self.prices.invalidate(token_ids) if self.prices is not None else 0
@@ -1,3 +1,4 @@
+import os
 from enum import Enum
 
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
@@ -8,6 +9,32 @@ L0 = 0
 L1 = 1
 L2 = 2
 
+# staleness bound (seconds) of cached clob prices - older ones are refetched
+PRICE_CACHE_TTL_SECONDS = float(os.getenv("POLYMARKET_PRICE_CACHE_TTL", 2))
+
+# most orders the clob accepts in one POST /orders
+POST_ORDERS_BATCH_SIZE = 15
+
+# seconds cached token metadata (tick size / neg risk / min order size) stays valid
+TOKEN_METADATA_TTL_SECONDS = 15 * 60
+
+# where derived clob api creds are cached between runs, and for how long (seconds)
+CREDS_DIR = os.getenv("POLYMARKET_CREDS_DIR", "~/.cache/polymarket")
+CREDS_TTL_SECONDS = 7 * 24 * 3600
+
+# processes in an OrderSigner pool
+SIGNING_WORKERS = 4
+
+# market channel of the clob websocket (public order book snapshots + deltas)
+MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+# user channel of the clob websocket (our own order / trade events, authenticated with the api creds)
+USER_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/user"
+# seconds between rest sweeps of tracked orders while the user channel is down
+ORDER_POLL_SECONDS = 5
+
+# seconds a mirrored book stays usable after its last update while the feed is down
+BOOK_STALE_SECONDS = 30
+
 class Environment(str, Enum):
     POLYMARKET_PRIVATE_KEY = "POLYMARKET_PRIVATE_KEY"
     POLYMARKET_PROXY_ADDRESS = "POLYMARKET_PROXY_ADDRESS"
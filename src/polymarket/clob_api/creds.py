@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import time
+from typing import Optional
+
+from py_clob_client.clob_types import ApiCreds
+
+from polymarket.clob_api.constants import CREDS_DIR, CREDS_TTL_SECONDS
+from utils.log import logger
+
+"""
+    on-disk cache of derived clob api credentials.
+
+    create_or_derive_api_creds is an L1-signed round trip (two when the key already exists, since create is
+    tried first), paid by every PolymarketClobClient at construction. the creds are deterministic per
+    (address, host, nonce), so we keep them between runs.
+
+    one json file per (signer address, host) in a 0700 directory, written 0600 via an atomic rename. files
+    that are readable by anyone but the owner, expired, or written for a different address / host are ignored.
+    the secret is stored as-is: it is only as sensitive as the private key it was derived from, which
+    already sits in the same user's environment.
+"""
+
+
+class CredsStore:
+
+    def __init__(self, directory: str = CREDS_DIR, ttl: float = CREDS_TTL_SECONDS):
+        self.directory = os.path.expanduser(directory)
+        self.ttl = ttl
+
+    def path(self, address: str, host: str) -> str:
+        digest = hashlib.sha256(f"{address.lower()}|{host}".encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"clob-creds-{digest}.json")
+
+    def load(self, address: str, host: str) -> Optional[ApiCreds]:
+        path = self.path(address, host)
+        try:
+            st = os.stat(path)
+            if st.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                logger.warning(f"clob creds: ignoring {path}, it is accessible to other users")
+                return None
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"clob creds: unreadable cache file {path}: {e}")
+            return None
+
+        if data.get('address', '').lower() != address.lower() or data.get('host') != host:
+            return None
+        if data.get('expires_at', 0) <= time.time():
+            return None
+        try:
+            return ApiCreds(api_key=data['api_key'], api_secret=data['api_secret'], api_passphrase=data['api_passphrase'])
+        except KeyError:
+            return None
+
+    def save(self, address: str, host: str, creds: ApiCreds):
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        data = {
+            'address': address,
+            'host': host,
+            'api_key': creds.api_key,
+            'api_secret': creds.api_secret,
+            'api_passphrase': creds.api_passphrase,
+            'expires_at': time.time() + self.ttl,
+        }
+        # mkstemp creates the file 0600; the rename makes the write atomic for concurrent starters
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.clob-creds-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path(address, host))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def clear(self, address: str, host: str):
+        try:
+            os.unlink(self.path(address, host))
+        except FileNotFoundError:
+            pass
+
+
+creds_store = CredsStore()
@@ -0,0 +1,134 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+from prometheus_client import Counter
+from py_clob_client.clob_types import PartialCreateOrderOptions
+
+from polymarket.clob_api.constants import TOKEN_METADATA_TTL_SECONDS
+
+"""
+    per-token order metadata: tick size, neg risk, min order size.
+
+    create_order / create_market_order need the tick size and neg risk flag of the token before they can sign,
+    and ClobClient looks both up over the network the first time it sees a token. gamma already sends all
+    three with every market (orderPriceMinTickSize, negRisk, orderMinSize), so the strategies fill this cache
+    from each market frame they load, the clob client fills in anything gamma didn't cover from its own
+    lookups, and the book mirror pushes live tick_size_change events into it.
+
+    every field expires on its own: a frame refresh renews everything, a clob lookup only the field it fetched.
+"""
+
+# the tick sizes the clob order builder knows how to round to
+TICK_SIZES = ('0.1', '0.01', '0.001', '0.0001')
+
+FIELDS = ('tick_size', 'neg_risk', 'min_size')
+
+token_metadata_requests = Counter(
+    "polymarket_token_metadata_requests",
+    "token metadata cache lookups by field and result (hit / miss)",
+    ["field", "result"],
+)
+
+
+def as_tick_size(value: Any) -> Optional[str]:
+    """
+    gamma's float tick (0.001) / a clob string ('0.001') -> the TickSize literal, None if it isn't one.
+    """
+    try:
+        tick = f"{float(value):.4f}".rstrip('0')
+    except (TypeError, ValueError):
+        return None
+    return tick if tick in TICK_SIZES else None
+
+
+class TokenMetadataCache:
+    """
+    token id -> {field: (value, expires_at)}. thread safe; values are plain scalars.
+    """
+
+    def __init__(self, ttl: float = TOKEN_METADATA_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries: Dict[str, Dict[str, tuple]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token_id: str, field: str) -> Any:
+        """
+        the cached value, or None when unknown / expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token_id, {}).get(field)
+            if entry is not None and entry[1] <= now:
+                del self._entries[token_id][field]
+                entry = None
+        token_metadata_requests.labels(field, "miss" if entry is None else "hit").inc()
+        return None if entry is None else entry[0]
+
+    def update(self, token_id: str, ttl: Optional[float] = None, **fields: Any):
+        """
+        sets the given fields (tick_size=..., neg_risk=..., min_size=...) for a token. None values are skipped.
+        """
+        if not token_id:
+            return
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            entry = self._entries.setdefault(token_id, {})
+            for field, value in fields.items():
+                if field not in FIELDS:
+                    raise ValueError(f"unknown token metadata field {field!r}")
+                if value is not None:
+                    entry[field] = (value, expires)
+
+    def update_from_markets(self, df: pd.DataFrame) -> int:
+        """
+        fills the cache from a trading_keys market frame (both outcome tokens of every market). returns tokens updated.
+        """
+        if df.empty or 'clobTokenIds' not in df:
+            return 0
+        ticks = df['orderPriceMinTickSize'] if 'orderPriceMinTickSize' in df else [None] * len(df)
+        neg_risks = df['negRisk'] if 'negRisk' in df else [None] * len(df)
+        min_sizes = df['orderMinSize'] if 'orderMinSize' in df else [None] * len(df)
+
+        n = 0
+        for tokens, tick, neg_risk, min_size in zip(df['clobTokenIds'], ticks, neg_risks, min_sizes):
+            if not isinstance(tokens, list):
+                continue
+            fields = {
+                'tick_size': as_tick_size(tick),
+                'neg_risk': None if neg_risk is None or pd.isna(neg_risk) else bool(neg_risk),
+                'min_size': None if min_size is None or pd.isna(min_size) else float(min_size),
+            }
+            for token_id in tokens:
+                self.update(str(token_id), **fields)
+                n += 1
+        return n
+
+    def options(self, token_id: str) -> Optional[PartialCreateOrderOptions]:
+        """
+        create order options for a token from whatever is cached, None if nothing is.
+        """
+        tick_size, neg_risk = self.get(token_id, 'tick_size'), self.get(token_id, 'neg_risk')
+        if tick_size is None and neg_risk is None:
+            return None
+        return PartialCreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk)
+
+    def invalidate(self, token_ids: Optional[Iterable[str]] = None, field: Optional[str] = None) -> int:
+        """
+        drops cached metadata - for the given tokens (all when None), one field or all of them. returns entries touched.
+        """
+        with self._lock:
+            keys = list(self._entries) if token_ids is None else [t for t in token_ids if t in self._entries]
+            for token_id in keys:
+                if field is None:
+                    del self._entries[token_id]
+                else:
+                    self._entries[token_id].pop(field, None)
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_metadata = TokenMetadataCache()
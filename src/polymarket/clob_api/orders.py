@@ -0,0 +1,270 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import orjson
+import websocket
+from prometheus_client import Counter
+
+from polymarket.clob_api.constants import ORDER_POLL_SECONDS, USER_WS_URL
+from utils.log import logger
+
+"""
+    tracks our resting limit orders until they're done, and reports every fill as it happens.
+
+    a GTC limit order's post response only covers what matched on the spot. whatever rests on the book can
+    fill later in any number of pieces, or get cancelled. the tracker follows each order's cumulative
+    size_matched and hands the increments to the order's on_fill callback.
+
+    the source is the authenticated clob user channel (`order` events carry size_matched). while that feed
+    is down, a poller covers for it: one get_orders call for all open orders, plus get_order for any tracked
+    order that has left the open list. both end up in `update`, so a fill reported by both sources is
+    only counted once.
+
+    apply_message takes raw frames, so recorded user channel sessions can be replayed offline like the book mirror's.
+"""
+
+RECONNECT_BASE_SECONDS = 0.5
+RECONNECT_CAP_SECONDS = 30.0
+PING_INTERVAL_SECONDS = 10
+
+# rest order statuses after which nothing more can fill
+TERMINAL_STATUSES = frozenset({'MATCHED', 'CANCELED', 'CANCELLED', 'INVALID', 'CANCELED_MARKET_RESOLVED'})
+
+tracked_fills = Counter(
+    "polymarket_tracked_order_fills",
+    "fills of resting limit orders picked up by the order tracker, by source",
+    ["source"],
+)
+
+
+class OrderFill(NamedTuple):
+    order_id: str
+    token_id: str
+    side: str           # BUY / SELL
+    price: float        # the order's limit price - resting orders fill at their own price
+    size: float         # shares filled by this event
+    size_matched: float # cumulative shares filled
+    done: bool          # nothing more will fill
+
+
+class _Tracked:
+    __slots__ = ('order_id', 'token_id', 'side', 'price', 'size', 'size_matched', 'condition_id', 'on_fill')
+
+    def __init__(self, order_id, token_id, side, price, size, size_matched, condition_id, on_fill):
+        self.order_id = order_id
+        self.token_id = token_id
+        self.side = side.upper()
+        self.price = float(price)
+        self.size = float(size)
+        self.size_matched = float(size_matched)
+        self.condition_id = condition_id
+        self.on_fill = on_fill
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class OrderTracker:
+    """
+    resting orders of one clob api key. `track` orders after posting them, `start` the feed.
+    """
+
+    def __init__(self, clob_client, url: str = USER_WS_URL, poll_interval: float = ORDER_POLL_SECONDS):
+        self.clob_client = clob_client
+        self.url = url
+        self.poll_interval = poll_interval
+
+        self._orders: Dict[str, _Tracked] = {}
+        self._lock = threading.Lock()
+        self._subscribed: frozenset = frozenset()
+        self._resubscribe = False
+        self._ws: Optional[websocket.WebSocketApp] = None
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self.connected = threading.Event()
+
+    # tracking ------------------------------------------------------------- #
+
+    def track(
+        self,
+        order_id: str,
+        token_id: str,
+        side: str,
+        price: float,
+        size: float,
+        on_fill: Callable[[OrderFill], None],
+        size_matched: float = 0.0,
+        condition_id: Optional[str] = None,
+    ):
+        """
+        follows an order from `size_matched` (what the post response already reported filled) onwards.
+        """
+        if not order_id:
+            return
+        with self._lock:
+            self._orders[order_id] = _Tracked(order_id, token_id, side, price, size, size_matched, condition_id, on_fill)
+            resubscribe = condition_id is not None and condition_id not in self._subscribed
+        if resubscribe and self._ws is not None and self.connected.is_set():
+            # like the market channel, the user channel takes its market list at subscribe time
+            self._resubscribe = True
+            self._ws.close()
+
+    def untrack(self, order_id: str):
+        with self._lock:
+            self._orders.pop(order_id, None)
+
+    def open_orders(self) -> List[str]:
+        return list(self._orders)
+
+    def update(self, order_id: str, size_matched: Optional[float], done: bool = False, source: str = 'ws') -> Optional[OrderFill]:
+        """
+        applies an order's latest cumulative size_matched; fires on_fill with the increment (if any) or when it's done.
+        """
+        with self._lock:
+            tracked = self._orders.get(order_id)
+            if tracked is None:
+                return None
+            delta = 0.0
+            if size_matched is not None and size_matched > tracked.size_matched:
+                delta = size_matched - tracked.size_matched
+                tracked.size_matched = size_matched
+            done = done or tracked.size_matched >= tracked.size - 1e-9
+            if done:
+                del self._orders[order_id]
+        if not delta and not done:
+            return None
+
+        fill = OrderFill(order_id, tracked.token_id, tracked.side, tracked.price, delta, tracked.size_matched, done)
+        if delta:
+            tracked_fills.labels(source).inc()
+        try:
+            tracked.on_fill(fill)
+        except Exception as e:
+            logger.error(f"order tracker: on_fill failed for {order_id}: {e!r}")
+        return fill
+
+    # user channel --------------------------------------------------------- #
+
+    def apply_message(self, message: Any) -> List[OrderFill]:
+        """
+        applies one raw user channel frame (a single event or a list of them). returns the fills it produced.
+        """
+        if isinstance(message, (str, bytes, bytearray)):
+            if message in ('PONG', b'PONG') or not message:
+                return []
+            message = orjson.loads(message)
+        events = message if isinstance(message, list) else [message]
+
+        fills = []
+        for event in events:
+            if not isinstance(event, dict) or event.get('event_type') != 'order':
+                # trade events repeat what the order events already say (and go on to report settlement)
+                continue
+            fill = self.update(
+                event.get('id'),
+                _float(event.get('size_matched')),
+                done=event.get('type') == 'CANCELLATION',
+            )
+            if fill is not None:
+                fills.append(fill)
+        return fills
+
+    def _on_open(self, ws: websocket.WebSocketApp):
+        creds = self.clob_client.creds
+        with self._lock:
+            self._subscribed = frozenset(o.condition_id for o in self._orders.values() if o.condition_id)
+        ws.send(orjson.dumps({
+            'auth': {'apiKey': creds.api_key, 'secret': creds.api_secret, 'passphrase': creds.api_passphrase},
+            'markets': sorted(self._subscribed),
+            'type': 'user',
+        }).decode())
+        self.connected.set()
+        logger.info(f"order tracker: subscribed to the user channel for {len(self._subscribed)} markets")
+        # anything that filled while we were disconnected
+        self.poll()
+
+    def _run_feed(self):
+        attempt = 0
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=lambda ws, message: self.apply_message(message),
+                on_error=lambda ws, error: logger.warning(f"order tracker: websocket error: {error}"),
+                on_close=lambda ws, code, reason: self.connected.clear(),
+            )
+            try:
+                self._ws.run_forever(ping_interval=PING_INTERVAL_SECONDS, ping_timeout=PING_INTERVAL_SECONDS / 2)
+            except Exception as e:
+                logger.warning(f"order tracker: feed crashed: {e!r}")
+            self.connected.clear()
+            if self._stop.is_set():
+                break
+            # a session that lived a while was healthy, one track() closed to resubscribe wasn't a failure either:
+            # reconnect straight away
+            resubscribe, self._resubscribe = self._resubscribe, False
+            attempt = 0 if time.monotonic() - started > RECONNECT_CAP_SECONDS or resubscribe else attempt + 1
+            if attempt:
+                self._stop.wait(random.uniform(0, min(RECONNECT_CAP_SECONDS, RECONNECT_BASE_SECONDS * 2 ** attempt)))
+
+    # rest fallback -------------------------------------------------------- #
+
+    def poll(self) -> List[OrderFill]:
+        """
+        one rest sweep over the tracked orders: a single get_orders for everything still open, get_order for the rest.
+        """
+        if not self._orders:
+            return []
+        try:
+            open_orders = {o['id']: o for o in self.clob_client.get_orders()}
+        except Exception as e:
+            logger.warning(f"order tracker: could not poll open orders: {e}")
+            return []
+
+        fills = []
+        for order_id in self.open_orders():
+            order = open_orders.get(order_id)
+            if order is None:
+                # left the open list: filled or cancelled, ask for its final state
+                try:
+                    order = self.clob_client.get_order(order_id)
+                except Exception as e:
+                    logger.warning(f"order tracker: could not fetch order {order_id}: {e}")
+                    continue
+                if not order:
+                    continue
+            status = str(order.get('status', '')).upper()
+            fill = self.update(order_id, _float(order.get('size_matched')), done=status in TERMINAL_STATUSES, source='rest')
+            if fill is not None:
+                fills.append(fill)
+        return fills
+
+    def _run_poller(self):
+        while not self._stop.wait(self.poll_interval):
+            if not self.connected.is_set():
+                self.poll()
+
+    # lifecycle ------------------------------------------------------------ #
+
+    def start(self) -> "OrderTracker":
+        if any(t.is_alive() for t in self._threads):
+            return self
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._run_poller, name="clob-order-poller", daemon=True)]
+        if self.url and self.clob_client.creds is not None:
+            self._threads.append(threading.Thread(target=self._run_feed, name="clob-user-feed", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._ws is not None:
+            self._ws.close()
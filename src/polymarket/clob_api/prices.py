@@ -0,0 +1,175 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from polymarket.clob_api.constants import PRICE_CACHE_TTL_SECONDS
+from polymarket.singleflight import SingleFlight, single_flight
+from utils.log import logger
+
+"""
+    per-token, micro-ttl read-through cache for clob prices.
+
+    the shared response cache keys a get_prices call by its whole token list, so rebalance pricing positions,
+    update_state re-pricing a subset of them and another strategy pricing an overlapping set seconds later
+    all miss. this cache keeps one entry per (token, side): a call is served from whatever is younger than the
+    staleness bound and everything else is fetched in ONE get_prices call, whose prices then serve every caller.
+
+    our own fills invalidate their tokens. a fetch that was already in flight when a token got invalidated
+    does not write its (pre-fill) price back.
+
+    every price handed out has an age (0 for freshly fetched ones): it's observed in the
+    polymarket_price_age_seconds histogram and available per token through `ages`, so decisions taken on a
+    cached price can be audited.
+"""
+
+DEFAULT_MAX_ENTRIES = 20000
+
+price_cache_requests = Counter(
+    "polymarket_price_cache_requests",
+    "per-token clob price cache lookups by result (hit / miss)",
+    ["result"],
+)
+
+price_age = Histogram(
+    "polymarket_price_age_seconds",
+    "age of the clob prices handed out by the price cache (0 = fetched for this call)",
+    buckets=(0, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+)
+
+Pair = Tuple[str, str]
+
+
+class PriceCache:
+    """
+    (token_id, side) -> (price, fetched_at). thread safe; prices are stored as the clob returns them.
+    """
+
+    def __init__(self, ttl: float = PRICE_CACHE_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES, flights: Optional[SingleFlight] = single_flight):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.flights = flights
+        self._entries: Dict[Pair, Tuple[Any, float]] = {}
+        self._invalidated: Dict[str, float] = {}
+        # start times of the fetches in flight: an invalidation only matters to fetches that started before it
+        self._inflight: List[float] = []
+        self._lock = threading.Lock()
+
+    def get_many(
+        self,
+        pairs: Iterable[Pair],
+        fetch: Callable[[List[Pair]], Dict[str, Dict[str, Any]]],
+        max_age: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        {token_id: {side: price}} (the clob get_prices shape) for `pairs`. entries older than `max_age`
+        (default: the cache ttl) are refetched, all of them through a single `fetch(missing_pairs)`.
+        pairs the clob didn't price are left out.
+        """
+        pairs = list(dict.fromkeys(pairs))
+        bound = self.ttl if max_age is None else min(max_age, self.ttl)
+        now = time.monotonic()
+        out: Dict[str, Dict[str, Any]] = {}
+        ages: List[float] = []
+        missing: List[Pair] = []
+        with self._lock:
+            for pair in pairs:
+                entry = self._entries.get(pair)
+                if entry is not None and now - entry[1] < bound:
+                    out.setdefault(pair[0], {})[pair[1]] = entry[0]
+                    ages.append(now - entry[1])
+                else:
+                    missing.append(pair)
+        price_cache_requests.labels("hit").inc(len(pairs) - len(missing))
+
+        if missing:
+            price_cache_requests.labels("miss").inc(len(missing))
+            fetched = self._fetch(missing, fetch)
+            for token_id, side in missing:
+                price = (fetched.get(token_id) or {}).get(side)
+                if price is not None:
+                    out.setdefault(token_id, {})[side] = price
+                    ages.append(0.0)
+
+        for age in ages:
+            price_age.observe(age)
+        if ages:
+            logger.debug(f"price cache: {len(pairs) - len(missing)} hits, {len(missing)} fetched, oldest {max(ages):.2f}s")
+        return out
+
+    def _fetch(self, missing: List[Pair], fetch) -> Dict[str, Dict[str, Any]]:
+        def load():
+            started = time.monotonic()
+            with self._lock:
+                self._inflight.append(started)
+            try:
+                res = fetch(missing) or {}
+                self._store(res, missing, started)
+            finally:
+                with self._lock:
+                    self._inflight.remove(started)
+            return res
+
+        if self.flights is None:
+            return load()
+        # strategies missing the very same tokens at the same moment share one request
+        return self.flights.do(('clob-prices', tuple(sorted(missing))), load, 'clob-prices')
+
+    def _store(self, res: Dict[str, Dict[str, Any]], pairs: List[Pair], started: float):
+        with self._lock:
+            for token_id, side in pairs:
+                price = (res.get(token_id) or {}).get(side)
+                # invalidated while we were fetching: this price predates our fill
+                if price is None or self._invalidated.get(token_id, -1.0) >= started:
+                    continue
+                self._entries[(token_id, side)] = (price, started)
+            if len(self._entries) > self.max_entries:
+                self._sweep(time.monotonic())
+
+    def _sweep(self, now: float):
+        for pair in [p for p, (_, at) in self._entries.items() if now - at >= self.ttl]:
+            del self._entries[pair]
+        self._prune_invalidated(now)
+        # still too many live entries: drop the oldest
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            for pair, _ in sorted(self._entries.items(), key=lambda kv: kv[1][1])[:overflow]:
+                del self._entries[pair]
+
+    def _prune_invalidated(self, now: float):
+        # markers older than every fetch in flight can't stop a store anymore (later fetches start after them)
+        horizon = min(self._inflight, default=now)
+        if self._invalidated:
+            self._invalidated = {t: at for t, at in self._invalidated.items() if at >= horizon}
+
+    def invalidate(self, token_ids: Iterable[str]) -> int:
+        """
+        drops every cached side of the given tokens (after our own fills). returns the number of entries removed.
+        """
+        token_ids = set(token_ids)
+        now = time.monotonic()
+        with self._lock:
+            self._prune_invalidated(now)
+            for token_id in token_ids:
+                self._invalidated[token_id] = now
+            doomed = [pair for pair in self._entries if pair[0] in token_ids]
+            for pair in doomed:
+                del self._entries[pair]
+        return len(doomed)
+
+    def ages(self, token_ids: Iterable[str], side: str) -> Dict[str, float]:
+        """
+        {token_id: seconds since its cached `side` price was fetched}, for the tokens that have one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {t: now - self._entries[(t, side)][1] for t in token_ids if (t, side) in self._entries}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._invalidated.clear()
+
+
+price_cache = PriceCache()
@@ -0,0 +1,136 @@
+import concurrent.futures
+import multiprocessing
+import time
+from typing import List, Optional, Sequence, Tuple, Union
+
+from py_clob_client.clob_types import CreateOrderOptions, MarketOrderArgs, OrderArgs
+from py_clob_client.order_builder.builder import OrderBuilder
+from py_clob_client.signer import Signer
+from py_clob_client.utilities import is_tick_size_smaller, price_valid
+
+from polymarket.clob_api.constants import POLYGON, SIGNING_WORKERS
+from utils.log import logger
+
+"""
+    order signing off the strategy's interpreter.
+
+    ClobClient.create_order / create_market_order do two things: resolve the order options over the network
+    (tick size, neg risk, and for market orders a price walked off the book), then build + EIP-712 sign the
+    order. the second half is pure cpu (~7ms an order) and holds the gil, so a thread pool signs one order at a time.
+
+    OrderSigner keeps a persistent process pool whose workers each build their OrderBuilder (and so derive the
+    account from the key) once, in the pool initializer. the key goes to each worker once at startup, never
+    per order. callers resolve options in-process with resolve_options and ship (args, options) to the pool:
+
+        options = resolve_options(clob_client, args)
+        signed = signer.sign_many([(args, options), ...])
+
+    workers are spawned, so they re-import the entry script: keep its top level behind `if __name__ == "__main__"`.
+"""
+
+OrderArgsT = Union[OrderArgs, MarketOrderArgs]
+
+_builder: Optional[OrderBuilder] = None
+
+
+def _init_worker(private_key: str, chain_id: int, signature_type: int, funder: Optional[str]):
+    global _builder
+    _builder = OrderBuilder(Signer(private_key, chain_id), sig_type=signature_type, funder=funder)
+
+
+def _ready(_=None) -> bool:
+    return _builder is not None
+
+
+def _sign(item: Tuple[OrderArgsT, CreateOrderOptions]):
+    """
+    runs in a worker. errors come back as values so one bad order doesn't sink the rest of a map.
+    """
+    args, options = item
+    try:
+        if isinstance(args, MarketOrderArgs):
+            return _builder.create_market_order(args, options), None
+        return _builder.create_order(args, options), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def resolve_options(clob_client, args: OrderArgsT, options: Optional[CreateOrderOptions] = None) -> CreateOrderOptions:
+    """
+    the network half of ClobClient.create_order / create_market_order: tick size, market price (market orders
+    without one, written back onto args) and neg risk, with the same validation.
+    """
+    min_tick_size = clob_client.get_tick_size(args.token_id)
+    tick_size = options.tick_size if options and options.tick_size else min_tick_size
+    if is_tick_size_smaller(tick_size, min_tick_size):
+        raise Exception(f"invalid tick size ({tick_size}), minimum for the market is {min_tick_size}")
+
+    if isinstance(args, MarketOrderArgs) and (args.price is None or args.price <= 0):
+        args.price = clob_client.calculate_market_price(args.token_id, args.side, args.amount, args.order_type)
+    if not price_valid(args.price, tick_size):
+        raise Exception(f"price ({args.price}), min: {tick_size} - max: {1 - float(tick_size)}")
+
+    neg_risk = options.neg_risk if options and options.neg_risk else clob_client.get_neg_risk(args.token_id)
+    return CreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk)
+
+
+class OrderSigner:
+    """
+    persistent process pool that signs orders with one key. workers are spawned (not forked - the strategy
+    process has websocket / executor threads running) and pre-warmed on start.
+    """
+
+    def __init__(
+        self,
+        private_key: str,
+        funder: Optional[str] = None,
+        chain_id: int = POLYGON,
+        signature_type: int = 1,
+        workers: int = SIGNING_WORKERS,
+    ):
+        self.workers = max(1, workers)
+        self._initargs = (private_key, chain_id, signature_type, funder)
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    def start(self) -> "OrderSigner":
+        if self._pool is not None:
+            return self
+        started = time.perf_counter()
+        self._pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=self._initargs,
+        )
+        # the pool starts its processes lazily; one task per worker gets them all spawned + initialized now
+        if not all(self._pool.map(_ready, range(self.workers))):
+            raise RuntimeError("order signer workers failed to initialize")
+        logger.info(f"order signer: {self.workers} workers ready in {time.perf_counter() - started:.2f}s")
+        return self
+
+    def submit(self, args: OrderArgsT, options: CreateOrderOptions) -> concurrent.futures.Future:
+        """
+        future resolving to (signed order, None) or (None, error message).
+        """
+        return self.start()._pool.submit(_sign, (args, options))
+
+    def sign_many(self, items: Sequence[Tuple[OrderArgsT, CreateOrderOptions]]) -> List[Tuple[object, Optional[str]]]:
+        """
+        signs (args, options) pairs across the pool, returning (signed order, None) / (None, error) in input order.
+        """
+        if not items:
+            return []
+        # a few chunks per worker: amortizes the pipe round trips without leaving workers idle at the tail
+        chunksize = max(1, len(items) // (self.workers * 4))
+        return list(self.start()._pool.map(_sign, items, chunksize=chunksize))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self) -> "OrderSigner":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,143 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from polymarket.async_http import shared_async_client
+from polymarket.cache import ResponseCache, aread_through, response_cache
+from polymarket.ratelimit import limiter_for
+from polymarket.transfer import record_transfer
+from polymarket.data_api.constants import (
+    BASE_URL,
+    CACHE_TTL_SECONDS,
+    Endpoint,
+)
+from polymarket.data_api.schemas import (
+    PositionRequest,
+    ActivityRequest,
+    HoldersRequest,
+    HoldingsValueRequest,
+    TradesRequest,
+    Trade,
+)
+
+
+class AsyncDataClient:
+    """
+        asyncio twin of PolymarketDataClient. same request schemas, same shared response cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: float = 10,
+        max_concurrency: Optional[int] = None,
+        cache: Optional[ResponseCache] = response_cache,
+    ) -> None:
+        self.client = client
+        self.timeout = timeout
+        self.cache = cache
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def _get(self, url: str, params: Dict[str, Any]) -> Any:
+        """
+        Fire a GET, raise for HTTP errors, and return the decoded JSON (through the shared response cache).
+        """
+        ttl = CACHE_TTL_SECONDS.get(url.rsplit('/', 1)[-1], 0)
+        return await aread_through(self.cache, url, params, ttl, lambda: self._fetch(url, params))
+
+    async def _fetch(self, url: str, params: Dict[str, Any]) -> Any:
+        client = self.client or shared_async_client()
+
+        async def request():
+            if self._slots is None:
+                resp = await client.get(url, params=params, timeout=self.timeout)
+            else:
+                async with self._slots:
+                    resp = await client.get(url, params=params, timeout=self.timeout)
+            resp.raise_for_status()
+            payload = resp.json()
+            record_transfer(len(resp.content), payload)
+            return payload
+
+        return await limiter_for(url).acall(request)
+
+    # httpx sends None as an empty param, so every request is dumped with exclude_none
+
+    async def positions(
+        self,
+        request: PositionRequest | dict,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch current positions for user.
+        """
+        if isinstance(request, dict):
+            request = PositionRequest(**request)
+
+        params = request.model_dump(exclude_none=True)
+        return await self._get(BASE_URL + '/' + Endpoint.POSITIONS, params)
+
+    async def activity(
+        self,
+        request: ActivityRequest | dict,
+    ) -> List[Dict[str, Any]]:
+        """
+            Fetch the users **on-chain activity / trade history**.
+        """
+        if isinstance(request, dict):
+            request = ActivityRequest(**request)
+
+        params = request.model_dump(exclude_none=True)
+        return await self._get(BASE_URL + '/' + Endpoint.ACTIVITY, params)
+
+    async def holders(
+        self,
+        request: HoldersRequest | dict,
+    ) -> List[Dict[str, Any]]:
+        """
+            get the TOP holders for a market
+        """
+        if isinstance(request, dict):
+            request = HoldersRequest(**request)
+
+        params = request.model_dump(exclude_none=True)
+        return await self._get(BASE_URL + '/' + Endpoint.HOLDERS, params)
+
+    async def holdings_value(
+        self,
+        request: HoldingsValueRequest | dict,
+    ) -> List[Dict[str, Any]]:
+        """
+            Fetch the users **total USD value** of their positions.
+        """
+        if isinstance(request, dict):
+            request = HoldingsValueRequest(**request)
+
+        params = request.model_dump(exclude_none=True)
+        return await self._get(BASE_URL + '/' + Endpoint.VALUE, params)
+
+    async def get_trades(
+        self,
+        request: TradesRequest | dict,
+    ) -> List[Trade]:
+        """
+        Get trades from all markets and all users.
+        """
+        if isinstance(request, dict):
+            request = TradesRequest(**request)
+
+        params = request.model_dump(exclude_none=True)
+        response = await self._get(BASE_URL + '/' + Endpoint.TRADES, params)
+        return [Trade(**trade) for trade in response]
+
+    def invalidate_user(self, user: str) -> int:
+        """
+        Drops cached positions / value / activity for a user. Call after our own fills so the next read is fresh.
+        """
+        if self.cache is None:
+            return 0
+        return sum(
+            self.cache.invalidate(BASE_URL + '/' + endpoint, lambda params: params.get('user') == user)
+            for endpoint in (Endpoint.POSITIONS, Endpoint.VALUE, Endpoint.ACTIVITY)
+        )
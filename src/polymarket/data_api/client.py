@@ -1,6 +1,11 @@
 import time
+from polymarket.cache import ResponseCache, read_through, response_cache
+from polymarket.hedging import hedged
+from polymarket.ratelimit import limiter_for
+from polymarket.transfer import record_transfer
 from polymarket.data_api.constants import (
     BASE_URL,
+    CACHE_TTL_SECONDS,
     Endpoint,
 )
 from typing import Any, Dict, List, Optional
@@ -28,22 +33,36 @@ class PolymarketDataClient:
         session: Optional[requests.Session] = None,
         timeout: float = 10,
         user_agent: str = "polymarket-python/0.1",
+        cache: Optional[ResponseCache] = response_cache,
     ) -> None:
         self.session  = session or requests.Session()
         self.timeout  = timeout
         # You can tack on your own auth header(s) here if PM ever requires it.
         self.headers: Dict[str, str] = {"User-Agent": user_agent}
+        self.cache = cache
 
 
     def _get(self, url: str, params: Dict[str, Any]) -> Any:
         """
         Fire a GET, raise for HTTP errors, and return the decoded JSON.
+        Responses are served from / stored in the shared response cache using the endpoint's CACHE_TTL_SECONDS.
         """
-        resp = self.session.get(
-            url, params=params, headers=self.headers, timeout=self.timeout
-        )
-        resp.raise_for_status()
-        return resp.json()
+        ttl = CACHE_TTL_SECONDS.get(url.rsplit('/', 1)[-1], 0)
+        return read_through(self.cache, url, params, ttl, lambda: self._fetch(url, params))
+
+    def _fetch(self, url: str, params: Dict[str, Any]) -> Any:
+        def request():
+            resp = self.session.get(
+                url, params=params, headers=self.headers, timeout=self.timeout
+            )
+            resp.raise_for_status()
+            payload = resp.json()
+            record_transfer(len(resp.content), payload)
+            return payload
+
+        # paced + retried by the host's shared adaptive limiter; within each admitted attempt, the request is
+        # hedged when slower than the endpoint's p95
+        return limiter_for(url).call(lambda: hedged(url, request))
 
 
     def positions(
@@ -116,3 +135,13 @@ class PolymarketDataClient:
         response = self._get(BASE_URL + '/' + Endpoint.TRADES, params)
         return [Trade(**trade) for trade in response]
 
+    def invalidate_user(self, user: str) -> int:
+        """
+        Drops cached positions / value / activity for a user. Call after our own fills so the next read is fresh.
+        """
+        if self.cache is None:
+            return 0
+        return sum(
+            self.cache.invalidate(BASE_URL + '/' + endpoint, lambda params: params.get('user') == user)
+            for endpoint in (Endpoint.POSITIONS, Endpoint.VALUE, Endpoint.ACTIVITY)
+        )
@@ -16,6 +16,15 @@ class Endpoint(str, Enum):
     TRADES    = "trades"
 
 
+# seconds a decoded response stays in the shared response cache, per endpoint
+CACHE_TTL_SECONDS = {
+    Endpoint.POSITIONS: 10,
+    Endpoint.ACTIVITY:  10,
+    Endpoint.HOLDERS:   60,
+    Endpoint.VALUE:     10,
+    Endpoint.TRADES:    5,
+}
+
 
 class SortDir(str, Enum):
     ASC  = "ASC"
@@ -1,4 +1,5 @@
 from .client import PolymarketGammaClient
+from .async_client import AsyncGammaClient
 from .schemas import MarketRequest, EventRequest
 
-__all__ = ["PolymarketGammaClient", "MarketRequest", "EventRequest"]
+__all__ = ["PolymarketGammaClient", "AsyncGammaClient", "MarketRequest", "EventRequest"]
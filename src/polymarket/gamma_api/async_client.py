@@ -0,0 +1,189 @@
+import asyncio
+import collections
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import httpx
+import pandas as pd
+
+from polymarket.async_http import shared_async_client
+from polymarket.cache import ResponseCache, aread_through, response_cache
+from polymarket.ratelimit import limiter_for
+from polymarket.transfer import record_transfer
+from polymarket.gamma_api.client import recent_markets_request, trading_keys
+from polymarket.gamma_api.constants import BASE_URL, CACHE_TTL_SECONDS, Endpoint, PAGE_SIZE, PAGE_ORDER, PREFETCH_PAGES
+from polymarket.gamma_api.decode import decode_page
+from polymarket.gamma_api.frames import markets_to_frame
+from polymarket.gamma_api.schemas import MarketRequest, EventRequest
+
+
+class AsyncGammaClient:
+    """
+    asyncio twin of PolymarketGammaClient. same request schemas, same shared response cache.
+
+    requests go over the running loop's shared HTTP/2 client unless one is passed in. `max_concurrency`
+    caps this client's in-flight requests (None = only the connection pool limits apply).
+    """
+
+    def __init__(
+        self,
+        *,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: float = 10,
+        max_concurrency: Optional[int] = None,
+        cache: Optional[ResponseCache] = response_cache,
+    ) -> None:
+        self.client = client
+        self.timeout = timeout
+        self.cache = cache
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def _get(self, url: str, params: Dict[str, Any], keys: Optional[Iterable[str]] = None) -> Any:
+        """
+        Fire a GET, raise for HTTP errors, and return the decoded JSON (through the shared response cache).
+        With `keys`, every object in the response is projected down to those keys (see gamma_api.decode).
+        """
+        ttl = CACHE_TTL_SECONDS.get(url.rsplit('/', 1)[-1], 0)
+        keys = tuple(keys) if keys is not None else None
+        cache_params = params if keys is None else {**params, '__keys': keys}
+        return await aread_through(self.cache, url, cache_params, ttl, lambda: self._fetch(url, params, keys))
+
+    async def _fetch(self, url: str, params: Dict[str, Any], keys: Optional[Iterable[str]] = None) -> Any:
+        client = self.client or shared_async_client()
+
+        async def request():
+            if self._slots is None:
+                resp = await client.get(url, params=params, timeout=self.timeout)
+            else:
+                async with self._slots:
+                    resp = await client.get(url, params=params, timeout=self.timeout)
+            resp.raise_for_status()
+            payload = decode_page(resp.content, keys, lazy=keys is not None)
+            record_transfer(len(resp.content), payload)
+            return payload
+
+        return await limiter_for(url).acall(request)
+
+    async def get_markets(
+        self,
+        request: MarketRequest | dict,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieves a list of markets with various filtering and sorting options.
+        """
+        if isinstance(request, dict):
+            request = MarketRequest(**request)
+
+        params = request.model_dump(by_alias=True, exclude_none=True)
+        return await self._get(f"{BASE_URL}/{Endpoint.MARKETS}", params)
+
+    async def get_events(
+        self,
+        request: EventRequest | dict,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches a list of events with various filtering and sorting options.
+        """
+        if isinstance(request, dict):
+            request = EventRequest(**request)
+
+        params = request.model_dump(by_alias=True, exclude_none=True)
+        return await self._get(f"{BASE_URL}/{Endpoint.EVENTS}", params)
+
+    def iter_markets(
+        self,
+        request: MarketRequest | dict,
+        page_size: int = PAGE_SIZE,
+        prefetch: int = PREFETCH_PAGES,
+        keys: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams markets page by page with the next `prefetch` pages in flight. Same semantics as the sync client.
+        """
+        if isinstance(request, dict):
+            request = MarketRequest(**request)
+        return self._iter_pages(Endpoint.MARKETS, request, page_size, prefetch, keys)
+
+    def iter_events(
+        self,
+        request: EventRequest | dict,
+        page_size: int = PAGE_SIZE,
+        prefetch: int = PREFETCH_PAGES,
+        keys: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams events page by page. Same semantics as iter_markets.
+        """
+        if isinstance(request, dict):
+            request = EventRequest(**request)
+        return self._iter_pages(Endpoint.EVENTS, request, page_size, prefetch, keys)
+
+    async def _iter_pages(
+        self,
+        endpoint: Endpoint,
+        request: MarketRequest | EventRequest,
+        page_size: int,
+        prefetch: int,
+        keys: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        params = request.model_dump(by_alias=True, exclude_none=True)
+        remaining = params.pop('limit', None)
+        next_offset = params.pop('offset', None) or 0
+        # only multi-page walks are pinned to an order (see PolymarketGammaClient._iter_pages)
+        single_page = remaining is not None and remaining <= page_size
+        if 'order' not in params and not single_page:
+            params.update(order=PAGE_ORDER, ascending=True)
+        stop_offset = next_offset + remaining if remaining is not None else None
+        url = f"{BASE_URL}/{endpoint}"
+
+        if remaining is not None and remaining <= 0:
+            return
+        # only single-page walks go through the shared response cache (see PolymarketGammaClient._iter_pages)
+        fetch = self._get if single_page else self._fetch
+
+        pending = collections.deque()
+
+        def submit_next():
+            nonlocal next_offset
+            if stop_offset is not None and next_offset >= stop_offset:
+                return
+            pending.append(asyncio.ensure_future(fetch(url, {**params, 'limit': page_size, 'offset': next_offset}, keys)))
+            next_offset += page_size
+
+        try:
+            for _ in range(max(prefetch, 1)):
+                submit_next()
+
+            while pending:
+                page = await pending.popleft()
+                last_page = len(page) < page_size
+                if not last_page:
+                    submit_next()
+
+                if remaining is not None:
+                    page = page[:remaining]
+                    remaining -= len(page)
+                    last_page = last_page or remaining <= 0
+
+                for item in page:
+                    yield item
+                if last_page:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_recent_markets(self, look_back_days: int = 6 * 30, minimum_volume: float = 100000, minimum_liquidity: float = 1000, limit: int = 500, days_to_end: int = None) -> pd.DataFrame:
+        """
+        Fetches a dataframe of markets created in the last look_back_months months.
+        """
+        request = recent_markets_request(look_back_days, minimum_volume, minimum_liquidity, limit, days_to_end)
+        return await self.get_markets_frame(request)
+
+    async def get_markets_frame(self, request: MarketRequest | dict) -> pd.DataFrame:
+        """
+        Every market matching the request (request.limit caps the total), as a typed trading_keys frame.
+        """
+        if isinstance(request, dict):
+            request = MarketRequest(**request)
+        res = [market async for market in self.iter_markets(request, keys=trading_keys.keys())]
+        return markets_to_frame(res, columns=trading_keys.keys())
@@ -1,17 +1,28 @@
-import requests
+import collections
+import concurrent.futures
+import contextvars
 import pandas as pd
-import json
-from typing import Any, Dict, List, Optional
+import requests
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from datetime import datetime, timedelta
 
-from polymarket.gamma_api.constants import BASE_URL, Endpoint
+from polymarket.cache import ResponseCache, read_through, response_cache
+from polymarket.hedging import hedged
+from polymarket.ratelimit import limiter_for
+from polymarket.transfer import record_transfer
+from polymarket.gamma_api.constants import BASE_URL, CACHE_TTL_SECONDS, Endpoint, PAGE_SIZE, PAGE_ORDER, PREFETCH_PAGES
 from polymarket.gamma_api.schemas import MarketRequest, EventRequest
+from polymarket.gamma_api.decode import STREAM_CHUNK_SIZE, decode_page, decode_stream
+from polymarket.gamma_api.frames import markets_to_frame
 from utils.runtime_utils import footprint
 
 trading_keys = {
     # SLUG
     'slug': 'Market slug',
 
+    # EVENTS
+    'events': 'Market events',
+
     # IDENTIFIERS
     'id': 'Unique market identifier',
     'conditionId': 'Blockchain condition identifier for the market',
@@ -43,11 +54,13 @@ trading_keys = {
     'active': 'Whether market is currently active for trading',
     'closed': 'Whether market is closed',
     'acceptingOrders': 'Whether new orders can be placed',
+    'startDate': 'When the market opened',
     'endDate': 'When the market closes/resolves',
     
     # TRADING MECHANICS
     'orderMinSize': 'Minimum order size allowed',
     'orderPriceMinTickSize': 'Minimum price increment for orders',
+    'negRisk': 'Whether the market settles through the neg risk adapter (signs against a different exchange)',
     'enableOrderBook': 'Whether order book trading is enabled'
 }
 
@@ -55,6 +68,25 @@ trading_keys = {
 def format_datetime(date: datetime) -> str:
     return date.strftime('%Y-%m-%dT%H:%M:%SZ')
 
+
+def recent_markets_request(look_back_days: int = 6 * 30, minimum_volume: float = 100000, minimum_liquidity: float = 1000, limit: int = 500, days_to_end: int = None) -> MarketRequest:
+    """
+    The open-markets query behind get_recent_markets (shared with the async client).
+    """
+    # floored to the minute so strategies waking up a few seconds apart share a cached response
+    now = datetime.now().replace(second=0, microsecond=0)
+    request = {
+        'limit': limit,
+        'start_date_min': format_datetime(now - timedelta(days=look_back_days)),
+        'end_date_min': format_datetime(now),
+        'volume_num_min': minimum_volume,
+        'liquidity_num_min': minimum_liquidity,
+        'closed': False
+    }
+    if days_to_end is not None:
+        request['end_date_max'] = format_datetime(now + timedelta(days=days_to_end))
+    return MarketRequest(**request)
+
 class PolymarketGammaClient:
     """
     Convenience wrapper around Polymarket's Gamma API.
@@ -66,20 +98,58 @@ class PolymarketGammaClient:
         session: Optional[requests.Session] = None,
         timeout: float = 10,
         user_agent: str = "polymarket-python/0.1",
+        cache: Optional[ResponseCache] = response_cache,
+        stream_decode: bool = False,
     ) -> None:
         self.session = session or requests.Session()
         self.timeout = timeout
         self.headers: Dict[str, str] = {"User-Agent": user_agent}
+        self.cache = cache
+        # parse pages element by element off the socket instead of buffering the whole body first
+        self.stream_decode = stream_decode
 
-    def _get(self, url: str, params: Dict[str, Any]) -> Any:
+    def _get(self, url: str, params: Dict[str, Any], keys: Optional[Iterable[str]] = None) -> Any:
         """
         Fire a GET, raise for HTTP errors, and return the decoded JSON.
+        Responses are served from / stored in the shared response cache using the endpoint's CACHE_TTL_SECONDS.
+        With `keys`, every object in the response is projected down to those keys (see gamma_api.decode).
         """
-        resp = self.session.get(
-            url, params=params, headers=self.headers, timeout=self.timeout
-        )
-        resp.raise_for_status()
-        return resp.json()
+        ttl = CACHE_TTL_SECONDS.get(url.rsplit('/', 1)[-1], 0)
+        keys = tuple(keys) if keys is not None else None
+        # projected and full responses must not share a cache entry
+        cache_params = params if keys is None else {**params, '__keys': keys}
+        return read_through(self.cache, url, cache_params, ttl, lambda: self._fetch(url, params, keys))
+
+    def _fetch(self, url: str, params: Dict[str, Any], keys: Optional[Iterable[str]] = None) -> Any:
+        lazy = keys is not None
+
+        def request():
+            if not self.stream_decode:
+                resp = self.session.get(
+                    url, params=params, headers=self.headers, timeout=self.timeout
+                )
+                resp.raise_for_status()
+                payload = decode_page(resp.content, keys, lazy=lazy)
+                record_transfer(len(resp.content), payload)
+                return payload
+
+            with self.session.get(url, params=params, headers=self.headers, timeout=self.timeout, stream=True) as resp:
+                resp.raise_for_status()
+                nbytes = 0
+
+                def chunks():
+                    nonlocal nbytes
+                    for chunk in resp.iter_content(STREAM_CHUNK_SIZE):
+                        nbytes += len(chunk)
+                        yield chunk
+
+                payload = decode_stream(chunks(), keys, lazy=lazy)
+            record_transfer(nbytes, payload)
+            return payload
+
+        # paced + retried by the host's shared adaptive limiter; within each admitted attempt, the request is
+        # hedged when slower than the endpoint's p95
+        return limiter_for(url).call(lambda: hedged(url, request))
 
     def get_markets(
         self,
@@ -107,122 +177,119 @@ class PolymarketGammaClient:
         params = request.model_dump(by_alias=True, exclude_none=True)
         return self._get(f"{BASE_URL}/{Endpoint.EVENTS}", params)
 
+    def iter_markets(
+        self,
+        request: MarketRequest | dict,
+        page_size: int = PAGE_SIZE,
+        prefetch: int = PREFETCH_PAGES,
+        keys: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams markets matching the request, walking `offset` pages until gamma runs dry.
+        `request.limit` caps the total number of markets yielded (None = the whole catalog).
+        With `keys`, markets come back as read-only LazyMarket views holding only those keys.
+        """
+        if isinstance(request, dict):
+            request = MarketRequest(**request)
+        return self._iter_pages(Endpoint.MARKETS, request, page_size, prefetch, keys)
+
+    def iter_events(
+        self,
+        request: EventRequest | dict,
+        page_size: int = PAGE_SIZE,
+        prefetch: int = PREFETCH_PAGES,
+        keys: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams events matching the request. Same paging semantics as iter_markets.
+        """
+        if isinstance(request, dict):
+            request = EventRequest(**request)
+        return self._iter_pages(Endpoint.EVENTS, request, page_size, prefetch, keys)
+
+    def _iter_pages(
+        self,
+        endpoint: Endpoint,
+        request: MarketRequest | EventRequest,
+        page_size: int,
+        prefetch: int,
+        keys: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generator behind iter_markets / iter_events.
+
+        While the caller consumes one page, the next `prefetch` pages are already in flight on a
+        bounded thread pool, so at most `prefetch + 1` pages are ever held in memory.
+        A page shorter than `page_size` marks the end of the catalog; anything fetched past it is dropped.
+        A walk over more than one page without an explicit `order` is pinned to id ascending, so concurrent pages
+        don't overlap or leave gaps; a single page keeps gamma's own default order.
+        """
+        params = request.model_dump(by_alias=True, exclude_none=True)
+        remaining = params.pop('limit', None)
+        next_offset = params.pop('offset', None) or 0
+        single_page = remaining is not None and remaining <= page_size
+        if 'order' not in params and not single_page:
+            params.update(order=PAGE_ORDER, ascending=True)
+        stop_offset = next_offset + remaining if remaining is not None else None
+        url = f"{BASE_URL}/{endpoint}"
+
+        if remaining is not None and remaining <= 0:
+            return
+        # a single-page walk (what strategies ask for) is shared through the response cache; a longer walk goes
+        # straight to the wire, or every page of a full catalog pass would sit in the shared lru for the cache ttl
+        fetch = self._get if single_page else self._fetch
+
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(prefetch, 1), thread_name_prefix="gamma-pages")
+        pending = collections.deque()
+
+        def submit_next():
+            nonlocal next_offset
+            if stop_offset is not None and next_offset >= stop_offset:
+                return
+            # each page runs in a copy of the caller's context so transfer meters (polymarket.transfer) see it
+            ctx = contextvars.copy_context()
+            pending.append(pool.submit(ctx.run, fetch, url, {**params, 'limit': page_size, 'offset': next_offset}, keys))
+            next_offset += page_size
+
+        try:
+            for _ in range(max(prefetch, 1)):
+                submit_next()
+
+            while pending:
+                page = pending.popleft().result()
+                last_page = len(page) < page_size
+                if not last_page:
+                    submit_next()
+
+                if remaining is not None:
+                    page = page[:remaining]
+                    remaining -= len(page)
+                    last_page = last_page or remaining <= 0
+
+                yield from page
+                if last_page:
+                    break
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     # later move to nothing_ever_happens
     @footprint(time_limit_seconds=0.01, memory_limit_mb=10)
     def get_recent_markets(self, look_back_days: int = 6 * 30, minimum_volume: float = 100000, minimum_liquidity: float = 1000, limit: int = 500, days_to_end: int = None):
         """
         Fetches a dataframe of markets created in the last look_back_months months.
+        Pass limit=None to page through every matching market.
         """ 
-        request = {
-            'limit': limit,
-            'start_date_min': format_datetime(datetime.now() - timedelta(days=look_back_days)),
-            'end_date_min': format_datetime(datetime.now()),
-            'volume_num_min': minimum_volume,
-            'liquidity_num_min': minimum_liquidity,
-            'closed': False
-        }
-        if days_to_end is not None:
-            request['end_date_max'] = format_datetime(datetime.now() + timedelta(days=days_to_end))
-        res = self.get_markets(MarketRequest(**request))
-
-        # this is just some cleaning on the data recieved from polymarket
-    
-        for market in res:
-            json_fields = ['outcomes', 'outcomePrices', 'clobTokenIds', 'umaResolutionStatuses']
-            for field in json_fields:
-                if field in market and isinstance(market[field], str):
-                    try:
-                        market[field] = json.loads(market[field])
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-            
-            float_fields = [
-                'liquidity', 'volume', 'volumeNum', 'liquidityNum', 
-                'volume24hr', 'volume1wk', 'volume1mo', 'volume1yr',
-                'umaBond', 'umaReward', 'volume24hrClob', 'volume1wkClob', 
-                'volume1moClob', 'volume1yrClob', 'volumeClob', 'liquidityClob',
-                'orderPriceMinTickSize', 'orderMinSize', 'rewardsMinSize', 
-                'rewardsMaxSpread', 'spread', 'oneDayPriceChange', 
-                'oneWeekPriceChange', 'lastTradePrice', 'bestBid', 'bestAsk'
-            ]
-            for field in float_fields:
-                if field in market and isinstance(market[field], str):
-                    try:
-                        market[field] = float(market[field])
-                    except (ValueError, TypeError):
-                        pass
-            
-            bool_fields = [
-                'active', 'closed', 'new', 'featured', 'archived', 'restricted',
-                'enableOrderBook', 'hasReviewedDates', 'acceptingOrders', 'negRisk',
-                'ready', 'funded', 'cyom', 'pagerDutyNotificationEnabled', 'approved',
-                'automaticallyActive', 'clearBookOnStart', 'showGmpSeries', 
-                'showGmpOutcome', 'manualActivation', 'negRiskOther', 'pendingDeployment',
-                'deploying', 'rfqEnabled'
-            ]
-            for field in bool_fields:
-                if field in market and isinstance(market[field], str):
-                    if market[field].lower() == 'true':
-                        market[field] = True
-                    elif market[field].lower() == 'false':
-                        market[field] = False
-            
-            int_fields = ['id', 'commentCount']
-            for field in int_fields:
-                if field in market and isinstance(market[field], str):
-                    try:
-                        market[field] = int(market[field])
-                    except (ValueError, TypeError):
-                        pass
-            
-            if 'outcomePrices' in market and isinstance(market['outcomePrices'], list):
-                try:
-                    market['outcomePrices'] = [float(price) for price in market['outcomePrices']]
-                except (ValueError, TypeError):
-                    pass
-            
-            if 'events' in market and isinstance(market['events'], list):
-                for event in market['events']:
-                    for field in ['liquidity', 'volume', 'openInterest', 'competitive',
-                                 'volume24hr', 'volume1wk', 'volume1mo', 'volume1yr']:
-                        if field in event and isinstance(event[field], str):
-                            try:
-                                event[field] = float(event[field])
-                            except (ValueError, TypeError):
-                                pass
-                    
-                    for field in ['active', 'closed', 'archived', 'new', 'featured', 
-                                 'restricted', 'enableOrderBook', 'negRisk', 'cyom',
-                                 'showAllOutcomes', 'showMarketImages', 'enableNegRisk',
-                                 'automaticallyActive', 'negRiskAugmented', 'pendingDeployment',
-                                 'deploying']:
-                        if field in event and isinstance(event[field], str):
-                            if event[field].lower() == 'true':
-                                event[field] = True
-                            elif event[field].lower() == 'false':
-                                event[field] = False
-            
-            if 'clobRewards' in market and isinstance(market['clobRewards'], list):
-                for reward in market['clobRewards']:
-                    for field in ['rewardsAmount', 'rewardsDailyRate']:
-                        if field in reward and isinstance(reward[field], str):
-                            try:
-                                reward[field] = float(reward[field])
-                            except (ValueError, TypeError):
-                                pass
-
-        df = pd.DataFrame(res)[trading_keys.keys()]
-        
-        list_fields = [
-            'clobTokenIds',
-            'outcomes',
-            'outcomePrices',
-        ]
-        for k in list_fields:
-            tdf = pd.DataFrame(df[k].tolist(), index=df.index)
-            df[[k+str(i+1) for i in tdf.columns]] = tdf
-        
-        return df
+        request = recent_markets_request(look_back_days, minimum_volume, minimum_liquidity, limit, days_to_end)
+        return self.get_markets_frame(request)
+
+    def get_markets_frame(self, request: MarketRequest | dict) -> pd.DataFrame:
+        """
+        Every market matching the request (request.limit caps the total), as a typed trading_keys frame.
+        """
+        if isinstance(request, dict):
+            request = MarketRequest(**request)
+        markets = list(self.iter_markets(request, keys=trading_keys.keys()))
+        return markets_to_frame(markets, columns=trading_keys.keys())
 
 """
 Below is a concise, field-by-field cheat-sheet for a Polymarket “market” object as returned by the Gamma API, followed by a deeper look at the liquidity numbers.
@@ -2,6 +2,13 @@ from enum import Enum
 
 BASE_URL = "https://gamma-api.polymarket.com"
 
+# gamma caps a single page at 500 rows
+PAGE_SIZE = 500
+PREFETCH_PAGES = 4
+# sort pinned on paged walks that don't ask for one: prefetched offset pages must all see the same ordering,
+# or rows shift between fetches and get duplicated / skipped
+PAGE_ORDER = "id"
+
 class Endpoint(str, Enum):
     def __str__(self) -> str: 
         return self.value
@@ -12,6 +19,12 @@ class Endpoint(str, Enum):
     MARKETS = "markets"
     EVENTS  = "events"
 
+# seconds a decoded response stays in the shared response cache, per endpoint
+CACHE_TTL_SECONDS = {
+    Endpoint.MARKETS: 60,
+    Endpoint.EVENTS: 60,
+}
+
 class SortDir(str, Enum):
     ASC  = "asc"
     DESC = "desc"
@@ -0,0 +1,172 @@
+import contextlib
+import gc
+import re
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import orjson
+
+from polymarket.gamma_api.frames import LIST, FLOAT_LIST, MARKET_SCHEMA, _decode_list
+
+"""
+    faster decoding for big gamma pages.
+
+    - orjson instead of the stdlib json behind resp.json()
+    - key projection: each market is cut down to the keys the caller asked for as soon as it's decoded,
+      so the descriptions / images / nested event blurbs we never read are dropped straight away
+    - lazy list fields: the stringified outcomes / outcomePrices / clobTokenIds are decoded on first
+      access (LazyMarket) - markets_to_frame still sees the raw strings and decodes whole columns at once
+    - streaming: iter_json_array parses a top-level json array from a byte stream one element at a time,
+      so a huge page never sits in memory as a whole python object tree
+
+    orjson has no partial / projected parse, so each element is still fully decoded before projection -
+    the win is in never holding more than one unprojected element at a time.
+"""
+
+LAZY_FIELDS = frozenset(k for k, kind in MARKET_SCHEMA.items() if kind in (LIST, FLOAT_LIST))
+
+# chunk size for streamed responses
+STREAM_CHUNK_SIZE = 1 << 16
+
+# everything up to the next bracket, skipping complete strings whole (possessive, so no backtracking).
+# stops at a bracket, at the opening quote of a string cut off by the end of the buffer, or at the end.
+_SKIP = re.compile(rb'(?:[^"{}\[\]]++|"[^"\\]*+(?:\\.[^"\\]*+)*+")*+')
+_OPEN = frozenset(b'{[')
+_QUOTE = ord('"')
+
+_gc_lock = threading.Lock()
+_gc_pausers = 0
+_gc_restore = False
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """
+    decoding a big page allocates millions of containers, which keeps triggering gc passes over the
+    half-built tree. decoded json can't hold reference cycles, so collecting during the decode is wasted work.
+
+    gc switches are process-wide, so this only ever wraps a single orjson.loads of a buffered page: orjson
+    holds the gil for the whole parse, no other thread runs (or allocates) while gc is off, and no i/o
+    happens inside. re-entrant across threads: gc comes back on when the last pauser leaves (if it was on).
+    """
+    global _gc_pausers, _gc_restore
+    with _gc_lock:
+        if _gc_pausers == 0:
+            _gc_restore = gc.isenabled()
+            gc.disable()
+        _gc_pausers += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pausers -= 1
+            if _gc_pausers == 0 and _gc_restore:
+                gc.enable()
+
+
+class LazyMarket(Mapping):
+    """
+    read-only view over a (projected) raw market whose stringified list fields decode on first access.
+    `raw` is the underlying dict, exactly as gamma sent it.
+    """
+
+    __slots__ = ('raw', '_decoded')
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self._decoded: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.raw[key]
+        if key not in LAZY_FIELDS or not isinstance(value, str):
+            return value
+        try:
+            return self._decoded[key]
+        except KeyError:
+            decoded = self._decoded[key] = _decode_list(value)
+            return decoded
+
+    def __iter__(self):
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __repr__(self) -> str:
+        return f"LazyMarket({self.raw!r})"
+
+
+def project(obj: Any, keys: Optional[frozenset]) -> Any:
+    if keys is None or not isinstance(obj, dict):
+        return obj
+    return {k: v for k, v in obj.items() if k in keys}
+
+
+def decode_page(content: bytes, keys: Optional[Iterable[str]] = None, lazy: bool = False) -> Any:
+    """
+    orjson-decodes a response body; for a list of objects, projects each to `keys` and optionally wraps it in a LazyMarket.
+    """
+    with gc_paused():
+        payload = orjson.loads(content)
+    if not isinstance(payload, list) or (keys is None and not lazy):
+        return payload
+    keys = frozenset(keys) if keys is not None else None
+    if lazy:
+        return [LazyMarket(project(o, keys)) for o in payload]
+    return [project(o, keys) for o in payload]
+
+
+def iter_json_array(chunks: Iterable[bytes], keys: Optional[Iterable[str]] = None) -> Iterator[Any]:
+    """
+    yields the object / array elements of a top-level json array as they complete in the byte stream,
+    each projected to `keys`. scalar elements of the top-level array are skipped.
+
+    python only ever looks at brackets (strings and everything else are skipped by one regex match),
+    and each element is handed to orjson in one piece.
+    """
+    keys = frozenset(keys) if keys is not None else None
+    buf = bytearray()
+    pos = 0           # next offset to scan
+    depth = 0         # 1 == directly inside the top-level array
+    start = None      # offset where the current element began
+
+    for chunk in chunks:
+        buf += chunk
+        end = len(buf)
+        while True:
+            pos = _SKIP.match(buf, pos).end()
+            if pos >= end or buf[pos] == _QUOTE:
+                # out of data, or a string runs past what we have so far: wait for the next chunk
+                break
+            if buf[pos] in _OPEN:
+                if depth == 0 and buf[pos] != ord('['):
+                    raise ValueError("expected a json array in response stream")
+                depth += 1
+                if depth == 2:
+                    start = pos
+            else:
+                depth -= 1
+                if depth == 1:
+                    yield project(orjson.loads(buf[start:pos + 1]), keys)
+                    start = None
+            pos += 1
+
+        # drop everything before the element in progress (or everything scanned, between elements)
+        cut = start if start is not None else pos
+        if cut:
+            del buf[:cut]
+            pos -= cut
+            if start is not None:
+                start = 0
+
+    if depth != 0:
+        raise ValueError("truncated json array in response stream")
+
+
+def decode_stream(chunks: Iterable[bytes], keys: Optional[Iterable[str]] = None, lazy: bool = False) -> List[Any]:
+    """
+    decode_page for a chunked response body. gc stays on: the stream is read while it decodes.
+    """
+    items = iter_json_array(chunks, keys)
+    return [LazyMarket(o) for o in items] if lazy else list(items)
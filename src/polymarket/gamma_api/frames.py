@@ -0,0 +1,206 @@
+import orjson
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional
+
+"""
+    one declarative schema for a gamma "market" object, and a normalizer that turns a raw page of
+    markets straight into a typed DataFrame.
+
+    the old cleaning loop walked every market and every field list in python. here we pull each
+    column out once and cast it as a whole (pd.to_numeric / string lowercasing), and the stringified
+    list fields are decoded and exploded into fixed-width columns in a single pass.
+
+    nested objects (events, clobRewards) are passed through untouched - nothing downstream reads
+    more than events[0]['ticker'] from them.
+"""
+
+FLOAT = "float"
+INT = "int"
+BOOL = "bool"
+STR = "str"
+OBJECT = "object"
+LIST = "list"              # stringified json list -> exploded into <name>1..<name>N
+FLOAT_LIST = "float_list"  # same, but the exploded columns are cast to float
+
+MARKET_SCHEMA: Dict[str, str] = {
+    # identifiers
+    'id': INT,
+    'slug': STR,
+    'conditionId': STR,
+    'questionID': STR,
+    'clobTokenIds': LIST,
+    'outcomes': LIST,
+    'umaResolutionStatuses': OBJECT,
+
+    # pricing
+    'outcomePrices': FLOAT_LIST,
+    'lastTradePrice': FLOAT,
+    'bestBid': FLOAT,
+    'bestAsk': FLOAT,
+    'spread': FLOAT,
+    'oneDayPriceChange': FLOAT,
+    'oneWeekPriceChange': FLOAT,
+
+    # liquidity & volume
+    'liquidity': FLOAT,
+    'liquidityNum': FLOAT,
+    'liquidityClob': FLOAT,
+    'volume': FLOAT,
+    'volumeNum': FLOAT,
+    'volumeClob': FLOAT,
+    'volume24hr': FLOAT,
+    'volume1wk': FLOAT,
+    'volume1mo': FLOAT,
+    'volume1yr': FLOAT,
+    'volume24hrClob': FLOAT,
+    'volume1wkClob': FLOAT,
+    'volume1moClob': FLOAT,
+    'volume1yrClob': FLOAT,
+
+    # trading mechanics
+    'orderMinSize': FLOAT,
+    'orderPriceMinTickSize': FLOAT,
+    'rewardsMinSize': FLOAT,
+    'rewardsMaxSpread': FLOAT,
+    'umaBond': FLOAT,
+    'umaReward': FLOAT,
+    'commentCount': INT,
+
+    # status flags
+    'active': BOOL,
+    'closed': BOOL,
+    'new': BOOL,
+    'featured': BOOL,
+    'archived': BOOL,
+    'restricted': BOOL,
+    'enableOrderBook': BOOL,
+    'hasReviewedDates': BOOL,
+    'acceptingOrders': BOOL,
+    'negRisk': BOOL,
+    'ready': BOOL,
+    'funded': BOOL,
+    'cyom': BOOL,
+    'pagerDutyNotificationEnabled': BOOL,
+    'approved': BOOL,
+    'automaticallyActive': BOOL,
+    'clearBookOnStart': BOOL,
+    'showGmpSeries': BOOL,
+    'showGmpOutcome': BOOL,
+    'manualActivation': BOOL,
+    'negRiskOther': BOOL,
+    'pendingDeployment': BOOL,
+    'deploying': BOOL,
+    'rfqEnabled': BOOL,
+
+    # dates (kept as iso strings)
+    'startDate': STR,
+    'endDate': STR,
+    'createdAt': STR,
+    'updatedAt': STR,
+
+    # nested
+    'events': OBJECT,
+    'clobRewards': OBJECT,
+}
+
+# every polymarket market is binary, so the list fields explode into exactly two columns
+LIST_WIDTH = 2
+
+_BOOL_MAP = {'true': True, 'false': False}
+
+
+def _decode_list(value: Any) -> Optional[list]:
+    if isinstance(value, (str, bytes)):
+        try:
+            value = orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return None
+    return value if isinstance(value, list) else None
+
+
+def _decode_lists(values: List[Any], as_float: bool = False) -> List[Optional[list]]:
+    """
+    decodes a whole column of stringified lists with one orjson call by splicing them into a single
+    json array. falls back to element-wise decoding if the column is mixed or any entry is malformed.
+
+    for float lists the quotes are stripped first ('["0.97", "0.03"]' -> [0.97, 0.03]) so orjson
+    hands back floats directly instead of strings we'd have to parse again.
+    """
+    if values and all(isinstance(v, str) for v in values):
+        joined = "[" + ",".join(values) + "]"
+        try:
+            decoded = orjson.loads(joined.replace('"', '') if as_float else joined)
+            if len(decoded) == len(values) and all(isinstance(v, list) for v in decoded):
+                return decoded
+        except orjson.JSONDecodeError:
+            pass
+    if as_float:
+        values = [v.replace('"', '') if isinstance(v, str) else v for v in values]
+    return [_decode_list(v) for v in values]
+
+
+def _explode(decoded: List[Optional[list]], name: str, width: int, as_float: bool) -> Dict[str, Any]:
+    """
+    spreads a column of decoded lists into <name>1..<name>width, padding short lists with None.
+    """
+    if all(v is not None and len(v) == width for v in decoded):
+        rows = decoded
+    else:
+        padded = [None] * width
+        rows = [
+            padded if v is None else v[:width] if len(v) >= width else v + padded[len(v):]
+            for v in decoded
+        ]
+    grid = np.empty((len(rows), width), dtype=object)
+    if rows:
+        grid[:] = rows
+    return {
+        f"{name}{i + 1}": pd.to_numeric(grid[:, i], errors='coerce') if as_float else grid[:, i]
+        for i in range(width)
+    }
+
+
+def _cast(values: List[Any], kind: str) -> Any:
+    if kind == FLOAT:
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+    if kind == INT:
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype('Int64')
+    if kind == BOOL:
+        return pd.Series(values, dtype=object).astype('string').str.lower().map(_BOOL_MAP).astype('boolean')
+    return values
+
+
+def markets_to_frame(
+    markets: List[Dict[str, Any]],
+    columns: Optional[Iterable[str]] = None,
+    schema: Dict[str, str] = MARKET_SCHEMA,
+    list_width: int = LIST_WIDTH,
+) -> pd.DataFrame:
+    """
+    Converts a raw page of gamma markets into a typed DataFrame.
+
+    `columns` picks (and orders) the fields to keep - defaults to the whole schema. list fields are kept
+    decoded under their own name and additionally exploded into fixed-width <name>1..<name>N columns.
+    fields missing from a market come out as NaN/None instead of raising.
+    """
+    columns = list(columns) if columns is not None else list(schema)
+    # LazyMarket views (gamma_api.decode) -> their raw dicts, so list fields are decoded column-wise below
+    markets = [getattr(m, 'raw', m) for m in markets]
+    data: Dict[str, Any] = {}
+    exploded: Dict[str, Any] = {}
+
+    for name in columns:
+        kind = schema.get(name, OBJECT)
+        raw = [m.get(name) for m in markets]
+        if kind in (LIST, FLOAT_LIST):
+            decoded = _decode_lists(raw, as_float=kind == FLOAT_LIST)
+            exploded.update(_explode(decoded, name, list_width, as_float=kind == FLOAT_LIST))
+            data[name] = decoded
+        else:
+            data[name] = _cast(raw, kind)
+
+    df = pd.DataFrame(data, columns=columns)
+    for name, col in exploded.items():
+        df[name] = col
+    return df
@@ -0,0 +1,260 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+"""
+    in-memory market index: go from a clob token id / condition id / event ticker / slug to its market
+    without scanning a DataFrame or calling gamma again.
+
+    a MarketIndex is immutable once built: market records live in array-backed columns and every key maps
+    to a row number through a plain dict. refreshing builds a new index and swaps the reference held by a
+    MarketIndexRef, so strategy threads reading `ref.current` never take a lock or see a half-built index.
+"""
+
+COLUMNS = (
+    'market_id',
+    'condition_id',
+    'slug',
+    'event_id',     # event ticker
+    'event_slug',
+    'end_date',
+    'token1',
+    'token2',
+    'outcome1',
+    'outcome2',
+)
+
+# markets stay in the index for this long after their end date (positions still get looked up while they resolve)
+INDEX_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+def _missing(value: Any) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and value != value)
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    # np.array() would turn a column of lists into a 2d array, so fill a 1d object array explicitly
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+def _first_event(events: Any) -> Dict[str, Any]:
+    return events[0] if isinstance(events, list) and events and isinstance(events[0], dict) else {}
+
+
+def frame_to_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    index columns from a get_recent_markets frame (either the gamma client's or the strategy's renamed one).
+    """
+    def col(*names):
+        for name in names:
+            if name in df.columns:
+                # NaN / pd.NA -> None so missing keys never end up in the lookup dicts
+                return _object_array([None if _missing(v) else v for v in df[name]])
+        return np.full(len(df), None, dtype=object)
+
+    events = [_first_event(e) for e in col('events')]
+    event_id = col('event_id')
+    return {
+        'market_id': _object_array([None if i is None else str(i) for i in col('id')]),
+        'condition_id': col('condition_id', 'conditionId'),
+        'slug': col('slug'),
+        'event_id': _object_array([t if t is not None else e.get('ticker') for t, e in zip(event_id, events)]),
+        'event_slug': _object_array([e.get('slug') for e in events]),
+        'end_date': col('end_date', 'endDate'),
+        'token1': col('clobTokenIds1'),
+        'token2': col('clobTokenIds2'),
+        'outcome1': col('outcomes1'),
+        'outcome2': col('outcomes2'),
+        'closed': col('closed'),
+    }
+
+
+def _expiry(end_dates: np.ndarray) -> np.ndarray:
+    """
+    end dates -> epoch seconds (inf when unknown, so the market never expires).
+    """
+    if not len(end_dates):
+        return np.empty(0, dtype=float)
+    stamps = pd.to_datetime(pd.Series(end_dates, dtype=object), utc=True, errors='coerce', format='mixed')
+    missing = stamps.isna().to_numpy()
+    seconds = stamps.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9
+    return np.where(missing, np.inf, seconds)
+
+
+class MarketIndex:
+    """
+    immutable multi-key index over market records. build with MarketIndex.from_frame or .merge.
+    """
+
+    def __init__(self, columns: Optional[Dict[str, np.ndarray]] = None):
+        columns = columns or {}
+        n = len(next(iter(columns.values()))) if columns else 0
+        self.columns = {c: columns.get(c, np.full(n, None, dtype=object)) for c in COLUMNS}
+        self.expires = _expiry(self.columns['end_date'])
+        self.live = np.ones(n, dtype=bool)
+        self.size = n
+
+        self._by_token: Dict[str, Tuple[int, int]] = {}
+        self._by_condition: Dict[str, int] = {}
+        self._by_slug: Dict[str, int] = {}
+        self._event_rows: Dict[str, List[int]] = {}
+        for i in range(n):
+            self._add_keys(i, self._event_rows)
+
+    def _keys(self, i: int):
+        return (
+            [(self.columns[c][i], k) for k, c in enumerate(('token1', 'token2')) if self.columns[c][i] is not None],
+            self.columns['condition_id'][i],
+            self.columns['slug'][i],
+            {key for key in (self.columns['event_id'][i], self.columns['event_slug'][i]) if key is not None},
+        )
+
+    def _add_keys(self, i: int, event_rows: Dict[str, List[int]]):
+        tokens, condition_id, slug, events = self._keys(i)
+        for token, k in tokens:
+            self._by_token[token] = (i, k)
+        if condition_id is not None:
+            self._by_condition[condition_id] = i
+        if slug is not None:
+            self._by_slug[slug] = i
+        for key in events:
+            event_rows.setdefault(key, []).append(i)
+
+    def _drop_keys(self, i: int, event_rows: Dict[str, List[int]]):
+        tokens, condition_id, slug, events = self._keys(i)
+        for token, _ in tokens:
+            if self._by_token.get(token, (None,))[0] == i:
+                del self._by_token[token]
+        if self._by_condition.get(condition_id) == i:
+            del self._by_condition[condition_id]
+        if self._by_slug.get(slug) == i:
+            del self._by_slug[slug]
+        for key in events:
+            rows = [r for r in event_rows.get(key, ()) if r != i]
+            if rows:
+                event_rows[key] = rows
+            else:
+                event_rows.pop(key, None)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "MarketIndex":
+        return cls().merge(df)
+
+    def merge(self, df: pd.DataFrame, now: Optional[float] = None) -> "MarketIndex":
+        """
+        a new index holding this one's markets plus the frame's. a fresh market replaces the old record sharing
+        one of its clob tokens (or, for markets without tokens, its condition id); closed markets in the frame
+        and markets that ended more than INDEX_RETENTION_SECONDS ago are evicted.
+
+        only the delta is touched: the lookup dicts are copied (C speed) and patched for the replaced / evicted /
+        added rows. once evicted rows outnumber live ones, the index is compacted with a full rebuild.
+        """
+        fresh = frame_to_columns(df)
+        m = len(fresh['market_id'])
+        closed = fresh.pop('closed')
+        add = np.array([c is None or not bool(c) for c in closed], dtype=bool)
+
+        # rows the frame supersedes
+        dead = set()
+        for j in range(m):
+            tokens = [t for t in (fresh['token1'][j], fresh['token2'][j]) if t is not None]
+            if tokens:
+                dead.update(self._by_token[t][0] for t in tokens if t in self._by_token)
+            elif fresh['condition_id'][j] is not None and fresh['condition_id'][j] in self._by_condition:
+                dead.add(self._by_condition[fresh['condition_id'][j]])
+        now = time.time() if now is None else now
+        dead.update(np.flatnonzero(self.live & (self.expires < now - INDEX_RETENTION_SECONDS)).tolist())
+
+        n = len(self.live)
+        out = MarketIndex.__new__(MarketIndex)
+        out.columns = {c: np.concatenate([self.columns[c], fresh[c]]) for c in COLUMNS}
+        out.expires = np.concatenate([self.expires, _expiry(fresh['end_date'])])
+        out.live = np.concatenate([self.live, add])
+        out._by_token = self._by_token.copy()
+        out._by_condition = self._by_condition.copy()
+        out._by_slug = self._by_slug.copy()
+        # the lists are shared with this index: _drop_keys / _add_keys replace them rather than mutate
+        event_rows = {k: v for k, v in self._event_rows.items()}
+        for i in dead:
+            out._drop_keys(i, event_rows)
+            out.live[i] = False
+        added = np.flatnonzero(add)
+        for key in {k for c in ('event_id', 'event_slug') for k in fresh[c][added] if k is not None}:
+            event_rows[key] = list(event_rows.get(key, ()))
+        for j in added:
+            out._add_keys(n + j, event_rows)
+        out._event_rows = event_rows
+        out.size = int(out.live.sum())
+
+        if len(out.live) - out.size > out.size:
+            return MarketIndex({c: out.columns[c][out.live] for c in COLUMNS})
+        return out
+
+    # lookups ---------------------------------------------------------------- #
+
+    def __len__(self) -> int:
+        return self.size
+
+    def record(self, row: int) -> Dict[str, Any]:
+        return {c: self.columns[c][row] for c in COLUMNS}
+
+    def by_token(self, token_id: str) -> Optional[Dict[str, Any]]:
+        """
+        the market a clob token belongs to, plus which side of it ('outcome' / 'outcome_index').
+        """
+        hit = self._by_token.get(token_id)
+        if hit is None:
+            return None
+        row, k = hit
+        rec = self.record(row)
+        rec['outcome_index'] = k
+        rec['outcome'] = rec[f'outcome{k + 1}']
+        return rec
+
+    def by_condition(self, condition_id: str) -> Optional[Dict[str, Any]]:
+        row = self._by_condition.get(condition_id)
+        return None if row is None else self.record(row)
+
+    def by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        row = self._by_slug.get(slug)
+        return None if row is None else self.record(row)
+
+    def event_markets(self, event: str) -> List[Dict[str, Any]]:
+        """
+        every indexed market of an event, by ticker or event slug.
+        """
+        return [self.record(row) for row in self._event_rows.get(event, ())]
+
+    def event_for_token(self, token_id: str) -> Optional[str]:
+        hit = self._by_token.get(token_id)
+        return None if hit is None else self.columns['event_id'][hit[0]]
+
+
+class MarketIndexRef:
+    """
+    holder for the live MarketIndex. readers grab `.current` (a plain attribute read); writers build a
+    replacement off to the side and swap it in under a lock that only writers take.
+    """
+
+    def __init__(self):
+        self.current = MarketIndex()
+        self._write_lock = threading.Lock()
+
+    def swap(self, index: MarketIndex):
+        with self._write_lock:
+            self.current = index
+
+    def refresh(self, df: pd.DataFrame):
+        """
+        merges a fresh market frame into the live index.
+        """
+        with self._write_lock:
+            self.current = self.current.merge(df)
+
+
+market_index = MarketIndexRef()
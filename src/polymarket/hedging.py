@@ -0,0 +1,218 @@
+import concurrent.futures
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+from prometheus_client import Counter, Histogram
+
+from utils.log import logger
+
+"""
+    tail-latency hedging for idempotent reads.
+
+    a handful of slow GETs (positions, gamma markets, clob prices) set the p99 of a whole rebalance. most of
+    those are one unlucky request, not a slow server: a duplicate sent a moment later usually comes back first.
+    so: if a read hasn't answered within its endpoint's observed p95, the same request goes out a second
+    time and whichever answers first wins. the loser runs to completion in the background and is discarded.
+
+    - only reads are ever hedged - callers opt in per call, and no order posting / cancelling path does
+    - hedging happens inside one rate limiter admission: callers wrap the raw request, limiter.call(lambda:
+      hedged(url, request)), so the duplicate rides on the original's slot and throttling / retries / backoff
+      stay the limiter's business
+    - a global token bucket bounds that extra load: every call earns HEDGE_BUDGET of a hedge, a hedge costs one
+    - an endpoint is only hedged once it has HEDGE_MIN_SAMPLES latencies to take a p95 from
+
+    every attempt's wire latency (the raw request only - no token bucket waits, no backoff) is recorded whether
+    hedging is on or not, so hedge_stats() / the latency histogram report per-endpoint percentiles either way.
+    HEDGE_BUDGET=0 (the default) measures without hedging.
+"""
+
+# fraction of calls that may be hedged (0 = off, e.g. 0.05 = at most one hedge per 20 calls)
+HEDGE_BUDGET = float(os.getenv("POLYMARKET_HEDGE_BUDGET", 0))
+# unspent hedges that can pile up for a burst of slow calls
+HEDGE_BURST = 10
+HEDGE_MIN_SAMPLES = 20
+# the hedge never fires sooner than this, however fast the endpoint usually is
+HEDGE_MIN_DELAY_SECONDS = 0.05
+LATENCY_WINDOW = 512
+HEDGE_WORKERS = 32
+
+request_latency = Histogram(
+    "polymarket_request_latency_seconds",
+    "latency of single read attempts by endpoint",
+    ["endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+hedged_requests = Counter(
+    "polymarket_hedged_requests",
+    "hedged reads by endpoint and outcome (hedged = duplicate sent, won = the duplicate answered first)",
+    ["endpoint", "outcome"],
+)
+
+
+def endpoint_of(url: str) -> str:
+    """
+    metrics label for a url: host + path, no scheme or query.
+    """
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}" if parts.netloc else url
+
+
+class _Endpoint:
+    __slots__ = ('latencies', 'calls', 'hedges', 'wins')
+
+    def __init__(self):
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.hedges = 0
+        self.wins = 0
+
+
+class Hedger:
+    """
+    per-endpoint latency windows + the shared hedge budget. thread safe.
+    """
+
+    def __init__(self, budget: float = HEDGE_BUDGET, burst: float = HEDGE_BURST, min_samples: int = HEDGE_MIN_SAMPLES, workers: int = HEDGE_WORKERS):
+        self.budget = budget
+        self.burst = burst
+        self.min_samples = min_samples
+        self.workers = workers
+        self._tokens = float(burst)
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    # bookkeeping ---------------------------------------------------------- #
+
+    def _endpoint(self, endpoint: str) -> _Endpoint:
+        state = self._endpoints.get(endpoint)
+        if state is None:
+            state = self._endpoints.setdefault(endpoint, _Endpoint())
+        return state
+
+    def record(self, endpoint: str, seconds: float):
+        with self._lock:
+            self._endpoint(endpoint).latencies.append(seconds)
+        request_latency.labels(endpoint).observe(seconds)
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """
+        how long to give the first attempt before hedging, None while there aren't enough samples.
+        """
+        with self._lock:
+            latencies = self._endpoint(endpoint).latencies
+            if len(latencies) < self.min_samples:
+                return None
+            p95 = float(np.percentile(np.fromiter(latencies, dtype=float), 95))
+        return max(p95, HEDGE_MIN_DELAY_SECONDS)
+
+    def _take_hedge(self, endpoint: str) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._endpoint(endpoint).hedges += 1
+        return True
+
+    # calls ---------------------------------------------------------------- #
+
+    def _attempt(self, endpoint: str, fn: Callable[[], Any]) -> Callable[[], Any]:
+        ctx = contextvars.copy_context()
+
+        def run():
+            started = time.monotonic()
+            try:
+                return ctx.run(fn)
+            finally:
+                self.record(endpoint, time.monotonic() - started)
+        return run
+
+    def call(self, endpoint: str, fn: Callable[[], Any]) -> Any:
+        """
+        fn(), hedged with a second fn() if the first is slower than the endpoint's p95. fn must be safe to run twice.
+        """
+        with self._lock:
+            self._endpoint(endpoint).calls += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+        delay = self.delay(endpoint) if self.budget > 0 else None
+        if delay is None:
+            return self._attempt(endpoint, fn)()
+
+        pool = self._executor()
+        first = pool.submit(self._attempt(endpoint, fn))
+        try:
+            return first.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        if not self._take_hedge(endpoint):
+            return first.result()
+
+        hedged_requests.labels(endpoint, "hedged").inc()
+        second = pool.submit(self._attempt(endpoint, fn))
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        with self._lock:
+                            self._endpoint(endpoint).wins += 1
+                        hedged_requests.labels(endpoint, "won").inc()
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hedge")
+        return self._pool
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        {endpoint: {'calls', 'hedges', 'hedge_rate', 'hedge_wins', 'p50', 'p95', 'p99'}} over the latency window.
+        """
+        with self._lock:
+            snapshot = {ep: (s.calls, s.hedges, s.wins, list(s.latencies)) for ep, s in self._endpoints.items()}
+        out = {}
+        for endpoint, (calls, hedges, wins, latencies) in snapshot.items():
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (np.nan,) * 3
+            out[endpoint] = {
+                'calls': calls,
+                'hedges': hedges,
+                'hedge_rate': hedges / calls if calls else 0.0,
+                'hedge_wins': wins,
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+            }
+        return out
+
+    def log_stats(self):
+        for endpoint, s in sorted(self.stats().items()):
+            logger.info(
+                f"{endpoint}: {s['calls']} calls, {s['hedge_rate']:.1%} hedged ({s['hedge_wins']} won), "
+                f"p50 {s['p50'] * 1000:.0f}ms p95 {s['p95'] * 1000:.0f}ms p99 {s['p99'] * 1000:.0f}ms"
+            )
+
+
+hedger = Hedger()
+
+
+def hedged(url: str, fn: Callable[[], Any]) -> Any:
+    """
+    runs an idempotent read through the shared hedger, labelled by its url's endpoint.
+    """
+    return hedger.call(endpoint_of(url), fn)
+
+
+def hedge_stats() -> Dict[str, Dict[str, Any]]:
+    return hedger.stats()
@@ -0,0 +1,278 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from prometheus_client import Counter, Gauge
+from py_clob_client.exceptions import PolyApiException
+
+from utils.log import logger
+
+"""
+    adaptive per-host rate limiting.
+
+    every request to a host goes through that host's HostLimiter, which combines
+      - a token bucket (requests / second) that shapes bursts, and
+      - an AIMD concurrency window: +1 slot per window of clean responses, halved on a 429 / 5xx / timeout.
+
+    a throttled response also halves the refill rate and, when the server sends Retry-After, blocks the whole
+    host until then - so every thread backs off together instead of each one retrying into the wall. the rate
+    and window then creep back up towards their ceilings while responses stay clean.
+
+    retries (with full-jitter exponential backoff) only happen for idempotent calls, plus non-idempotent ones
+    the server explicitly rejected with a 429: a timed out order post may well have gone through. once the
+    retries run out the original error is raised, so callers see the same exceptions as before.
+"""
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_CAP_SECONDS = 10.0
+# how often a blocked caller re-checks the bucket / window
+POLL_SECONDS = 0.01
+# a burst of failures from one overloaded moment only counts as one multiplicative decrease
+DECREASE_INTERVAL_SECONDS = 1.0
+
+# (requests per second, concurrent requests) ceilings per host, kept under polymarket's published limits
+HOST_LIMITS: Dict[str, Tuple[float, int]] = {
+    "gamma-api.polymarket.com": (30.0, 8),
+    "data-api.polymarket.com": (20.0, 8),
+    "clob.polymarket.com": (40.0, 10),
+}
+DEFAULT_LIMITS: Tuple[float, int] = (10.0, 4)
+
+throttled_responses = Counter(
+    "polymarket_throttled_responses",
+    "responses that made the limiter back off (429, 5xx, timeouts)",
+    ["host", "reason"],
+)
+limiter_window = Gauge(
+    "polymarket_limiter_window",
+    "current AIMD concurrency window per host",
+    ["host"],
+)
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify(error: BaseException) -> Tuple[Optional[str], Optional[float], bool]:
+    """
+    (reason, retry_after, rejected) for errors that mean "slow down", (None, None, False) for everything else.
+    `rejected` is True when the server definitely did not act on the request (a 429), so even a
+    non-idempotent call is safe to resend.
+    """
+    status, headers = None, {}
+    if isinstance(error, (requests.Timeout, requests.ConnectionError, httpx.TimeoutException, httpx.TransportError)):
+        return 'timeout', None, False
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status, headers = error.response.status_code, error.response.headers
+    elif isinstance(error, httpx.HTTPStatusError):
+        status, headers = error.response.status_code, error.response.headers
+    elif isinstance(error, PolyApiException):
+        # py_clob_client wraps request exceptions with status_code None, and drops the response headers
+        if error.status_code is None:
+            return 'timeout', None, False
+        status = error.status_code
+
+    if status not in RETRY_STATUSES:
+        return None, None, False
+    return str(status), _retry_after_seconds(headers.get('Retry-After')), status == 429
+
+
+class HostLimiter:
+    """
+    token bucket + AIMD concurrency window for one host. thread-safe; the async entry point shares the same state.
+    """
+
+    def __init__(self, host: str, max_rate: float, max_concurrency: int, min_rate: float = 1.0):
+        self.host = host
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.max_concurrency = max_concurrency
+
+        self.rate = max_rate
+        self.window = float(max_concurrency)
+        self.tokens = max_rate
+        self.in_flight = 0
+        self.blocked_until = 0.0
+
+        self._last_refill = time.monotonic()
+        self._last_decrease = float('-inf')
+        self._lock = threading.Lock()
+        self.stats_counts: Dict[str, int] = {'calls': 0, 'throttled': 0, 'retries': 0}
+        limiter_window.labels(host).set(self.window)
+
+    @property
+    def limit(self) -> int:
+        """
+        concurrent requests currently allowed - size worker pools from this.
+        """
+        return max(1, int(self.window))
+
+    # admission ------------------------------------------------------------ #
+
+    def _try_acquire(self) -> float:
+        """
+        takes a token + a window slot and returns 0, or returns how long to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            self.tokens = min(self.rate, self.tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            if self.in_flight >= self.limit:
+                return POLL_SECONDS
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+            self.tokens -= 1
+            self.in_flight += 1
+            self.stats_counts['calls'] += 1
+            return 0.0
+
+    def acquire(self):
+        while (wait := self._try_acquire()) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        while (wait := self._try_acquire()) > 0:
+            await asyncio.sleep(wait)
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    # feedback ------------------------------------------------------------- #
+
+    def on_success(self):
+        with self._lock:
+            # additive increase: roughly +1 slot and +1 req/s per window's worth of clean responses
+            self.window = min(self.max_concurrency, self.window + 1 / self.window)
+            self.rate = min(self.max_rate, self.rate + 1 / self.window)
+        limiter_window.labels(self.host).set(self.window)
+
+    def on_throttle(self, reason: str, retry_after: Optional[float] = None):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease >= DECREASE_INTERVAL_SECONDS:
+                self._last_decrease = now
+                self.window = max(1.0, self.window / 2)
+                self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            self.stats_counts['throttled'] += 1
+        throttled_responses.labels(self.host, reason).inc()
+        limiter_window.labels(self.host).set(self.window)
+        logger.warning(f"{self.host}: throttled ({reason}), window -> {self.window:.1f}, rate -> {self.rate:.1f}/s")
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        # full jitter, but never earlier than the server asked for
+        delay = random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    def _should_retry(self, error: BaseException, attempt: int, retries: int, idempotent: bool) -> Optional[float]:
+        """
+        feeds a failure back into the limiter; returns the backoff delay if the call should be retried.
+        """
+        reason, retry_after, rejected = classify(error)
+        if reason is None:
+            return None
+        self.on_throttle(reason, retry_after)
+        if attempt >= retries or not (idempotent or rejected):
+            return None
+        with self._lock:
+            self.stats_counts['retries'] += 1
+        return self._backoff(attempt, retry_after)
+
+    # entry points --------------------------------------------------------- #
+
+    def call(self, fn: Callable[[], Any], idempotent: bool = True, retries: int = MAX_RETRIES) -> Any:
+        """
+        runs fn under the limiter, retrying throttled attempts. fn should raise on http errors.
+        """
+        for attempt in range(retries + 1):
+            self.acquire()
+            try:
+                result = fn()
+            except Exception as e:
+                self.release()
+                delay = self._should_retry(e, attempt, retries, idempotent)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self.release()
+                raise
+            self.release()
+            self.on_success()
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], idempotent: bool = True, retries: int = MAX_RETRIES) -> Any:
+        for attempt in range(retries + 1):
+            await self.aacquire()
+            try:
+                result = await fn()
+            except Exception as e:
+                self.release()
+                delay = self._should_retry(e, attempt, retries, idempotent)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # cancellation: give the slot back without counting it as feedback
+                self.release()
+                raise
+            self.release()
+            self.on_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats_counts,
+                'window': round(self.window, 2),
+                'rate': round(self.rate, 2),
+                'in_flight': self.in_flight,
+            }
+
+
+_limiters: Dict[str, HostLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(url_or_host: str) -> HostLimiter:
+    """
+    the process-wide limiter for a host (accepts a bare host or any url on it).
+    """
+    host = urlsplit(url_or_host).netloc or url_or_host
+    limiter = _limiters.get(host)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(host)
+            if limiter is None:
+                rate, concurrency = HOST_LIMITS.get(host, DEFAULT_LIMITS)
+                limiter = _limiters[host] = HostLimiter(host, rate, concurrency)
+    return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    return {host: limiter.stats() for host, limiter in list(_limiters.items())}
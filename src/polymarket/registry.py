@@ -0,0 +1,90 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from polymarket.clob_api.client import PolymarketClobClient
+from polymarket.clob_api.constants import Environment
+from polymarket.clob_api.creds import CredsStore, creds_store
+from polymarket.data_api.client import PolymarketDataClient
+from polymarket.gamma_api.client import PolymarketGammaClient
+from utils.log import logger
+
+"""
+    process-wide registry of api clients.
+
+    every PolymarketStrategy used to build its own clob, gamma and data clients: one credential derivation
+    and three connection pools per strategy. the registry hands out one clob client per
+    (private key, proxy address, host) and one gamma / data client per process, built on first request.
+
+    the clients are safe to share between strategy threads: their mutable state is the shared response
+    cache, the rate limiters and the token metadata cache, which all lock internally, plus a requests.Session
+    whose pool is sized for concurrent use below.
+"""
+
+# connections kept per host by the shared gamma / data sessions (requests' default of 10 drops the rest after use)
+SHARED_POOL_SIZE = 32
+
+
+def pooled_session(pool_size: int = SHARED_POOL_SIZE) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class ClientRegistry:
+
+    def __init__(self, creds: Optional[CredsStore] = creds_store):
+        self.creds = creds
+        self._clients: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._building: Dict[Hashable, threading.Lock] = {}
+
+    def _get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        # per-key lock: a slow clob handshake doesn't hold up other keys, and concurrent callers build once
+        with building:
+            client = self._clients.get(key)
+            if client is None:
+                started = time.perf_counter()
+                client = self._clients[key] = build()
+                logger.info(f"client registry: built {type(client).__name__} in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return client
+
+    def clob(self, private_key: str = None, proxy_address: str = None, clob_host: str = None) -> PolymarketClobClient:
+        private_key = private_key or os.getenv(Environment.POLYMARKET_PRIVATE_KEY)
+        proxy_address = proxy_address or os.getenv(Environment.POLYMARKET_PROXY_ADDRESS)
+        clob_host = clob_host or os.getenv(Environment.POLYMARKET_CLOB_HOST)
+        # the key itself never becomes part of a dict key
+        key_id = hashlib.sha256((private_key or '').encode()).hexdigest()
+        return self._get(
+            ('clob', key_id, proxy_address, clob_host),
+            lambda: PolymarketClobClient(private_key=private_key, proxy_address=proxy_address, clob_host=clob_host, creds=self.creds),
+        )
+
+    def gamma(self) -> PolymarketGammaClient:
+        return self._get(('gamma',), lambda: PolymarketGammaClient(session=pooled_session()))
+
+    def data(self) -> PolymarketDataClient:
+        return self._get(('data',), lambda: PolymarketDataClient(session=pooled_session()))
+
+    def clear(self):
+        """
+        forgets every client (the next request builds fresh ones).
+        """
+        with self._lock:
+            self._clients.clear()
+            self._building.clear()
+
+
+client_registry = ClientRegistry()
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from prometheus_client import Counter
+
+"""
+    single-flight request coalescing.
+
+    StrategyRunner threads tend to wake up together and fire the exact same get_markets / positions /
+    get_prices calls at the same moment. with single-flight, the first caller for a key does the work and
+    every concurrent caller with the same key blocks on that one in-flight call and gets its decoded result.
+
+    the result object is shared between all waiters -> treat it as read-only.
+"""
+
+coalesced_requests = Counter(
+    "polymarket_coalesced_requests",
+    "identical api calls that piggybacked on an in-flight request instead of going out",
+    ["endpoint"],
+)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    thread-based single-flight group. `do(key, fn)` runs fn once per key at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Call] = {}
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+
+    def do(self, key: Hashable, fn: Callable[[], Any], endpoint: str = "") -> Any:
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.calls[endpoint] += 1
+            else:
+                self.coalesced[endpoint] += 1
+
+        if not leader:
+            coalesced_requests.labels(endpoint).inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        {endpoint: {'calls': requests that went out, 'coalesced': requests that piggybacked}}
+        """
+        with self._lock:
+            return {
+                ep: {'calls': self.calls[ep], 'coalesced': self.coalesced[ep]}
+                for ep in set(self.calls) | set(self.coalesced)
+            }
+
+
+class AsyncSingleFlight:
+    """
+    asyncio flavour of SingleFlight for the async clients. keys are only shared within one event loop.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], endpoint: str = "") -> Any:
+        key = (id(asyncio.get_running_loop()), key)
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.coalesced[endpoint] += 1
+            coalesced_requests.labels(endpoint).inc()
+            # shield so one waiter being cancelled doesn't cancel the shared call
+            return await asyncio.shield(fut)
+
+        self.calls[endpoint] += 1
+        fut = self._inflight[key] = asyncio.ensure_future(fn())
+        try:
+            return await asyncio.shield(fut)
+        finally:
+            if fut.done():
+                self._inflight.pop(key, None)
+            else:
+                fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+
+single_flight = SingleFlight()
+async_single_flight = AsyncSingleFlight()
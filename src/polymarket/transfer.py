@@ -0,0 +1,56 @@
+import contextlib
+import contextvars
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+"""
+    bytes / rows actually pulled over the wire, attributed to whoever opened the meter.
+
+        with metered() as meter:
+            df = gamma_client.get_markets_frame(request)
+        meter.bytes, meter.rows, meter.requests
+
+    the meter rides on a contextvar, so it follows the caller into the clients' _fetch without threading an
+    argument through every method. responses served from the response cache (or piggybacked on another
+    caller's in-flight request) never reach _fetch and so count as zero transfer, which is the point.
+"""
+
+
+class TransferMeter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes = 0
+        self.rows = 0
+
+    def record(self, nbytes: int, payload: Any):
+        rows = len(payload) if isinstance(payload, list) else 1
+        with self._lock:
+            self.requests += 1
+            self.bytes += nbytes
+            self.rows += rows
+
+    def as_dict(self) -> Dict[str, int]:
+        return {'requests': self.requests, 'bytes': self.bytes, 'rows': self.rows}
+
+
+_current: contextvars.ContextVar[Optional[TransferMeter]] = contextvars.ContextVar("transfer_meter", default=None)
+
+
+@contextlib.contextmanager
+def metered() -> Iterator[TransferMeter]:
+    meter = TransferMeter()
+    token = _current.set(meter)
+    try:
+        yield meter
+    finally:
+        _current.reset(token)
+
+
+def record_transfer(nbytes: int, payload: Any):
+    """
+    called by the clients' _fetch after decoding a response. no-op when nobody is metering.
+    """
+    meter = _current.get()
+    if meter is not None:
+        meter.record(nbytes, payload)
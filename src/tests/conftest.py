@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# imports are rooted at src/, like everywhere else in the repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ws_replay import ReplayServer  # noqa: E402
+
+
+@pytest.fixture
+def ws_server():
+    """
+    start(*sessions) -> a running ReplayServer, shut down after the test.
+    """
+    servers = []
+
+    def start(*sessions) -> ReplayServer:
+        server = ReplayServer(list(sessions))
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
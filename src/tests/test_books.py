@@ -0,0 +1,146 @@
+import threading
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from polymarket.clob_api import books
+from polymarket.clob_api.books import Level, OrderBookMirror
+from ws_replay import hold, wait_for
+
+TOKEN = "71321045679252212594626385532706912750332728571942532289631379312455583992563"
+
+# a captured market channel session, trimmed to one token: the subscribe snapshot, then deltas
+SNAPSHOT = {
+    'event_type': 'book',
+    'asset_id': TOKEN,
+    'market': '0x5f65177b394277fd294cd75650044e32ba009a95022d88a0c1d565897d72f8f1',
+    'bids': [{'price': '0.48', 'size': '30'}, {'price': '0.49', 'size': '20'}, {'price': '0.50', 'size': '15'}],
+    'asks': [{'price': '0.52', 'size': '25'}, {'price': '0.53', 'size': '60'}, {'price': '0.54', 'size': '10'}],
+    'timestamp': '1757908892351',
+}
+DELTAS = [
+    # a better bid, and the best ask shrinks
+    {'event_type': 'price_change', 'market': SNAPSHOT['market'], 'timestamp': '1757908892400', 'price_changes': [
+        {'asset_id': TOKEN, 'price': '0.51', 'size': '5', 'side': 'BUY'},
+        {'asset_id': TOKEN, 'price': '0.52', 'size': '12', 'side': 'SELL'},
+    ]},
+    {'event_type': 'last_trade_price', 'asset_id': TOKEN, 'price': '0.52', 'size': '13', 'side': 'BUY', 'timestamp': '1757908892410'},
+    # the best ask is taken out
+    {'event_type': 'price_change', 'market': SNAPSHOT['market'], 'timestamp': '1757908892500', 'price_changes': [
+        {'asset_id': TOKEN, 'price': '0.52', 'size': '0', 'side': 'SELL'},
+    ]},
+]
+# what the channel re-sends on the next subscribe, after the book moved while we were away
+RESNAPSHOT = {
+    **SNAPSHOT,
+    'bids': [{'price': '0.55', 'size': '40'}],
+    'asks': [{'price': '0.57', 'size': '8'}, {'price': '0.58', 'size': '100'}],
+    'timestamp': '1757908950000',
+}
+
+
+@pytest.fixture
+def mirror(monkeypatch):
+    monkeypatch.setattr(books, 'RECONNECT_BASE_SECONDS', 0.01)
+    mirrors = []
+
+    def make(url: str, **kwargs) -> OrderBookMirror:
+        m = OrderBookMirror(url=url, metadata=None, **kwargs)
+        mirrors.append(m)
+        return m
+
+    yield make
+    for m in mirrors:
+        m.stop()
+
+
+def test_snapshot_then_deltas(ws_server, mirror):
+    def session(conn, server):
+        server.send(conn, SNAPSHOT, DELTAS)
+        hold(conn, server)
+
+    server = ws_server(session)
+    m = mirror(server.url)
+    m.watch([TOKEN])
+    m.start()
+
+    wait_for(lambda: (m.book(TOKEN) or None) and m.book(TOKEN).timestamp == 1757908892500)
+    assert server.subscriptions == [{'assets_ids': [TOKEN], 'type': 'market'}]
+
+    snap = m.book(TOKEN)
+    assert snap.bids == (Level(0.51, 5.0), Level(0.50, 15.0), Level(0.49, 20.0), Level(0.48, 30.0))
+    assert snap.asks == (Level(0.53, 60.0), Level(0.54, 10.0))
+    assert snap.last_trade_price == 0.52
+    assert m.top_of_book(TOKEN) == (0.51, 0.53)
+    assert m.market_price(TOKEN, 'BUY', 35) == 0.54
+    assert m.market_price(TOKEN, 'BUY', 40) is None
+
+
+def test_reconnect_waits_for_the_fresh_snapshot(ws_server, mirror):
+    release = threading.Event()
+
+    def first(conn, server):
+        server.send(conn, SNAPSHOT, DELTAS)
+        # drop the connection once the mirror has the deltas
+        wait_for(lambda: m.book(TOKEN) is not None and m.book(TOKEN).timestamp == 1757908892500)
+
+    def second(conn, server):
+        # a delta ahead of the snapshot has nothing to apply to
+        server.send(conn, {'event_type': 'price_change', 'market': SNAPSHOT['market'], 'timestamp': '1757908949000', 'price_changes': [
+            {'asset_id': TOKEN, 'price': '0.56', 'size': '3', 'side': 'BUY'},
+        ]})
+        release.wait(5)
+        server.send(conn, RESNAPSHOT)
+        hold(conn, server)
+
+    server = ws_server(first, second)
+    # every snapshot is stale as soon as it isn't backed by a live session
+    m = mirror(server.url, stale_after_seconds=0)
+    m.watch([TOKEN])
+    m.start()
+
+    wait_for(lambda: len(server.subscriptions) == 2 and m.connected.is_set())
+    # reconnected, but the book we hold predates the session: not served as exact
+    assert m.book(TOKEN) is None
+    assert m.top_of_book(TOKEN) == (None, None)
+
+    release.set()
+    snap = wait_for(lambda: m.book(TOKEN))
+    assert snap.bids == (Level(0.55, 40.0),)
+    assert snap.asks == (Level(0.57, 8.0), Level(0.58, 100.0))
+    assert snap.timestamp == 1757908950000
+    assert server.subscriptions[1] == {'assets_ids': [TOKEN], 'type': 'market'}
+
+
+def test_watch_while_subscribing_is_not_lost(ws_server, mirror, monkeypatch):
+    other = "52114319501245915516055106046884209969926127482827954674443846427813813222426"
+    watcher = []
+
+    def dumps(obj):
+        # a strategy watches a new token while the first session is being subscribed
+        if not watcher:
+            watcher.append(threading.Thread(target=m.watch, args=([other],)))
+            watcher[0].start()
+            watcher[0].join(0.2)
+        return orjson.dumps(obj)
+
+    monkeypatch.setattr(books, 'orjson', SimpleNamespace(dumps=dumps, loads=orjson.loads))
+    # websocket-client only notices watch()'s close between socket reads, which time out at half the ping interval
+    monkeypatch.setattr(books, 'PING_INTERVAL_SECONDS', 1)
+    server = ws_server()
+    m = mirror(server.url)
+    m.watch([TOKEN])
+    m.start()
+
+    wait_for(lambda: len(server.subscriptions) == 2 and m.connected.is_set())
+    assert server.subscriptions[0]['assets_ids'] == [TOKEN]
+    assert server.subscriptions[1]['assets_ids'] == sorted([TOKEN, other])
+
+
+def test_replay_matches_the_live_feed():
+    m = OrderBookMirror(url='', metadata=None)
+    assert m.replay([SNAPSHOT, DELTAS]) == 2
+    snap = m.book(TOKEN)
+    assert snap.bids[0] == Level(0.51, 5.0)
+    assert snap.asks[0] == Level(0.53, 60.0)
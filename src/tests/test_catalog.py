@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from polymarket.gamma_api.schemas import MarketRequest
+from trading.db.catalog import MarketCatalog
+from trading.db.config import Base
+
+MARKETS = [
+    {'id': '9', 'conditionId': '0x9', 'volumeNum': '300', 'liquidityNum': '5', 'closed': False, 'endDate': '2026-03-01T00:00:00Z'},
+    {'id': '10', 'conditionId': '0x10', 'volumeNum': '100', 'liquidityNum': '50', 'closed': False, 'endDate': '2026-01-01T00:00:00Z'},
+    {'id': '100', 'conditionId': '0x100', 'volumeNum': '200', 'liquidityNum': '20', 'closed': True, 'endDate': '2026-02-01T00:00:00Z'},
+]
+
+
+def make_catalog(url: str = 'sqlite://') -> MarketCatalog:
+    engine = create_engine(url, poolclass=StaticPool, connect_args={'check_same_thread': False})
+    Base.metadata.create_all(engine)
+    return MarketCatalog(sessionmaker(bind=engine, expire_on_commit=False), gamma_client=SimpleNamespace())
+
+
+@pytest.fixture
+def catalog():
+    c = make_catalog()
+    c.upsert(MARKETS)
+    return c
+
+
+@pytest.mark.parametrize('request_, ids', [
+    # no order: id ascending, numerically (what gamma's paged walks are pinned to)
+    (MarketRequest(), [9, 10, 100]),
+    (MarketRequest(order='volumeNum', ascending=False), [9, 100, 10]),
+    (MarketRequest(order='liquidityNum'), [9, 100, 10]),
+    (MarketRequest(order='endDate', ascending=True, closed=False), [10, 9]),
+    (MarketRequest(order='id', ascending=False, limit=2, offset=1), [10, 9]),
+])
+def test_reads_honour_the_request_order(catalog, request_, ids):
+    assert catalog.get_markets_frame(request_)['id'].tolist() == ids
+
+
+def test_unsupported_order_is_rejected(catalog):
+    with pytest.raises(ValueError, match='spread'):
+        catalog.get_markets_frame(MarketRequest(order='spread'))
+
+
+def test_upserts_update_in_place(catalog):
+    catalog.upsert([{**MARKETS[0], 'volumeNum': '1'}])
+    frame = catalog.get_markets_frame(MarketRequest(order='volumeNum'))
+    assert frame['id'].tolist() == [9, 10, 100]
+    assert frame['volumeNum'].tolist() == [1.0, 100.0, 200.0]
@@ -0,0 +1,33 @@
+import pytest
+
+from polymarket.gamma_api.client import trading_keys
+from polymarket.gamma_api.frames import markets_to_frame
+from trading.strategies.polymarket.filters import FRAME_COLUMNS, parse_expression, plan_query
+
+MARKETS = [
+    {'id': '1', 'conditionId': '0x1', 'startDate': '2025-06-01T00:00:00Z', 'endDate': '2026-03-01T00:00:00Z', 'volumeNum': '10'},
+    {'id': '2', 'conditionId': '0x2', 'startDate': None, 'endDate': '2025-12-01T00:00:00Z', 'volumeNum': '20'},
+    {'id': '3', 'conditionId': '0x3', 'startDate': '2025-07-01T00:00:00Z', 'endDate': None, 'volumeNum': '30'},
+]
+
+
+def prepared():
+    # what a strategy's residual filter sees: the trading_keys frame after _prepare_markets renames it
+    return markets_to_frame(MARKETS, columns=trading_keys.keys()).rename(columns=FRAME_COLUMNS)
+
+
+@pytest.mark.parametrize('expression, ids', [
+    ('endDate notnull', [1, 2]),
+    ("endDate > '2026-01-01'", [1]),
+    ("conditionId != '0x2'", [1, 3]),
+    ('startDate notnull', [1, 3]),
+])
+def test_residual_runs_on_the_prepared_frame(expression, ids):
+    plan = plan_query(parse_expression(expression))
+    assert plan.filter(prepared())['id'].tolist() == ids
+
+
+def test_residual_on_a_column_the_frame_lacks_is_rejected():
+    plan = plan_query(parse_expression("question == 'x'"))
+    with pytest.raises(ValueError, match='question'):
+        plan.filter(prepared())
@@ -0,0 +1,166 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from polymarket.clob_api import orders
+from polymarket.clob_api.orders import OrderFill, OrderTracker
+from ws_replay import hold, wait_for
+
+MARKET = "0xbd31dc8a20211944f6b70f31557f1001557b59905b7738480ca09bd4532f84af"
+OTHER_MARKET = "0x5f65177b394277fd294cd75650044e32ba009a95022d88a0c1d565897d72f8f1"
+TOKEN = "52114319501245915516055106046884209969926127482827954674443846427813813222426"
+ORDER_ID = "0xff354cd7ca7539dfa9c28d90943ab5779a4eac34b9b37a757d7b32bdfb11790b"
+
+
+def order_event(type_: str, size_matched: str, order_id: str = ORDER_ID, market: str = MARKET):
+    # the user channel's `order` event, as captured (trimmed of the fields the tracker doesn't read)
+    return {
+        'event_type': 'order',
+        'type': type_,
+        'id': order_id,
+        'asset_id': TOKEN,
+        'market': market,
+        'side': 'BUY',
+        'price': '0.57',
+        'original_size': '100',
+        'size_matched': size_matched,
+        'timestamp': '1757908892',
+    }
+
+
+class FakeClob:
+    """
+    the two rest calls the tracker polls, serving whatever state the test sets.
+    """
+
+    def __init__(self):
+        self.creds = SimpleNamespace(api_key='key', api_secret='secret', api_passphrase='passphrase')
+        self.open: dict = {}
+        self.final: dict = {}
+
+    def get_orders(self):
+        return list(self.open.values())
+
+    def get_order(self, order_id):
+        return self.final.get(order_id)
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    # websocket-client only notices a close between socket reads, which time out at half the ping interval
+    monkeypatch.setattr(orders, 'PING_INTERVAL_SECONDS', 1)
+    trackers = []
+
+    def make(url: str, clob: FakeClob) -> OrderTracker:
+        t = OrderTracker(clob, url=url, poll_interval=3600)
+        trackers.append(t)
+        return t
+
+    yield make
+    for t in trackers:
+        t.stop()
+
+
+def track(t: OrderTracker, fills: list, order_id: str = ORDER_ID, condition_id: str = MARKET):
+    t.track(order_id, TOKEN, 'BUY', 0.57, 100, fills.append, condition_id=condition_id)
+
+
+def test_placement_partial_fills_then_matched(ws_server, tracker):
+    clob = FakeClob()
+    fills = []
+    step = threading.Event()
+
+    def session(conn, server):
+        server.send(conn, order_event('PLACEMENT', '0'), order_event('UPDATE', '30'))
+        step.wait(5)
+        # the same cumulative size again (e.g. a trade + order echo), then the rest in two pieces
+        server.send(conn, [order_event('UPDATE', '30'), order_event('UPDATE', '75')], order_event('UPDATE', '100'))
+        hold(conn, server)
+
+    server = ws_server(session)
+    t = tracker(server.url, clob)
+    track(t, fills)
+    t.start()
+
+    wait_for(lambda: len(fills) == 1)
+    assert server.subscriptions[0]['type'] == 'user'
+    assert server.subscriptions[0]['markets'] == [MARKET]
+    assert server.subscriptions[0]['auth']['apiKey'] == 'key'
+    assert fills == [OrderFill(ORDER_ID, TOKEN, 'BUY', 0.57, 30.0, 30.0, False)]
+
+    step.set()
+    wait_for(lambda: len(fills) == 3)
+    assert [(f.size, f.size_matched, f.done) for f in fills] == [(30.0, 30.0, False), (45.0, 75.0, False), (25.0, 100.0, True)]
+    assert t.open_orders() == []
+
+
+def test_cancellation_after_a_partial_fill(ws_server, tracker):
+    clob = FakeClob()
+    fills = []
+
+    def session(conn, server):
+        server.send(conn, order_event('PLACEMENT', '0'), order_event('UPDATE', '20'), order_event('CANCELLATION', '20'))
+        hold(conn, server)
+
+    server = ws_server(session)
+    t = tracker(server.url, clob)
+    track(t, fills)
+    t.start()
+
+    wait_for(lambda: len(fills) == 2)
+    assert [(f.size, f.size_matched, f.done) for f in fills] == [(20.0, 20.0, False), (0.0, 20.0, True)]
+    assert t.open_orders() == []
+
+
+def test_fills_reported_by_ws_and_rest_count_once(ws_server, tracker):
+    clob = FakeClob()
+    fills = []
+    ws_step = threading.Event()
+
+    def session(conn, server):
+        server.send(conn, order_event('UPDATE', '40'))
+        ws_step.wait(5)
+        server.send(conn, order_event('UPDATE', '60'))
+        hold(conn, server)
+
+    server = ws_server(session)
+    t = tracker(server.url, clob)
+    track(t, fills)
+    t.start()
+    wait_for(lambda: len(fills) == 1)
+
+    # rest catches up with what the ws already said: nothing new
+    clob.open[ORDER_ID] = {'id': ORDER_ID, 'status': 'LIVE', 'size_matched': '40'}
+    assert t.poll() == []
+    # rest is ahead of the ws this time
+    clob.open[ORDER_ID]['size_matched'] = '60'
+    assert [f.size for f in t.poll()] == [20.0]
+    # and the ws reporting the same 60 afterwards adds nothing
+    ws_step.set()
+    time.sleep(0.2)
+    assert [(f.size, f.size_matched) for f in fills] == [(40.0, 40.0), (20.0, 60.0)]
+
+    # it left the open list fully matched
+    del clob.open[ORDER_ID]
+    clob.final[ORDER_ID] = {'id': ORDER_ID, 'status': 'MATCHED', 'size_matched': '100'}
+    assert [(f.size, f.done) for f in t.poll()] == [(40.0, True)]
+    assert t.open_orders() == []
+
+
+def test_tracking_a_new_market_resubscribes_without_backoff(ws_server, tracker, monkeypatch):
+    backoffs = []
+    monkeypatch.setattr(orders.random, 'uniform', lambda low, high: backoffs.append(high) or 0.0)
+    clob = FakeClob()
+    fills = []
+    server = ws_server()
+    t = tracker(server.url, clob)
+    track(t, fills)
+    t.start()
+    wait_for(lambda: t.connected.is_set())
+
+    track(t, fills, order_id='0x01', condition_id=OTHER_MARKET)
+    wait_for(lambda: len(server.subscriptions) == 2 and t.connected.is_set())
+    assert backoffs == []
+    assert server.subscriptions[1]['markets'] == sorted([MARKET, OTHER_MARKET])
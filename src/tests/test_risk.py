@@ -0,0 +1,41 @@
+from trading.datamodel.polymarket import MarketBuy, MarketSell, PolymarketPosition
+from trading.strategies.polymarket.risk import RiskLimits, check_orders
+
+
+def buys(*amounts):
+    return [MarketBuy(token_id=f"t{i}", amount_usd=a) for i, a in enumerate(amounts)]
+
+
+def test_short_cash_keeps_whole_buys_that_fit():
+    # 20 x $5 with $15 of cash: scaling all of them down would put every one under min_order_usd
+    orders = buys(*[5.0] * 20)
+    out, report = check_orders(orders, {}, RiskLimits(cash_usd=15, min_order_usd=1))
+    assert out == orders[:3]
+    assert report.orders_out == 3
+    assert report.buy_usd_approved == 15.0
+    assert [reason for _, reason in report.dropped] == ['cash'] * 17
+    assert report.clipped == []
+
+
+def test_short_cash_fills_the_rest_with_smaller_buys():
+    orders = buys(10.0, 8.0, 4.0, 1.5)
+    out, report = check_orders(orders, {}, RiskLimits(cash_usd=16, min_order_usd=1))
+    # 10 fits, 8 doesn't, 4 and 1.5 still do
+    assert [o.amount_usd for o in out] == [10.0, 4.0, 1.5]
+    assert [o.amount_usd for o, _ in report.dropped] == [8.0]
+
+
+def test_caps_clip_before_cash_is_counted():
+    orders = buys(100.0, 100.0, 100.0)
+    out, report = check_orders(orders, {}, RiskLimits(cash_usd=100, max_order_usd=40, min_order_usd=1))
+    assert [o.amount_usd for o in out] == [40.0, 40.0]
+    assert [(amount, reason) for _, amount, reason in report.clipped] == [(40.0, 'max_order_usd')] * 2
+    assert [reason for _, reason in report.dropped] == ['max_order_usd, cash']
+
+
+def test_sells_and_cash():
+    positions = {'held': PolymarketPosition(token_id='held', event_id='e', amount=50, avg_price=0.9)}
+    orders = [MarketSell(token_id='held', amount_shares=80)] + buys(5.0, 5.0)
+    out, report = check_orders(orders, positions, RiskLimits(cash_usd=5, min_order_usd=1))
+    assert out[0].amount_shares == 50
+    assert [o.amount_usd for o in out[1:]] == [5.0]
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from polymarket.clob_api.orders import OrderFill
+from polymarket.registry import client_registry
+from trading.datamodel.polymarket import LimitOrder, MarketBuy, OrderResult
+from trading.db.config import Base
+from trading.db import polymarket as _models  # noqa: F401 (registers the tables)
+from trading.strategies.polymarket.base import PolymarketStrategy
+
+TOKEN = "52114319501245915516055106046884209969926127482827954674443846427813813222426"
+
+
+class FakeClob:
+    proxy_address = '0xproxy'
+    prices = None
+
+    def __init__(self):
+        self.tracked = []
+
+    def order_tracker(self):
+        return SimpleNamespace(track=lambda *args, **kwargs: self.tracked.append((args, kwargs)))
+
+    def invalidate_prices(self, tokens):
+        pass
+
+    def get_prices(self, params, max_age=None):
+        raise RuntimeError('offline')
+
+
+@pytest.fixture
+def strategy(monkeypatch):
+    clob = FakeClob()
+    monkeypatch.setattr(client_registry, 'clob', lambda *args, **kwargs: clob)
+    monkeypatch.setattr(client_registry, 'gamma', lambda: SimpleNamespace())
+    monkeypatch.setattr(client_registry, 'data', lambda: SimpleNamespace(invalidate_user=lambda user: None))
+    engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+    Base.metadata.create_all(engine)
+    SessionFactory = sessionmaker(bind=engine, expire_on_commit=False)
+    return PolymarketStrategy(
+        {'name': 'test', 'strategy_path': 'test', 'allocation_usd': 100, 'paper': False, 'spec': {'risk_gate': True}},
+        SessionFactory,
+    )
+
+
+def rest(s: PolymarketStrategy, size: float, price: float, matched: float = 0.0) -> LimitOrder:
+    order = LimitOrder(token_id=TOKEN, price=price, size=size, side='BUY', event_id='e')
+    s.track_resting_orders([OrderResult(
+        order=order, orderID='0x01', success=True, status='live',
+        makingAmount=str(matched * price), takingAmount=str(matched),
+    )])
+    return order
+
+
+def test_resting_buys_hold_their_cash_until_they_fill(strategy):
+    order = rest(strategy, size=100, price=0.5)
+    strategy.snapshot_positions()
+    assert strategy.state.cash_usd == 100
+    assert strategy.available_cash_usd == 50
+
+    # the gate only lets through what the resting buy leaves
+    out = strategy.check_orders([MarketBuy(token_id='a', amount_usd=30), MarketBuy(token_id='b', amount_usd=30)])
+    assert [o.token_id for o in out] == ['a']
+
+    # a partial fill moves cash out of the reservation and into the position
+    strategy.apply_order_fill(order, OrderFill('0x01', TOKEN, 'BUY', 0.5, 40.0, 40.0, False))
+    assert strategy.state.cash_usd == pytest.approx(80)
+    assert strategy.spendable_cash_usd() == pytest.approx(50)
+    assert strategy.snapshot_positions()[TOKEN].amount == pytest.approx(40)
+
+    # cancelled with the rest unfilled: the reservation is released
+    strategy.apply_order_fill(order, OrderFill('0x01', TOKEN, 'BUY', 0.5, 0.0, 40.0, True))
+    assert strategy.spendable_cash_usd() == pytest.approx(80)
+    assert strategy.resting_orders == {}
+
+
+def test_what_the_post_already_filled_is_not_reserved(strategy):
+    rest(strategy, size=100, price=0.5, matched=30)
+    assert strategy.spendable_cash_usd() == pytest.approx(100 - 70 * 0.5)
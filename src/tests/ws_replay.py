@@ -0,0 +1,66 @@
+import threading
+import time
+from typing import Any, Callable, List
+
+import orjson
+from websockets.sync.server import ServerConnection, serve
+
+"""
+    a local websocket server that plays scripted sessions to the clob feed clients.
+"""
+
+
+class ReplayServer:
+    """
+    local websocket server. the n-th connection gets its subscribe message recorded and is handed to the
+    n-th session callable, session(conn, server); the connection closes when the session returns.
+    connections beyond the scripted sessions are held open until the server closes.
+    """
+
+    def __init__(self, sessions: List[Callable[[ServerConnection, "ReplayServer"], Any]]):
+        self.sessions = list(sessions)
+        self.subscriptions: List[Any] = []
+        self.closing = threading.Event()
+        self._lock = threading.Lock()
+        # websocket-client drops the socket without answering a server close, don't wait the default 10s for it
+        self._server = serve(self._handle, "127.0.0.1", 0, close_timeout=0.5)
+        self.url = f"ws://127.0.0.1:{self._server.socket.getsockname()[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _handle(self, conn: ServerConnection):
+        subscription = orjson.loads(conn.recv())
+        with self._lock:
+            n = len(self.subscriptions)
+            self.subscriptions.append(subscription)
+        if n < len(self.sessions):
+            self.sessions[n](conn, self)
+        else:
+            hold(conn, self)
+
+    def send(self, conn: ServerConnection, *frames: Any):
+        for frame in frames:
+            conn.send(orjson.dumps(frame).decode())
+
+    def close(self):
+        self.closing.set()
+        self._server.shutdown()
+        self._thread.join(timeout=5)
+
+
+def hold(conn: ServerConnection, server: ReplayServer):
+    """
+    session tail: keep the connection open until the test is done.
+    """
+    server.closing.wait()
+
+
+def wait_for(condition: Callable[[], Any], timeout: float = 5.0) -> Any:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = condition()
+        if value:
+            return value
+        time.sleep(0.01)
+    raise AssertionError("timed out waiting for condition")
+
@@ -1,22 +1,23 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
 
 class PolymarketPosition(BaseModel):
     token_id: str
-    event_id: str
+    event_id: Optional[str] = None  # None when the order carried none and the market index doesn't know the token
     amount: float
     avg_price: float
-    cur_price: float = None
-    condition_id: str = None
-    outcome: str = None
-    slug: str = None
-    end_date: str = None
+    cur_price: Optional[float] = None
+    condition_id: Optional[str] = None
+    outcome: Optional[str] = None
+    slug: Optional[str] = None
+    end_date: Optional[str] = None
 
 
 class MarketBuy(BaseModel):
     token_id: str
     amount_usd: float
     expected_price: float = None # this is just for information transfer
+    max_price: Optional[float] = None # worst price the order may fill at (FOK), None = whatever the book gives
     event_id: str = None
     condition_id: str = None
     slug: str = None
@@ -27,6 +28,7 @@ class MarketSell(BaseModel):
     token_id: str
     amount_shares: float
     expected_price: float = None # this is just for information transfer
+    min_price: Optional[float] = None # worst price the order may fill at (FOK), None = whatever the book gives
     event_id: str = None
     condition_id: str = None
     slug: str = None
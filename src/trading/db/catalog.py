@@ -0,0 +1,308 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from polymarket.gamma_api.client import PolymarketGammaClient, recent_markets_request, trading_keys
+from polymarket.gamma_api.frames import MARKET_SCHEMA, markets_to_frame
+from polymarket.gamma_api.schemas import MarketRequest
+from trading.db.config import SessionLocal
+from trading.db.polymarket import Event, Market
+from utils.log import logger
+from utils.runtime_utils import footprint
+
+"""
+    local, incrementally synced copy of gamma's market catalog.
+
+    the first sync pulls every open market. after that, a delta sync walks gamma ordered by updatedAt
+    (newest first) and stops at the watermark - the newest updatedAt we already hold - so an hourly
+    rebalance only downloads the handful of markets that changed since the last one.
+
+    reads (get_recent_markets) are a sql filter over indexed columns followed by markets_to_frame on the
+    stored raw objects: the same markets, in the same frame, as PolymarketGammaClient.get_recent_markets
+    returns. the request's order / ascending are honoured for the columns we index (CATALOG_ORDER_COLUMNS);
+    without an order the rows come back by id ascending, the order gamma's paged walks are pinned to.
+"""
+
+UPSERT_BATCH_SIZE = 500
+# delta syncs re-read a little before the watermark so markets updated while we were paging aren't skipped
+WATERMARK_OVERLAP = timedelta(minutes=5)
+MIN_SYNC_INTERVAL_SECONDS = 60
+# MarketRequest fields get_markets_frame can answer locally (order only for CATALOG_ORDER_COLUMNS)
+CATALOG_REQUEST_FIELDS = frozenset({
+    'limit', 'offset', 'order', 'ascending', 'id', 'slug', 'condition_ids', 'closed', 'active',
+    'volume_num_min', 'volume_num_max', 'liquidity_num_min', 'liquidity_num_max',
+    'start_date_min', 'start_date_max', 'end_date_min', 'end_date_max',
+})
+# gamma `order` values -> the catalog column that sorts the same way (ids are numeric on gamma's side)
+CATALOG_ORDER_COLUMNS = {
+    'id': cast(Market.id, Integer),
+    'volumeNum': Market.volume_num,
+    'liquidityNum': Market.liquidity_num,
+    'startDate': Market.start_date,
+    'endDate': Market.end_date,
+    'updatedAt': Market.gamma_updated_at,
+}
+# backends whose insert can upsert (on_conflict_do_update over the primary key, with .excluded)
+UPSERT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+# everything project_market keeps is all we ask gamma's decoder to hold on to
+SYNC_KEYS = tuple(MARKET_SCHEMA)
+EVENT_KEYS = ('id', 'ticker', 'slug', 'title', 'endDate', 'closed', 'negRisk', 'updatedAt')
+
+
+def parse_gamma_datetime(value: Any) -> Optional[datetime]:
+    """
+    gamma iso timestamp -> naive utc datetime (None if missing/garbled).
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return dt.replace(tzinfo=None) - (dt.utcoffset() or timedelta(0))
+
+
+def project_market(market: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    keeps only the fields markets_to_frame knows about, with nested events trimmed to their identifiers.
+    the descriptions and images we'd otherwise store dominate the row size and the read time.
+    """
+    market = getattr(market, 'raw', market)   # LazyMarket -> the raw dict, so list fields stay stringified
+    out = {k: market[k] for k in MARKET_SCHEMA if k in market}
+    if isinstance(out.get('events'), list):
+        out['events'] = [{k: e.get(k) for k in EVENT_KEYS} for e in out['events']]
+    return out
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _bool(value: Any) -> Optional[bool]:
+    if isinstance(value, str):
+        return {'true': True, 'false': False}.get(value.lower())
+    return None if value is None else bool(value)
+
+
+class MarketCatalog:
+    """
+    gamma markets + events mirrored into the trading db, keyed by gamma id (with condition id / ticker indexed).
+    markets are stored projected to MARKET_SCHEMA, events without their description.
+    one instance is meant to be shared by every strategy in the process - see MarketCatalog.shared().
+    """
+
+    _shared: Optional["MarketCatalog"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, SessionFactory=SessionLocal, gamma_client: PolymarketGammaClient = None):
+        self.SessionFactory = SessionFactory
+        self.gamma_client = gamma_client or PolymarketGammaClient()
+        self._sync_lock = threading.Lock()
+        self.last_sync_at: Optional[float] = None
+
+    @classmethod
+    def shared(cls, SessionFactory=SessionLocal, gamma_client: PolymarketGammaClient = None) -> "MarketCatalog":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(SessionFactory, gamma_client)
+            return cls._shared
+
+    # sync ---------------------------------------------------------------- #
+
+    def watermark(self) -> Optional[datetime]:
+        with self.SessionFactory() as session:
+            return session.query(func.max(Market.gamma_updated_at)).scalar()
+
+    @footprint()
+    def sync(self, min_interval_seconds: float = MIN_SYNC_INTERVAL_SECONDS) -> int:
+        """
+        full sync on an empty catalog, delta sync otherwise. returns the number of markets written.
+        until the first sync has finished every caller waits for it - reading a half-filled catalog would hand
+        out a partial market list. after that it's a no-op if another thread is already syncing or the last
+        sync finished less than `min_interval_seconds` ago.
+        """
+        if self.last_sync_at is not None and time.monotonic() - self.last_sync_at < min_interval_seconds:
+            return 0
+        if not self._sync_lock.acquire(blocking=self.last_sync_at is None):
+            return 0
+        try:
+            if self.last_sync_at is not None and time.monotonic() - self.last_sync_at < min_interval_seconds:
+                # we waited out someone else's (initial) sync
+                return 0
+            watermark = self.watermark()
+            written = self.full_sync() if watermark is None else self.delta_sync(watermark)
+            self.last_sync_at = time.monotonic()
+            return written
+        finally:
+            self._sync_lock.release()
+
+    def full_sync(self) -> int:
+        logger.info("market catalog: full sync")
+        written = self._upsert_stream(self.gamma_client.iter_markets(MarketRequest(closed=False), keys=SYNC_KEYS))
+        logger.info(f"market catalog: full sync wrote {written} markets")
+        return written
+
+    def delta_sync(self, watermark: datetime) -> int:
+        stop_at = watermark - WATERMARK_OVERLAP
+
+        def changed_markets():
+            for market in self.gamma_client.iter_markets(MarketRequest(order='updatedAt', ascending=False), keys=SYNC_KEYS):
+                updated_at = parse_gamma_datetime(market.get('updatedAt'))
+                if updated_at is not None and updated_at < stop_at:
+                    return
+                yield market
+
+        written = self._upsert_stream(changed_markets())
+        logger.info(f"market catalog: delta sync since {watermark} wrote {written} markets")
+        return written
+
+    def _upsert_stream(self, markets: Iterable[Dict[str, Any]]) -> int:
+        written = 0
+        batch = []
+        for market in markets:
+            batch.append(market)
+            if len(batch) >= UPSERT_BATCH_SIZE:
+                written += self.upsert(batch)
+                batch = []
+        if batch:
+            written += self.upsert(batch)
+        return written
+
+    def upsert(self, markets: List[Dict[str, Any]]) -> int:
+        """
+        writes raw gamma market objects (and their nested events) into the catalog.
+        """
+        market_rows = {}
+        event_rows = {}
+        now = datetime.utcnow()
+        for m in markets:
+            if m.get('id') is None:
+                continue
+            events = m.get('events') if isinstance(m.get('events'), list) else []
+            market_rows[str(m['id'])] = dict(
+                id=str(m['id']),
+                condition_id=m.get('conditionId'),
+                slug=m.get('slug'),
+                event_id=events[0].get('ticker') if events else None,
+                start_date=parse_gamma_datetime(m.get('startDate')),
+                end_date=parse_gamma_datetime(m.get('endDate')),
+                volume_num=_float(m.get('volumeNum')),
+                liquidity_num=_float(m.get('liquidityNum')),
+                active=_bool(m.get('active')),
+                closed=_bool(m.get('closed')),
+                gamma_updated_at=parse_gamma_datetime(m.get('updatedAt')),
+                raw=project_market(m),
+                created_at=now,
+                updated_at=now,
+            )
+            for e in events:
+                if e.get('id') is None:
+                    continue
+                event_rows[str(e['id'])] = dict(
+                    id=str(e['id']),
+                    ticker=e.get('ticker'),
+                    slug=e.get('slug'),
+                    end_date=parse_gamma_datetime(e.get('endDate')),
+                    closed=_bool(e.get('closed')),
+                    gamma_updated_at=parse_gamma_datetime(e.get('updatedAt')),
+                    raw={k: v for k, v in e.items() if k != 'description'},
+                    created_at=now,
+                    updated_at=now,
+                )
+
+        with self.SessionFactory() as session:
+            dialect = session.get_bind().dialect.name
+            insert = UPSERT_INSERTS.get(dialect)
+            if insert is None:
+                raise NotImplementedError(f"market catalog can't upsert on a {dialect} database (supported: {sorted(UPSERT_INSERTS)})")
+            for model, rows in ((Market, market_rows), (Event, event_rows)):
+                if not rows:
+                    continue
+                stmt = insert(model).values(list(rows.values()))
+                updatable = {c: stmt.excluded[c] for c in rows[next(iter(rows))] if c not in ('id', 'created_at')}
+                session.execute(stmt.on_conflict_do_update(index_elements=['id'], set_=updatable))
+            session.commit()
+        return len(market_rows)
+
+    # reads --------------------------------------------------------------- #
+
+    @footprint(time_limit_seconds=0.05)
+    def get_recent_markets(self, look_back_days: int = 6 * 30, minimum_volume: float = 100000, minimum_liquidity: float = 1000, limit: int = 500, days_to_end: int = None) -> pd.DataFrame:
+        """
+        Same contract as PolymarketGammaClient.get_recent_markets, answered from the local catalog.
+        """
+        request = recent_markets_request(look_back_days, minimum_volume, minimum_liquidity, limit, days_to_end)
+        return self.get_markets_frame(request)
+
+    def get_markets_frame(self, request: MarketRequest | dict) -> pd.DataFrame:
+        """
+        Same filters as PolymarketGammaClient.get_markets_frame, as sql over the indexed columns. ordered by the
+        request's order (ascending unless the request says otherwise), by id ascending without one. raises
+        ValueError for request fields outside CATALOG_REQUEST_FIELDS and orders outside CATALOG_ORDER_COLUMNS.
+        """
+        if isinstance(request, dict):
+            request = MarketRequest(**request)
+        params = request.model_dump(exclude_none=True)
+        unsupported = set(params) - CATALOG_REQUEST_FIELDS
+        if unsupported:
+            # answering without them would silently return markets the request excludes
+            raise ValueError(f"market catalog can't filter on {sorted(unsupported)} (plan queries with supported=CATALOG_REQUEST_FIELDS)")
+        order = params.get('order', 'id')
+        if order not in CATALOG_ORDER_COLUMNS:
+            raise ValueError(f"market catalog can't order by {order!r} (supported: {sorted(CATALOG_ORDER_COLUMNS)})")
+
+        ranges = (
+            (Market.volume_num, params.get('volume_num_min'), params.get('volume_num_max')),
+            (Market.liquidity_num, params.get('liquidity_num_min'), params.get('liquidity_num_max')),
+            (Market.start_date, parse_gamma_datetime(params.get('start_date_min')), parse_gamma_datetime(params.get('start_date_max'))),
+            (Market.end_date, parse_gamma_datetime(params.get('end_date_min')), parse_gamma_datetime(params.get('end_date_max'))),
+        )
+        with self.SessionFactory() as session:
+            query = session.query(Market.raw)
+            for column, low, high in ranges:
+                if low is not None:
+                    query = query.filter(column >= low)
+                if high is not None:
+                    query = query.filter(column <= high)
+            for column, key in ((Market.closed, 'closed'), (Market.active, 'active')):
+                if key in params:
+                    query = query.filter(column.is_(params[key]))
+            for column, key in ((Market.id, 'id'), (Market.slug, 'slug'), (Market.condition_id, 'condition_ids')):
+                if key in params:
+                    query = query.filter(column.in_([str(v) for v in params[key]]))
+            column = CATALOG_ORDER_COLUMNS[order]
+            query = query.order_by(column.asc() if params.get('ascending', True) else column.desc(), CATALOG_ORDER_COLUMNS['id'])
+            if 'offset' in params:
+                query = query.offset(params['offset'])
+            if 'limit' in params:
+                query = query.limit(params['limit'])
+            raws = [row.raw for row in query.all()]
+
+        return markets_to_frame(raws, columns=trading_keys.keys())
+
+    def get_market(self, market_id: str = None, condition_id: str = None) -> Optional[Dict[str, Any]]:
+        with self.SessionFactory() as session:
+            query = session.query(Market.raw)
+            if market_id is not None:
+                query = query.filter(Market.id == str(market_id))
+            elif condition_id is not None:
+                query = query.filter(Market.condition_id == condition_id)
+            else:
+                return None
+            row = query.first()
+        return row.raw if row else None
+
+    def get_event_markets(self, event_id: str) -> List[Dict[str, Any]]:
+        """
+        raw markets belonging to an event ticker.
+        """
+        with self.SessionFactory() as session:
+            return [row.raw for row in session.query(Market.raw).filter(Market.event_id == event_id).all()]
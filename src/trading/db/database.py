@@ -8,7 +8,9 @@ from trading.db.polymarket import (
     Portfolio,
     PortfolioSnapshot,
     Strategy,
-    Asset
+    Asset,
+    Market,
+    Event,
 )
 import os
 import duckdb
@@ -31,7 +31,7 @@ class Asset(PolymarketBase):
 
     asset_id = Column(String, nullable=False, index=True, primary_key=True) # polymarket's asset id
     last_price = Column(Float, nullable=True, index=True)
-    event_id = Column(String, nullable=False, index=True)
+    event_id = Column(String, nullable=True, index=True)
     condition_id = Column(String, nullable=True, index=True)
     slug = Column(String, nullable=True, index=True)
     outcome = Column(String, nullable=True, index=True) # "Yes" or "No"
@@ -154,3 +154,35 @@ class Strategy(PolymarketBase):
         back_populates="strategy",
         uselist=False,
     )
+
+
+# local mirror of gamma's market catalog (see trading/db/catalog.py). the raw gamma object is kept in `raw`;
+# the other columns only exist so we can filter in sql.
+
+class Market(PolymarketBase):
+    __tablename__ = "polymarket_markets"
+
+    id = Column(String, primary_key=True, nullable=False)  # gamma market id
+    condition_id = Column(String, nullable=True, index=True)
+    slug = Column(String, nullable=True, index=True)
+    event_id = Column(String, nullable=True, index=True)  # events[0].ticker
+    start_date = Column(DateTime, nullable=True, index=True)
+    end_date = Column(DateTime, nullable=True, index=True)
+    volume_num = Column(Float, nullable=True, index=True)
+    liquidity_num = Column(Float, nullable=True, index=True)
+    active = Column(Boolean, nullable=True, index=True)
+    closed = Column(Boolean, nullable=True, index=True)
+    gamma_updated_at = Column(DateTime, nullable=True, index=True)  # gamma's updatedAt -> the sync watermark
+    raw = Column(JSON, nullable=False)
+
+
+class Event(PolymarketBase):
+    __tablename__ = "polymarket_events"
+
+    id = Column(String, primary_key=True, nullable=False)  # gamma event id
+    ticker = Column(String, nullable=True, index=True)
+    slug = Column(String, nullable=True, index=True)
+    end_date = Column(DateTime, nullable=True, index=True)
+    closed = Column(Boolean, nullable=True, index=True)
+    gamma_updated_at = Column(DateTime, nullable=True, index=True)
+    raw = Column(JSON, nullable=False)
@@ -1,13 +1,19 @@
 import uuid
+from typing import Optional
 from runtime.runner import StrategyRunner
+from trading.strategies.polymarket.netting import OrderNetter
 
 class StrategyManager:
-    def __init__(self):
+    def __init__(self, netting_window_seconds: Optional[float] = None):
         self._runners: dict[str, StrategyRunner] = {}
+        # set: orders of all strategies on the same account within this window are netted per token before execution
+        self.netter = OrderNetter(netting_window_seconds) if netting_window_seconds else None
 
     # ---------- CRUD ----------
     def create(self, strategy_cls, state, session_factory):
         strategy = strategy_cls(state=state, SessionFactory=session_factory)
+        if self.netter is not None and hasattr(strategy, 'netter'):
+            strategy.netter = self.netter
         runner = StrategyRunner(strategy, interval_s=state.rebalance_interval_seconds)
         runner_id = str(uuid.uuid4())
         self._runners[runner_id] = runner
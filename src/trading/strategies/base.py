@@ -62,12 +62,28 @@ class BaseStrategy(abc.ABC):
         """
         pass
 
+    def check_orders(self, orders_to_place: List[Any]) -> List[Any]:
+        """
+            pre-trade risk gate between rebalance and execute: returns the orders that may go out (possibly clipped). passes everything by default.
+        """
+        return orders_to_place
+
+    def snapshot_positions(self) -> Dict[str, Any]:
+        """
+            the copy of the positions rebalance works on. strategies whose state also changes off the rebalance loop take their lock here.
+        """
+        return copy.deepcopy(self.positions)
+
     def run_once(self):
         """Runs a single rebalance-execute-update cycle. If a strategy wants more granular control over its loop, it can modify this method."""
-        prev_positions = copy.deepcopy(self.positions)
+        prev_positions = self.snapshot_positions()
         
         orders_to_place = self.rebalance(prev_positions)
 
+        if orders_to_place:
+            # the batch as a whole, before anything reaches the market
+            orders_to_place = self.check_orders(orders_to_place)
+
         if orders_to_place:
             execution_report = self.execute(
                 orders_to_place=orders_to_place
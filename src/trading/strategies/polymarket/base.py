@@ -1,17 +1,24 @@
 import concurrent.futures
 import copy
-import json
-import os
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Union
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 import numpy as np
 import pandas as pd
-
-from py_clob_client.clob_types import MarketOrderArgs, OrderArgs, OrderType, BookParams  # FOK / GTK enums
-from polymarket.clob_api.client import PolymarketClobClient
-from polymarket.data_api.client import PolymarketDataClient, PositionRequest
-from polymarket.gamma_api.client import PolymarketGammaClient, MarketRequest
+from pydantic import BaseModel
+
+from py_clob_client.clob_types import MarketOrderArgs, OrderArgs, OrderType, BookParams, PostOrdersArgs  # FOK / GTC enums
+from py_clob_client.exceptions import PolyApiException
+from polymarket.clob_api.constants import POST_ORDERS_BATCH_SIZE
+from polymarket.clob_api.signing import resolve_options
+from polymarket.clob_api.books import order_book_mirror
+from polymarket.clob_api.metadata import token_metadata
+from polymarket.clob_api.orders import OrderFill
+from polymarket.data_api.client import PositionRequest
+from polymarket.registry import client_registry
+from polymarket.gamma_api.index import market_index
+from polymarket.transfer import metered
 
 from trading.datamodel.polymarket import (
     LimitOrder,
@@ -21,15 +28,24 @@ from trading.datamodel.polymarket import (
     PolymarketPosition,
 )
 from trading.datamodel.strategy import StrategyState
+from trading.db.catalog import CATALOG_REQUEST_FIELDS, MarketCatalog
 from trading.db import polymarket as polymarket_models
 from trading.db.polymarket import Portfolio, Position
 from trading.strategies.base import BaseStrategy
+from trading.strategies.polymarket.filters import FRAME_COLUMNS, CompiledFilter, QueryPlan
+from trading.strategies.polymarket.fills import simulate_orders
+from trading.strategies.polymarket.netting import OrderNetter
+from trading.strategies.polymarket import risk
+from trading.strategies.polymarket.router import ExecutionRouter
 from utils.log import logger
-from utils.runtime_utils import footprint, format_datetime
+from utils.runtime_utils import PhaseTimer, footprint, format_datetime
 
 
 # TODO: use self.state.whatever everywhere instead of self.whatever
 class PolymarketStrategy(BaseStrategy):
+    # the strategy's spec model: its defaults fill in whatever the stored spec leaves out
+    spec_config: Type[BaseModel] = None
+
     def __init__(self, state: Union[StrategyState, Dict], SessionFactory = None):
         # super().__init__(spec, SessionFactory)
         # not doing super.init deliberately
@@ -37,13 +53,34 @@ class PolymarketStrategy(BaseStrategy):
         if isinstance(state, dict):
             state = StrategyState(**state)
     
-        logger.info("initializing polymarket api clients")
-        self.data_client = PolymarketDataClient()
-        self.gamma_client = PolymarketGammaClient()
-        self.clob_client = PolymarketClobClient()
+        timer = PhaseTimer()
+        self.state_lock = threading.RLock()
+        self.last_risk_report: risk.RiskReport = None
+        # our limit orders still resting on the book: order id -> (order, shares matched so far)
+        self.resting_orders: Dict[str, Tuple[LimitOrder, float]] = {}
+        # cross-strategy order netter, set by the StrategyManager when it nets
+        self.netter: OrderNetter = None
+        # shared per process (clob: per key / proxy / host), so only the first strategy pays for the handshake
+        self.data_client = client_registry.data()
+        self.gamma_client = client_registry.gamma()
+        self.clob_client = client_registry.clob()
+        timer.mark('clients')
 
         self.state = state
         self.SessionFactory = SessionFactory
+        if self.spec_config is not None:
+            # specs come straight from the db json, written by whichever version of the strategy created them
+            self.state.spec = {**self.spec_config().model_dump(), **(self.state.spec or {})}
+
+        # process-wide token / condition / event lookups, refreshed whenever we pull markets
+        self.market_index = market_index
+
+        # strategies that opt in read markets from the local, incrementally synced catalog instead of gamma
+        self.catalog = None
+        if SessionFactory and (self.state.spec or {}).get('use_catalog'):
+            self.catalog = MarketCatalog.shared(SessionFactory, self.gamma_client)
+        # request params our market source can filter on, for filters.plan_query (None = gamma, all of them)
+        self.request_fields = CATALOG_REQUEST_FIELDS if self.catalog is not None else None
 
         if not self.state.portfolio_id:
             self.state.cash_usd = self.state.allocation_usd
@@ -88,6 +125,16 @@ class PolymarketStrategy(BaseStrategy):
                         for pos in session.query(Position).filter_by(portfolio_id=self.state.portfolio_id).all()
                     }
 
+        # strategies that opt in keep live books for their tokens, mirrored off the clob market websocket
+        self.book_mirror = None
+        if (self.state.spec or {}).get('use_book_mirror'):
+            self.book_mirror = order_book_mirror.start()
+            self.book_mirror.watch(self.positions.keys())
+        # cash rebalance may spend, as of the last snapshot_positions
+        self.available_cash_usd = self.spendable_cash_usd()
+        timer.mark('state')
+        logger.info(f"strategy {self.state.name} started: {timer}")
+
     ################## core functions ##########################
    
     
@@ -122,10 +169,61 @@ class PolymarketStrategy(BaseStrategy):
         
 
 
+    def snapshot_positions(self) -> Dict[str, PolymarketPosition]:
+        """
+        positions and spendable cash (available_cash_usd) as of one instant: fills of resting orders are booked on
+        the order tracker's thread, under state_lock.
+        """
+        with self.state_lock:
+            self.available_cash_usd = self.spendable_cash_usd()
+            return copy.deepcopy(self.positions)
+
+    def spendable_cash_usd(self) -> Optional[float]:
+        """
+        cash minus what our resting limit buys would still take if they filled (None if cash isn't tracked).
+        """
+        with self.state_lock:
+            if self.state.cash_usd is None:
+                return None
+            reserved = sum(
+                (order.size - matched) * order.price
+                for order, matched in self.resting_orders.values()
+                if order.side.upper() == 'BUY'
+            )
+            return self.state.cash_usd - reserved
+
+    def check_orders(self, orders_to_place: List[Union[MarketBuy, MarketSell, LimitOrder]]) -> List[Union[MarketBuy, MarketSell, LimitOrder]]:
+        """
+        Pre-trade risk gate over the whole batch (see risk.py): cash, per order / per event caps, duplicates,
+        sells beyond the position. Violating orders are clipped or dropped; the report is logged and kept on
+        self.last_risk_report.
+        """
+        spec = self.state.spec or {}
+        if not spec.get('risk_gate') or not orders_to_place:
+            return orders_to_place
+
+        cash_usd = self.spendable_cash_usd()
+        limits = risk.RiskLimits(
+            cash_usd=float('inf') if cash_usd is None else cash_usd,
+            max_order_usd=spec.get('max_order_usd'),
+            max_event_usd=spec.get('max_event_usd'),
+            min_order_usd=spec.get('min_order_usd') or 0.0,
+        )
+        with self.state_lock:
+            orders, report = risk.check_orders(orders_to_place, self.positions, limits)
+        self.last_risk_report = report
+
+        logger.info(report.summary())
+        for order, amount, reason in report.clipped:
+            logger.info(f"risk gate: clipped {type(order).__name__} {order.token_id} to {amount:.4f} ({reason})")
+        for order, reason in report.dropped:
+            logger.warning(f"risk gate: dropped {type(order).__name__} {order.token_id} ({reason})")
+        return orders
+
     def execute(self, orders_to_place: List[Union[MarketBuy, MarketSell, LimitOrder]]) -> List[OrderResult]:
         """
             Executes orders and returns the results. For paper trades, it simulates
-            perfect execution with zero slippage.
+            the fills by walking the current order books (simulate_execution).
 
             Note:
                 "making amount" and "taking amount" mean DIFFERENT things for buy and sell orders.
@@ -138,14 +236,94 @@ class PolymarketStrategy(BaseStrategy):
             logger.info("no orders to place")
             return []
 
+        if self.netter is not None and not self.state.paper:
+            # other strategies on this account may be trading the same tokens right now (see netting.py)
+            return self.netter.submit(self, orders_to_place)
+        return self.route_orders(orders_to_place)
+
+    def route_orders(self, orders_to_place: List[Union[MarketBuy, MarketSell, LimitOrder]]) -> List[OrderResult]:
+        """
+        Sends orders through the router when the spec sets max_slippage, straight to dispatch_orders otherwise.
+        """
+        spec = self.state.spec or {}
+        if spec.get('max_slippage') is not None:
+            # big market orders go out as children sized to the book (see router.py); the router calls back into
+            # dispatch_orders with the children and folds their results back into one result per parent
+            router = ExecutionRouter(
+                self.dispatch_orders,
+                self.get_order_books,
+                max_slippage=spec['max_slippage'],
+                max_child=spec.get('max_child_usd'),
+                waves=spec.get('child_waves', 1),
+                interval_seconds=spec.get('child_interval_seconds', 0),
+                tick_size=lambda token_id: token_metadata.get(token_id, 'tick_size'),
+            )
+            return router.execute(orders_to_place)
+        return self.dispatch_orders(orders_to_place)
+
+    def dispatch_orders(self, orders_to_place: List[Union[MarketBuy, MarketSell, LimitOrder]]) -> List[OrderResult]:
+        """
+        Sends orders as they are: simulated in paper mode, otherwise batched / in parallel per the spec.
+        """
         if self.state.paper:
-            logger.info("paper mode, simulating execution")
-            paper_results = []
-            for order in orders_to_place:
-                paper_results.append(self.get_virtual_order_result(order))
-            return paper_results
+            logger.info("paper mode, simulating execution against live order books")
+            return self.simulate_execution(orders_to_place)
+
+        if (self.state.spec or {}).get('batch_orders'):
+            results = self.execute_orders_in_batches(orders_to_place)
+        else:
+            results = self.execute_orders_in_parallel(orders_to_place)
+        self.track_resting_orders(results)
+        return results
+
+    def track_resting_orders(self, results: List[OrderResult]):
+        """
+        Hands limit orders that are (partly) resting on the book to the clob client's order tracker, so their
+        later fills / cancels reach update_state.
+        """
+        for res in results:
+            order = res.order
+            if not (isinstance(order, LimitOrder) and res.success and res.orderID) or str(res.status).lower() not in ('live', 'delayed'):
+                continue
+            # shares the post response already reported filled (update_state books those with the execution report)
+            size_matched = float((res.takingAmount if order.side.upper() == 'BUY' else res.makingAmount) or 0)
+            with self.state_lock:
+                self.resting_orders[res.orderID] = (order, size_matched)
+            self.clob_client.order_tracker().track(
+                res.orderID,
+                order.token_id,
+                order.side,
+                order.price,
+                order.size,
+                on_fill=lambda fill, order=order: self.apply_order_fill(order, fill),
+                size_matched=size_matched,
+                condition_id=order.condition_id or (self.market_index.current.by_token(order.token_id) or {}).get('condition_id'),
+            )
 
-        return self.execute_orders_in_parallel(orders_to_place)
+    def apply_order_fill(self, order: LimitOrder, fill: OrderFill):
+        """
+        Books a later fill of one of our resting limit orders (order tracker callback, runs on the tracker's thread).
+        """
+        # the reservation and the cash it turns into move together, so a snapshot never sees the fill half booked
+        with self.state_lock:
+            if fill.done:
+                self.resting_orders.pop(fill.order_id, None)
+            elif fill.order_id in self.resting_orders:
+                self.resting_orders[fill.order_id] = (order, fill.size_matched)
+            if fill.size <= 0:
+                logger.info(f"limit order {fill.order_id} done: {fill.size_matched}/{order.size} filled")
+                return
+            usd = fill.size * fill.price
+            making, taking = (usd, fill.size) if fill.side == 'BUY' else (fill.size, usd)
+            logger.info(f"limit order {fill.order_id} filled {fill.size} @ {fill.price} ({fill.size_matched}/{order.size})")
+            self.update_state([OrderResult(
+                order=order.model_copy(update={'size': fill.size}),
+                orderID=fill.order_id,
+                success=True,
+                status='matched',
+                makingAmount=str(making),
+                takingAmount=str(taking),
+            )])
 
     def update_state(self, execution_report: List[OrderResult]):
         """
@@ -168,117 +346,212 @@ class PolymarketStrategy(BaseStrategy):
                 'success': True
                 }
         """
-        # 1. Update internal state (cash and positions)
-        prev_asset_ids = set(self.positions.keys())
-        prev_positons = copy.deepcopy(self.positions)
-
-        for res in execution_report:
-            if res.success:
-                order_data = res.order
-                token_id = order_data.token_id
-
-                if isinstance(order_data, MarketBuy):
-                    self.state.cash_usd -= float(res.makingAmount)
-                    if token_id not in self.positions:
-                        self.positions[token_id] = PolymarketPosition(
-                            token_id=token_id,
-                            event_id=order_data.event_id,
-                            condition_id=order_data.condition_id,
-                            slug=order_data.slug,
-                            end_date=order_data.end_date,
-                            amount=0,
-                            avg_price=0,
-                            cur_price=self.clob_client.get_price(token_id=token_id, side="BUY")['price']
-                        )
+        # fills from the order tracker land here from its own thread -> one update at a time
+        with self.state_lock:
+            timer = PhaseTimer()
+
+            # 0. our own fills just moved prices and positions -> drop them from the shared response cache
+            # (a limit order that went straight to resting filled nothing yet - its fills come through the order tracker)
+            execution_report = [res for res in execution_report if res.success and float(res.makingAmount or 0) > 0]
+            filled_tokens = {res.order.token_id for res in execution_report}
+            if filled_tokens:
+                self.clob_client.invalidate_prices(filled_tokens)
+                self.data_client.invalidate_user(self.clob_client.proxy_address)
+            timer.mark('invalidate')
+
+            # 1. price every token we just traded in one go (book mirror first, one batched get_prices for the rest)
+            cur_prices = self.get_current_prices(filled_tokens)
+            timer.mark('reprice')
+
+            # 2. Update internal state (cash and positions)
+            prev_asset_ids = set(self.positions.keys())
+            prev_positions = copy.deepcopy(self.positions)
+
+            for res in execution_report:
+                if res.success:
+                    order_data = res.order
+                    token_id = order_data.token_id
+
+                    if isinstance(order_data, MarketBuy) or (isinstance(order_data, LimitOrder) and order_data.side.upper() == 'BUY'):
+                        self.state.cash_usd -= float(res.makingAmount)
+                        if token_id not in self.positions:
+                            # orders built without market metadata get it from the market index
+                            market = self.market_index.current.by_token(token_id) or {}
+                            if self.book_mirror is not None:
+                                self.book_mirror.watch([token_id])
+                            if not (order_data.event_id or market.get('event_id')):
+                                logger.warning(f"no event for {token_id}: position is tracked, but outside the per-event limits")
+                            self.positions[token_id] = PolymarketPosition(
+                                token_id=token_id,
+                                event_id=order_data.event_id or market.get('event_id'),
+                                condition_id=order_data.condition_id or market.get('condition_id'),
+                                slug=order_data.slug or market.get('slug'),
+                                end_date=order_data.end_date or market.get('end_date'),
+                                outcome=market.get('outcome'),
+                                amount=0,
+                                avg_price=0,
+                                cur_price=cur_prices.get(token_id)
+                            )
                     
-                    position = self.positions[token_id]
-                    prev_total_price = position.amount * position.avg_price
-                    position.amount += float(res.takingAmount)
-                    position.avg_price = (prev_total_price + float(res.makingAmount)) / position.amount
-
-                elif isinstance(order_data, MarketSell):
-                    self.state.cash_usd += float(res.takingAmount)
-                    assert token_id in self.positions
-                    position = self.positions[token_id]
-                    assert position.amount >= float(res.makingAmount)
-
-                    if abs(position.amount - float(res.makingAmount)) < 1e-9:
-                        del self.positions[token_id]
-                    else:
+                        position = self.positions[token_id]
                         prev_total_price = position.amount * position.avg_price
-                        position.amount -= float(res.makingAmount)
-                        position.avg_price = (prev_total_price - float(res.takingAmount)) / position.amount
-                    position.cur_price = self.clob_client.get_price(token_id=token_id, side="BUY")['price']
-
-        # 2. Update Database
-        if not self.SessionFactory:
-            logger.warning("SessionFactory not set, skipping DB update")
-            return
+                        position.amount += float(res.takingAmount)
+                        position.avg_price = (prev_total_price + float(res.makingAmount)) / position.amount
+
+                    elif isinstance(order_data, (MarketSell, LimitOrder)):
+                        self.state.cash_usd += float(res.takingAmount)
+                        assert token_id in self.positions
+                        position = self.positions[token_id]
+                        assert position.amount >= float(res.makingAmount)
+
+                        if abs(position.amount - float(res.makingAmount)) < 1e-9:
+                            del self.positions[token_id]
+                        else:
+                            prev_total_price = position.amount * position.avg_price
+                            position.amount -= float(res.makingAmount)
+                            position.avg_price = (prev_total_price - float(res.takingAmount)) / position.amount
+                            position.cur_price = cur_prices.get(token_id, position.cur_price)
+            timer.mark('bookkeeping')
+
+            # 3. Update Database
+            if not self.SessionFactory:
+                logger.warning("SessionFactory not set, skipping DB update")
+                logger.info(f"update_state timings: {timer}")
+                return
 
-        all_asset_ids = set(self.positions.keys()) | prev_asset_ids
+            all_asset_ids = set(self.positions.keys()) | prev_asset_ids
 
 
-        with self.SessionFactory() as session:
+            with self.SessionFactory() as session:
 
-            logger.info(f"updating db for strategy {self.state.strategy_path}: {self.state.name} at time {format_datetime(datetime.now())}")
-
-            for asset_id in all_asset_ids:
-                runtime_pos = self.positions.get(asset_id) if asset_id in self.positions else prev_positions.get(asset_id)
-                if not session.query(polymarket_models.Asset).filter_by(asset_id=asset_id).first():
-                    session.add(
-                        polymarket_models.Asset(
-                            asset_id=asset_id,
-                            event_id=runtime_pos.event_id,
-                            condition_id=runtime_pos.condition_id,
-                            slug=runtime_pos.slug,
-                            last_price=runtime_pos.cur_price,
+                logger.info(f"updating db for strategy {self.state.strategy_path}: {self.state.name} at time {format_datetime(datetime.now())}")
+
+                for asset_id in all_asset_ids:
+                    runtime_pos = self.positions.get(asset_id) if asset_id in self.positions else prev_positions.get(asset_id)
+                    if not session.query(polymarket_models.Asset).filter_by(asset_id=asset_id).first():
+                        session.add(
+                            polymarket_models.Asset(
+                                asset_id=asset_id,
+                                event_id=runtime_pos.event_id,
+                                condition_id=runtime_pos.condition_id,
+                                slug=runtime_pos.slug,
+                                last_price=runtime_pos.cur_price,
+                            )
                         )
-                    )
                 
-                pos = session.query(polymarket_models.Position).filter_by(portfolio_id=self.state.portfolio_id, asset_id=asset_id).first()
-                if asset_id in self.positions and asset_id in prev_asset_ids:
-                    pos.amount_shares = self.positions[asset_id].amount
-                    pos.avg_price = self.positions[asset_id].avg_price
-                elif asset_id in self.positions:
-                    session.add(
-                        # i keep forgetting that i don't store event_id, slug, etc in the positions table -> this is stored in the "assets table"
-                        polymarket_models.Position(
-                            portfolio_id=self.state.portfolio_id,
-                            asset_id=asset_id,
-                            amount_shares=self.positions[asset_id].amount,
-                            avg_price=self.positions[asset_id].avg_price,
-                            paper=self.state.paper
+                    pos = session.query(polymarket_models.Position).filter_by(portfolio_id=self.state.portfolio_id, asset_id=asset_id).first()
+                    if asset_id in self.positions and asset_id in prev_asset_ids:
+                        pos.amount_shares = self.positions[asset_id].amount
+                        pos.avg_price = self.positions[asset_id].avg_price
+                    elif asset_id in self.positions:
+                        session.add(
+                            # i keep forgetting that i don't store event_id, slug, etc in the positions table -> this is stored in the "assets table"
+                            polymarket_models.Position(
+                                portfolio_id=self.state.portfolio_id,
+                                asset_id=asset_id,
+                                amount_shares=self.positions[asset_id].amount,
+                                avg_price=self.positions[asset_id].avg_price,
+                                paper=self.state.paper
+                            )
                         )
-                    )
-                elif asset_id in prev_asset_ids:
-                    session.delete(pos)
+                    elif asset_id in prev_asset_ids:
+                        session.delete(pos)
 
                 
-            portfolio = session.query(polymarket_models.Portfolio).filter_by(id=self.state.portfolio_id).first()
-            if not portfolio:
-                logger.error(f"Portfolio '{self.state.portfolio}' not found.")
-                return
-
-            portfolio.cash_usd = self.state.cash_usd
-            portfolio.paper = self.state.paper
-            cur_value = self.state.cash_usd
-            for asset_id, position in self.positions.items():
-                cur_value += position.amount * (position.cur_price if position.cur_price else position.avg_price)
-            portfolio.holdings_value_usd = cur_value
-            portfolio.total_value_usd = self.state.cash_usd + cur_value
-            portfolio.pnl = (self.state.cash_usd + cur_value) - self.state.allocation_usd
+                portfolio = session.query(polymarket_models.Portfolio).filter_by(id=self.state.portfolio_id).first()
+                if not portfolio:
+                    logger.error(f"Portfolio '{self.state.portfolio}' not found.")
+                    return
+
+                portfolio.cash_usd = self.state.cash_usd
+                portfolio.paper = self.state.paper
+                cur_value = self.state.cash_usd
+                for asset_id, position in self.positions.items():
+                    cur_value += position.amount * (position.cur_price if position.cur_price else position.avg_price)
+                portfolio.holdings_value_usd = cur_value
+                portfolio.total_value_usd = self.state.cash_usd + cur_value
+                portfolio.pnl = (self.state.cash_usd + cur_value) - self.state.allocation_usd
             
-            portfolio.max_pnl = max(portfolio.max_pnl, portfolio.pnl)
-            portfolio.min_pnl = min(portfolio.min_pnl, portfolio.pnl)
-            portfolio.last_rebalance_at = datetime.now()
+                portfolio.max_pnl = max(portfolio.max_pnl, portfolio.pnl)
+                portfolio.min_pnl = min(portfolio.min_pnl, portfolio.pnl)
+                portfolio.last_rebalance_at = datetime.now()
             
-            session.commit()
-            logger.info("DB updated successfully")
+                session.commit()
+                logger.info("DB updated successfully")
+            timer.mark('db')
+
+            logger.info("syncing portfolio...")
+            self.sync_and_refresh()
+            timer.mark('snapshot')
+            logger.info(f"update_state timings ({len(execution_report)} results, {len(filled_tokens)} repriced): {timer}")
 
-        
-        logger.info("syncing portfolio...")
-        self.sync_and_refresh()
 
+    def get_current_prices(self, token_ids, side: str = "BUY") -> Dict[str, float]:
+        """
+        {token_id: price} for a set of tokens: read off the order book mirror where it has a live book,
+        the rest in a single batched clob get_prices call. tokens nobody could price (or all of the clob's,
+        if the call fails) are left out - callers must not assume every token gets a price.
+        """
+        token_ids = [t for t in dict.fromkeys(token_ids) if t]
+        prices = {}
+        if self.book_mirror is not None:
+            for token_id in token_ids:
+                price = self.book_mirror.price(token_id, side)
+                if price is not None:
+                    prices[token_id] = price
+
+        missing = [t for t in token_ids if t not in prices]
+        if missing:
+            # the clob client serves these from the shared per-token price cache where they're fresh enough
+            max_age = (self.state.spec or {}).get('max_price_age')
+            try:
+                res = self.clob_client.get_prices([BookParams(token_id=t, side=side) for t in missing], max_age=max_age)
+            except Exception as e:
+                logger.warning(f"could not price {len(missing)} tokens: {e}")
+                res = {}
+            for token_id, by_side in res.items():
+                if by_side.get(side) is not None:
+                    prices[token_id] = float(by_side[side])
+            if self.clob_client.prices is not None:
+                ages = self.clob_client.prices.ages(missing, side)
+                if ages:
+                    oldest = max(ages, key=ages.get)
+                    logger.info(f"priced {len(token_ids)} tokens ({len(token_ids) - len(missing)} off the book mirror), oldest clob price {ages[oldest]:.2f}s ({oldest})")
+        return prices
+
+    def get_order_books(self, token_ids) -> Dict[str, Any]:
+        """
+        {token_id: book} off the order book mirror where it has a live book, the rest in one clob get_order_books call.
+        tokens without a book are left out.
+        """
+        token_ids = [t for t in dict.fromkeys(token_ids) if t]
+        books = {}
+        if self.book_mirror is not None:
+            for token_id in token_ids:
+                book = self.book_mirror.book(token_id)
+                if book is not None:
+                    books[token_id] = book
+
+        missing = [t for t in token_ids if t not in books]
+        if missing:
+            try:
+                for book in self.clob_client.get_order_books([BookParams(token_id=t) for t in missing]):
+                    books[book.asset_id] = book
+            except Exception as e:
+                logger.warning(f"could not fetch order books for {len(missing)} tokens: {e}")
+        return books
+
+    def simulate_execution(self, orders: List[Union[MarketBuy, MarketSell, LimitOrder]]) -> List[OrderResult]:
+        """
+        Paper fills: every order walks its token's current book (see fills.simulate_orders), all in one vectorized pass.
+        Virtual sells, and market orders whose book can't be fetched, fall back to the zero slippage fill at expected_price.
+        """
+        books = self.get_order_books(o.token_id for o in orders if not getattr(o, 'virtual', False))
+        results = simulate_orders(orders, books)
+        for i, order in enumerate(orders):
+            if getattr(order, 'virtual', False) or (order.token_id not in books and not isinstance(order, LimitOrder)):
+                results[i] = self.get_virtual_order_result(order)
+        return results
 
     ############ db utils ############
 
@@ -305,16 +578,65 @@ class PolymarketStrategy(BaseStrategy):
     ############################################################
 
 
+    def order_args(self, order: Union[MarketBuy, MarketSell, LimitOrder]) -> Tuple[Union[MarketOrderArgs, OrderArgs], OrderType]:
+        """
+        The unsigned clob order args for one of our order types, plus the order type to post it as.
+        Market orders go out FOK, limit orders GTC.
+        """
+        if isinstance(order, (MarketBuy, MarketSell)):
+            side, amount = ('BUY', order.amount_usd) if isinstance(order, MarketBuy) else ('SELL', order.amount_shares)
+            # an explicit worst price caps slippage; with a mirrored book the fill price is known locally;
+            # otherwise (price 0) create_market_order fetches the book
+            price = order.max_price if isinstance(order, MarketBuy) else order.min_price
+            if price is None and self.book_mirror is not None:
+                price = self.book_mirror.market_price(order.token_id, side, amount)
+            return MarketOrderArgs(token_id=order.token_id, amount=amount, side=side, price=price or 0), OrderType.FOK
+        if isinstance(order, LimitOrder):
+            min_size = token_metadata.get(order.token_id, 'min_size')
+            if min_size is not None and order.size < min_size:
+                raise ValueError(f"limit order size {order.size} is below the market minimum of {min_size}: {order}")
+            return OrderArgs(token_id=order.token_id, size=order.size, price=order.price, side=order.side), OrderType.GTC
+        raise ValueError(f"Invalid order type: {order}")
+
+    def sign_order(self, order: Union[MarketBuy, MarketSell, LimitOrder]) -> PostOrdersArgs:
+        """
+        Builds + signs the clob order for one of our order types, in this process.
+        """
+        args, order_type = self.order_args(order)
+        if isinstance(args, MarketOrderArgs):
+            return PostOrdersArgs(order=self.clob_client.create_market_order(args), orderType=order_type)
+        return PostOrdersArgs(order=self.clob_client.create_order(args), orderType=order_type)
+
+    def sign_orders_in_pool(self, orders: List[Union[MarketBuy, MarketSell, LimitOrder]], executor: concurrent.futures.Executor, workers: int) -> List[Union[PostOrdersArgs, Exception]]:
+        """
+        Resolves order options (network) on `executor`, then signs everything on the clob client's process pool signer.
+        """
+        def prepare(order):
+            args, order_type = self.order_args(order)
+            return args, resolve_options(self.clob_client, args), order_type
+
+        prepared = []
+        for future in [executor.submit(prepare, order) for order in orders]:
+            try:
+                prepared.append(future.result())
+            except Exception as e:
+                prepared.append(e)
+
+        ready = [p for p in prepared if not isinstance(p, Exception)]
+        signed = iter(self.clob_client.order_signer(workers).sign_many([(args, options) for args, options, _ in ready]))
+        out = []
+        for p in prepared:
+            if isinstance(p, Exception):
+                out.append(p)
+                continue
+            signed_order, error = next(signed)
+            out.append(PostOrdersArgs(order=signed_order, orderType=p[2]) if error is None else Exception(error))
+        return out
+
     def place_market_buy(self, market_buy: MarketBuy) -> OrderResult:
         try:
-            signed_order = self.clob_client.create_market_order(
-                MarketOrderArgs(
-                    token_id=market_buy.token_id,
-                    amount=market_buy.amount_usd,
-                    side='BUY'
-                )
-            )
-            res = self.clob_client.post_order(signed_order, orderType="FOK")
+            args = self.sign_order(market_buy)
+            res = self.clob_client.post_order(args.order, orderType=args.orderType)
             return OrderResult(order=market_buy, **res)
         except Exception as e:
             logger.error(f"failed to place market buy order: {e}")
@@ -325,14 +647,8 @@ class PolymarketStrategy(BaseStrategy):
         if market_sell.virtual:
             return 
         try:
-            signed_order = self.clob_client.create_market_order(
-                MarketOrderArgs(
-                    token_id=market_sell.token_id,
-                    amount=market_sell.amount_shares,
-                    side='SELL'
-                )
-            )
-            res = self.clob_client.post_order(signed_order, orderType="FOK")
+            args = self.sign_order(market_sell)
+            res = self.clob_client.post_order(args.order, orderType=args.orderType)
             return OrderResult(order=market_sell, **res)
         except Exception as e:
             logger.error(f"failed to place market sell order: {e}")
@@ -340,44 +656,37 @@ class PolymarketStrategy(BaseStrategy):
 
     def place_limit_order(self, limit_order: LimitOrder) -> OrderResult:
         try:
-            order = self.clob_client.create_order(
-                OrderArgs(
-                    token_id=limit_order.token_id,
-                    size=limit_order.size,
-                    price=limit_order.price,
-                    side=limit_order.side
-                )
-            )
-            res = self.clob_client.post_order(order, orderType=OrderType.GTK.value)
+            args = self.sign_order(limit_order)
+            res = self.clob_client.post_order(args.order, orderType=args.orderType)
             return OrderResult(order=limit_order, **res)
         except Exception as e:
             logger.error(f"failed to place limit order: {e}")
             return OrderResult(order=limit_order, errorMsg=str(e))
 
+    def place_order(self, order: Union[MarketBuy, MarketSell, LimitOrder]) -> OrderResult:
+        if isinstance(order, LimitOrder):
+            return self.place_limit_order(order)
+        if isinstance(order, MarketBuy):
+            return self.place_market_buy(order)
+        if isinstance(order, MarketSell):
+            return self.get_virtual_order_result(order) if order.virtual else self.place_market_sell(order)
+        raise ValueError(f"Invalid order type: {order}")
+
     def execute_orders_in_parallel(self, orders: List[Union[MarketBuy, MarketSell, LimitOrder]]) -> List[OrderResult]:
         """ 
         Executes a list of orders in parallel using a thread pool.
         Each order in the list should be an instance of one of the above defined order types
         """
-        execution_results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_order = {}
-            for order in orders:
-                future = None
-                if isinstance(order, LimitOrder):
-                    future = executor.submit(self.place_limit_order, order)
-                elif isinstance(order, MarketBuy):
-                    future = executor.submit(self.place_market_buy, order)
-                elif isinstance(order, MarketSell):
-                    if not order.virtual:
-                        future = executor.submit(self.place_market_sell, order)
-                    else:
-                        future = executor.submit(self.get_virtual_order_result, order)
-                else:
-                    raise ValueError(f"Invalid order type: {order}")
+        for order in orders:
+            if not isinstance(order, (LimitOrder, MarketBuy, MarketSell)):
+                raise ValueError(f"Invalid order type: {order}")
 
-                if future:
-                    future_to_order[future] = order
+        execution_results = []
+        # sized from the clob limiter's current AIMD window rather than a fixed 10: after a burst of 429s
+        # there's no point spinning up threads that would only queue on the limiter
+        max_workers = max(1, min(len(orders), self.clob_client.limiter.limit))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_order = {executor.submit(self.place_order, order): order for order in orders}
 
             for future in concurrent.futures.as_completed(future_to_order):
                 original_order = future_to_order[future]
@@ -390,6 +699,82 @@ class PolymarketStrategy(BaseStrategy):
         
         return execution_results
 
+    def execute_orders_in_batches(self, orders: List[Union[MarketBuy, MarketSell, LimitOrder]]) -> List[OrderResult]:
+        """
+        Signs every order first, then submits them POST_ORDERS_BATCH_SIZE at a time through clob post_orders,
+        batches in parallel. Results come back in the same order as `orders`.
+
+        A batch the clob rejects outright (4xx) is retried order by order. A batch that times out or 5xx's is
+        reported as failed rather than resent, since some of its orders may have gone through.
+        """
+        results: List[OrderResult] = [None] * len(orders)
+        to_sign = []
+        for i, order in enumerate(orders):
+            if isinstance(order, MarketSell) and order.virtual:
+                results[i] = self.get_virtual_order_result(order)
+            elif isinstance(order, (LimitOrder, MarketBuy, MarketSell)):
+                to_sign.append(i)
+            else:
+                raise ValueError(f"Invalid order type: {order}")
+
+        max_workers = max(1, self.clob_client.limiter.limit)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 1. sign (tick size / neg risk / market price lookups happen here, so it's parallel too)
+            signed = {}
+            signing_workers = (self.state.spec or {}).get('signing_workers', 0)
+            if signing_workers and to_sign:
+                outcomes = zip(to_sign, self.sign_orders_in_pool([orders[i] for i in to_sign], executor, signing_workers))
+            else:
+                futures = {executor.submit(self.sign_order, orders[i]): i for i in to_sign}
+                outcomes = []
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        outcomes.append((futures[future], future.result()))
+                    except Exception as e:
+                        outcomes.append((futures[future], e))
+            for i, outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.error(f"failed to sign order {orders[i]}: {outcome}")
+                    results[i] = OrderResult(order=orders[i], errorMsg=str(outcome))
+                else:
+                    signed[i] = outcome
+
+            # 2. post in batches
+            ready = [i for i in to_sign if i in signed]
+            batches = [ready[k:k + POST_ORDERS_BATCH_SIZE] for k in range(0, len(ready), POST_ORDERS_BATCH_SIZE)]
+            futures = {executor.submit(self._post_batch, [orders[i] for i in batch], [signed[i] for i in batch]): batch for batch in batches}
+            for future in concurrent.futures.as_completed(futures):
+                for i, result in zip(futures[future], future.result()):
+                    results[i] = result
+
+        logger.info(f"posted {len(ready)} orders in {len(batches)} batches")
+        return results
+
+    def _post_batch(self, orders: List[Union[MarketBuy, MarketSell, LimitOrder]], args: List[PostOrdersArgs]) -> List[OrderResult]:
+        try:
+            res = self.clob_client.post_orders(args)
+        except PolyApiException as e:
+            if e.status_code is not None and 400 <= e.status_code < 500 and e.status_code != 429:
+                # rejected as a whole -> nothing was placed; find out which order it didn't like
+                logger.warning(f"batch of {len(orders)} orders rejected ({e.error_msg}), posting them one by one")
+                return [self._post_one(order, arg) for order, arg in zip(orders, args)]
+            logger.error(f"batch of {len(orders)} orders failed: {e}")
+            return [OrderResult(order=order, errorMsg=str(e)) for order in orders]
+        except Exception as e:
+            logger.error(f"batch of {len(orders)} orders failed: {e}")
+            return [OrderResult(order=order, errorMsg=str(e)) for order in orders]
+
+        if not isinstance(res, list) or len(res) != len(orders):
+            logger.error(f"unexpected post_orders response for {len(orders)} orders: {res}")
+            return [OrderResult(order=order, errorMsg=f"unexpected post_orders response: {res}") for order in orders]
+        return [OrderResult(order=order, **r) for order, r in zip(orders, res)]
+
+    def _post_one(self, order: Union[MarketBuy, MarketSell, LimitOrder], args: PostOrdersArgs) -> OrderResult:
+        try:
+            return OrderResult(order=order, **self.clob_client.post_order(args.order, orderType=args.orderType))
+        except Exception as e:
+            return OrderResult(order=order, errorMsg=str(e))
+
 
     # util functions -> these should be PURE STATELESS FUNCTIONS
 
@@ -407,16 +792,33 @@ class PolymarketStrategy(BaseStrategy):
 
     @staticmethod
     def apply(df, conditions):
-        mask = np.full(df.shape[0], True)
-        for k, v in conditions.items():
-            mask &= np.vectorize(v)(df[k])
+        """
+        Rows of df matching all conditions, as one compiled vectorized mask (see filters.CompiledFilter).
+        conditions: a filter expression ("spread <= 0.1 and volumeNum >= 1e5"), a list of expressions /
+        (field, op, value) triples, or a {column: condition} dict whose values are expression tails
+        ({'spread': '<= 0.1'}) or, on the slow path, per-element callables ({'spread': lambda s: s <= 0.1}).
+        """
+        if isinstance(conditions, str):
+            conditions = [conditions]
+        callables = {}
+        if isinstance(conditions, dict):
+            callables = {k: v for k, v in conditions.items() if callable(v)}
+            conditions = [f"{k} {v}" if isinstance(v, str) else (k, *v) for k, v in conditions.items() if not callable(v)]
+
+        mask = CompiledFilter(conditions).mask(df)
+        # slow path: one python call per element, only over the rows still in
+        for k, v in callables.items():
+            rows = np.flatnonzero(mask)
+            if len(rows):
+                mask[rows] = np.vectorize(v, otypes=[bool])(df[k].to_numpy()[rows])
         return df[mask].reset_index()
 
 
     @footprint(time_limit_seconds=0.01, memory_limit_mb=10)
     def get_user_positions(self, user: str = None):
         if not user:
-            user = os.getenv('POLYMARKET_PROXY_ADDRESS')
+            # same address update_state invalidates the cached positions by (the clob client falls back to the env too)
+            user = self.clob_client.proxy_address
         pos = self.data_client.positions(
             PositionRequest(user=user)
         )
@@ -430,167 +832,47 @@ class PolymarketStrategy(BaseStrategy):
     def get_recent_markets(self, look_back_days: int = 6 * 30, minimum_volume: float = 100000, minimum_liquidity: float = 1000, limit: int = 500, days_to_end: int = None):
         """
         Fetches a dataframe of markets created in the last look_back_months months.
+        Pass limit=None to page through every matching market.
         """ 
-        request = {
-            'limit': limit,
-            'start_date_min': format_datetime(datetime.now() - timedelta(days=look_back_days)),
-            'end_date_min': format_datetime(datetime.now()),
-            'volume_num_min': minimum_volume,
-            'liquidity_num_min': minimum_liquidity,
-            'closed': False
-        }
-        if days_to_end is not None:
-            request['end_date_max'] = format_datetime(datetime.now() + timedelta(days=days_to_end))
-        res = self.gamma_client.get_markets(MarketRequest(**request))
-
-        # this is just some cleaning on the data recieved from polymarket
-    
-        for market in res:
-            json_fields = ['outcomes', 'outcomePrices', 'clobTokenIds', 'umaResolutionStatuses']
-            for field in json_fields:
-                if field in market and isinstance(market[field], str):
-                    try:
-                        market[field] = json.loads(market[field])
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-            
-            float_fields = [
-                'liquidity', 'volume', 'volumeNum', 'liquidityNum', 
-                'volume24hr', 'volume1wk', 'volume1mo', 'volume1yr',
-                'umaBond', 'umaReward', 'volume24hrClob', 'volume1wkClob', 
-                'volume1moClob', 'volume1yrClob', 'volumeClob', 'liquidityClob',
-                'orderPriceMinTickSize', 'orderMinSize', 'rewardsMinSize', 
-                'rewardsMaxSpread', 'spread', 'oneDayPriceChange', 
-                'oneWeekPriceChange', 'lastTradePrice', 'bestBid', 'bestAsk'
-            ]
-            for field in float_fields:
-                if field in market and isinstance(market[field], str):
-                    try:
-                        market[field] = float(market[field])
-                    except (ValueError, TypeError):
-                        pass
-            
-            bool_fields = [
-                'active', 'closed', 'new', 'featured', 'archived', 'restricted',
-                'enableOrderBook', 'hasReviewedDates', 'acceptingOrders', 'negRisk',
-                'ready', 'funded', 'cyom', 'pagerDutyNotificationEnabled', 'approved',
-                'automaticallyActive', 'clearBookOnStart', 'showGmpSeries', 
-                'showGmpOutcome', 'manualActivation', 'negRiskOther', 'pendingDeployment',
-                'deploying', 'rfqEnabled'
-            ]
-            for field in bool_fields:
-                if field in market and isinstance(market[field], str):
-                    if market[field].lower() == 'true':
-                        market[field] = True
-                    elif market[field].lower() == 'false':
-                        market[field] = False
-            
-            int_fields = ['id', 'commentCount']
-            for field in int_fields:
-                if field in market and isinstance(market[field], str):
-                    try:
-                        market[field] = int(market[field])
-                    except (ValueError, TypeError):
-                        pass
-            
-            if 'outcomePrices' in market and isinstance(market['outcomePrices'], list):
-                try:
-                    market['outcomePrices'] = [float(price) for price in market['outcomePrices']]
-                except (ValueError, TypeError):
-                    pass
-            
-            if 'events' in market and isinstance(market['events'], list):
-                for event in market['events']:
-                    for field in ['liquidity', 'volume', 'openInterest', 'competitive',
-                                 'volume24hr', 'volume1wk', 'volume1mo', 'volume1yr']:
-                        if field in event and isinstance(event[field], str):
-                            try:
-                                event[field] = float(event[field])
-                            except (ValueError, TypeError):
-                                pass
-                    
-                    for field in ['active', 'closed', 'archived', 'new', 'featured', 
-                                 'restricted', 'enableOrderBook', 'negRisk', 'cyom',
-                                 'showAllOutcomes', 'showMarketImages', 'enableNegRisk',
-                                 'automaticallyActive', 'negRiskAugmented', 'pendingDeployment',
-                                 'deploying']:
-                        if field in event and isinstance(event[field], str):
-                            if event[field].lower() == 'true':
-                                event[field] = True
-                            elif event[field].lower() == 'false':
-                                event[field] = False
-            
-            if 'clobRewards' in market and isinstance(market['clobRewards'], list):
-                for reward in market['clobRewards']:
-                    for field in ['rewardsAmount', 'rewardsDailyRate']:
-                        if field in reward and isinstance(reward[field], str):
-                            try:
-                                reward[field] = float(reward[field])
-                            except (ValueError, TypeError):
-                                pass
-
-        df = pd.DataFrame(res)[trading_keys.keys()]
-        
-        list_fields = [
-            'clobTokenIds',
-            'outcomes',
-            'outcomePrices',
-        ]
-        for k in list_fields:
-            tdf = pd.DataFrame(df[k].tolist(), index=df.index)
-            df[[k+str(i+1) for i in tdf.columns]] = tdf
-
-        df.rename(columns={'conditionId': 'condition_id', 'endDate': 'end_date'}, inplace=True)
-        df['event_id'] = df['events'].apply(lambda i: i[0]['ticker'])
-        return df
-
+        source = self.gamma_client
+        if self.catalog is not None:
+            self.catalog.sync()
+            source = self.catalog
+
+        df = source.get_recent_markets(
+            look_back_days=look_back_days,
+            minimum_volume=minimum_volume,
+            minimum_liquidity=minimum_liquidity,
+            limit=limit,
+            days_to_end=days_to_end,
+        )
+        return self._prepare_markets(df)
 
+    def get_planned_markets(self, plan: QueryPlan) -> pd.DataFrame:
+        """
+        Runs a query plan (see filters.plan_query): the pushed-down request against the catalog or gamma,
+        then the residual filter locally. Leaves what it cost on the wire in plan.transfer.
+        """
+        source = self.gamma_client
+        if self.catalog is not None:
+            self.catalog.sync()
+            source = self.catalog
 
-trading_keys = {
-    # SLUG
-    'slug': 'Market slug',
+        with metered() as meter:
+            df = source.get_markets_frame(plan.request)
+        df = plan.filter(self._prepare_markets(df))
 
-    # EVENTS
-    'events': 'Market events',
+        plan.transfer = {**meter.as_dict(), 'kept': df.shape[0]}
+        logger.info(f"market query plan: {plan.explain()}")
+        return df
 
-    # IDENTIFIERS
-    'id': 'Unique market identifier',
-    'conditionId': 'Blockchain condition identifier for the market',
-    'clobTokenIds': 'CLOB token IDs for the market',
-    'questionID': 'Question identifier for resolution',
-    'outcomes': 'Possible resolution outcomes',
-    
-    # PRICING DATA
-    'outcomePrices': 'Current prices for ["Yes", "No"] outcomes',
-    'lastTradePrice': 'Price of the most recent trade',
-    'bestBid': 'Highest price someone is willing to buy at',
-    'bestAsk': 'Lowest price someone is willing to sell at',
-    'spread': 'Difference between best bid and best ask',
-    
-    # LIQUIDITY & VOLUME
-    'liquidity': 'Total liquidity available in the market',
-    'liquidityNum': 'Total liquidity available in the market',
-    'volumeNum': 'Total trading volume since market creation',
-    'volume24hr': '24-hour trading volume',
-    'volume1wk': '1-week trading volume',
-    'volume1mo': '1-month trading volume',
-    'volume': 'Total trading volume since market creation',
-    
-    # PRICE TRENDS
-    'oneDayPriceChange': 'Price change over last 24 hours',
-    'oneWeekPriceChange': 'Price change over last week',
-    
-    # MARKET STATUS
-    'active': 'Whether market is currently active for trading',
-    'closed': 'Whether market is closed',
-    'acceptingOrders': 'Whether new orders can be placed',
-    'endDate': 'When the market closes/resolves',
-    
-    # TRADING MECHANICS
-    'orderMinSize': 'Minimum order size allowed',
-    'orderPriceMinTickSize': 'Minimum price increment for orders',
-    'enableOrderBook': 'Whether order book trading is enabled'
-}
+    def _prepare_markets(self, df: pd.DataFrame) -> pd.DataFrame:
+        df.rename(columns=FRAME_COLUMNS, inplace=True)
+        df['event_id'] = [events[0]['ticker'] if isinstance(events, list) and events else None for events in df['events']]
+        self.market_index.refresh(df)
+        # tick size / neg risk / min size for every token we might trade, so signing needs no lookups
+        token_metadata.update_from_markets(df)
+        return df
 
 
 
@@ -0,0 +1,158 @@
+from typing import Any, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from trading.datamodel.polymarket import LimitOrder, MarketBuy, MarketSell, OrderResult
+
+"""
+    book-walking fill simulator for paper trading and offline simulation.
+
+    every order is matched against the opposite side of its token's book, best level first:
+      - MarketBuy spends amount_usd on asks, MarketSell sells amount_shares into bids, never past their
+        max_price / min_price. market orders are FOK on the clob, so anything short of a complete fill is killed.
+      - LimitOrder takes the levels at or better than its price; the marketable part fills now and the rest
+        would rest on the book (not simulated - it comes back as a 'live' order with what did fill).
+
+    the whole batch is simulated at once: the relevant side of every book is packed into padded
+    (orders x levels) price / size arrays, best level first, and the walk is one cumsum + clip.
+
+    books can be py_clob_client OrderBookSummary objects (get_order_book / get_order_books), the book mirror's
+    BookSnapshot, or raw {'bids': [{'price', 'size'}], 'asks': [...]} dicts (recorded books) - in any level order.
+"""
+
+# relative shortfall still counted as a complete fill (float noise from summing levels)
+FILL_TOLERANCE = 1e-9
+
+FOK_KILLED = "order couldn't be fully filled, FOK orders are fully filled or killed (simulated)"
+
+
+class Fills(NamedTuple):
+    shares: np.ndarray      # shares bought / sold
+    usd: np.ndarray         # usdc paid / received
+    avg_price: np.ndarray   # usd / shares, nan when nothing filled
+    complete: np.ndarray    # the whole order amount filled
+
+
+def _side(book: Any, side: str) -> Sequence:
+    if isinstance(book, Mapping):
+        return book.get(side) or ()
+    return getattr(book, side, None) or ()
+
+
+def _level(level: Any) -> Tuple[float, float]:
+    if isinstance(level, Mapping):
+        return float(level['price']), float(level['size'])
+    if isinstance(level, tuple):
+        return float(level[0]), float(level[1])
+    return float(level.price), float(level.size)
+
+
+def book_levels(book: Any, side: str) -> np.ndarray:
+    """
+    (levels x 2) [price, size] array of one side of a book ('bids' / 'asks'), best level first.
+    """
+    levels = np.array([_level(l) for l in _side(book, side)], dtype=float).reshape(-1, 2)
+    order = np.argsort(levels[:, 0], kind='stable')
+    return levels[order[::-1] if side == 'bids' else order]
+
+
+def book_arrays(books: Sequence[Any], buys: np.ndarray, depth: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (prices, sizes), both (len(books) x levels): the side each order trades against (asks for buys, bids for sells),
+    best level first, zero padded. `depth` caps the levels kept per book.
+    """
+    ladders = []
+    for book, buy in zip(books, buys):
+        ladders.append(book_levels(book, 'asks' if buy else 'bids')[:depth])
+
+    width = max((len(l) for l in ladders), default=0)
+    prices = np.zeros((len(ladders), width))
+    sizes = np.zeros((len(ladders), width))
+    for i, ladder in enumerate(ladders):
+        prices[i, :len(ladder)] = ladder[:, 0]
+        sizes[i, :len(ladder)] = ladder[:, 1]
+    return prices, sizes
+
+
+def simulate_fills(
+    buys: np.ndarray,
+    amounts: np.ndarray,
+    in_usd: np.ndarray,
+    limits: np.ndarray,
+    prices: np.ndarray,
+    sizes: np.ndarray,
+) -> Fills:
+    """
+    walks every order down its book in one go.
+
+    buys / in_usd are bool per order, amounts are usdc where in_usd else shares, limits the worst acceptable price
+    (1 for market buys, 0 for market sells). prices / sizes come from book_arrays.
+    """
+    buys, in_usd = buys[:, None], in_usd[:, None]
+    eligible = np.where(buys, prices <= limits[:, None], prices >= limits[:, None]) & (prices > 0)
+    sizes = np.where(eligible, sizes, 0.0)
+
+    # what each level can absorb, in the order's own unit
+    capacity = np.where(in_usd, sizes * prices, sizes)
+    before = np.cumsum(capacity, axis=1) - capacity
+    taken = np.clip(amounts[:, None] - before, 0.0, capacity)
+    shares = np.where(in_usd, np.divide(taken, prices, out=np.zeros_like(taken), where=prices > 0), taken)
+
+    filled_shares = shares.sum(axis=1)
+    filled_usd = (shares * prices).sum(axis=1)
+    filled = np.where(in_usd[:, 0], filled_usd, filled_shares)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_price = np.where(filled_shares > 0, filled_usd / filled_shares, np.nan)
+    return Fills(filled_shares, filled_usd, avg_price, filled >= amounts * (1 - FILL_TOLERANCE))
+
+
+def simulate_orders(
+    orders: Sequence[Union[MarketBuy, MarketSell, LimitOrder]],
+    books: Mapping[str, Any],
+    depth: Optional[int] = None,
+) -> List[OrderResult]:
+    """
+    OrderResults (same conventions as the clob's, see PolymarketStrategy.execute) for a batch of orders against
+    `books` (token id -> book). orders whose token has no book come back failed.
+    """
+    results: List[Optional[OrderResult]] = [None] * len(orders)
+    idx, buys, amounts, in_usd, limits, order_books = [], [], [], [], [], []
+    for i, order in enumerate(orders):
+        book = books.get(order.token_id)
+        if book is None:
+            results[i] = OrderResult(order=order, success=False, errorMsg=f"no order book for token {order.token_id}")
+            continue
+        if isinstance(order, MarketBuy):
+            row = (True, order.amount_usd, True, 1.0 if order.max_price is None else order.max_price)
+        elif isinstance(order, MarketSell):
+            row = (False, order.amount_shares, False, 0.0 if order.min_price is None else order.min_price)
+        elif isinstance(order, LimitOrder):
+            row = (order.side.upper() == 'BUY', order.size, False, order.price)
+        else:
+            raise ValueError(f"Invalid order type: {order}")
+        idx.append(i)
+        order_books.append(book)
+        for column, value in zip((buys, amounts, in_usd, limits), row):
+            column.append(value)
+
+    if idx:
+        buys = np.array(buys, dtype=bool)
+        prices, sizes = book_arrays(order_books, buys, depth)
+        fills = simulate_fills(buys, np.array(amounts, dtype=float), np.array(in_usd, dtype=bool), np.array(limits, dtype=float), prices, sizes)
+        for k, i in enumerate(idx):
+            results[i] = _order_result(orders[i], bool(buys[k]), fills.shares[k], fills.usd[k], bool(fills.complete[k]))
+    return results
+
+
+def _order_result(order, buy: bool, shares: float, usd: float, complete: bool) -> OrderResult:
+    if not isinstance(order, LimitOrder) and not complete:
+        return OrderResult(order=order, success=False, status='unmatched', errorMsg=FOK_KILLED)
+    # making = what we give up (usd on buys, shares on sells), taking = what we get
+    making, taking = (usd, shares) if buy else (shares, usd)
+    return OrderResult(
+        order=order,
+        success=True,
+        status='matched' if complete else 'live',
+        makingAmount=str(making),
+        takingAmount=str(taking),
+    )
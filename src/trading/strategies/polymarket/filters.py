@@ -0,0 +1,404 @@
+import ast
+import re
+import threading
+from datetime import datetime
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from polymarket.gamma_api.client import format_datetime
+from polymarket.gamma_api.schemas import MarketRequest
+
+"""
+    declarative market filters and a tiny query planner.
+
+    a strategy describes which markets it wants as a list of predicates - (field, op, value) over the
+    market frame's columns - instead of a hand-built MarketRequest plus ad-hoc pandas masks:
+
+        [('volumeNum', '>=', 1e5), ('closed', '==', False), ('spread', '<=', 0.1), ('tag_id', '==', 2)]
+
+    plan_query splits that list into
+      - the part gamma can evaluate server side, folded into a MarketRequest (so those rows never leave gamma), and
+      - the residual predicates, evaluated locally as one vectorized mask over the returned frame.
+
+    predicates that gamma can only answer approximately (strict '>' / '<' against its inclusive _min / _max
+    params) are pushed down *and* kept in the residual, so the result is always exact.
+
+    predicates can also be written as expressions, in specs and in PolymarketStrategy.apply:
+
+        "volumeNum >= 1e5 and spread between 0.01 and 0.1 and outcomes1 in ['Yes', 'No'] and endDate notnull"
+
+    clauses are `field op value` joined by `and`, values are python literals. parse_expression turns them into
+    the same Predicates as the triples.
+
+    locally, predicates run as a CompiledFilter: most selective first (pass rates are remembered per
+    predicate across calls), and once few rows are left, later predicates only look at those rows.
+"""
+
+OPS = ('==', '!=', '<', '<=', '>', '>=', 'in', 'not in', 'between', 'isnull', 'notnull')
+# ops without a value
+UNARY_OPS = ('isnull', 'notnull')
+
+# below this fraction of surviving rows, the remaining predicates are evaluated on the survivors only
+SUBSET_FRACTION = 0.25
+# weight of the latest observation in a predicate's remembered pass rate
+SELECTIVITY_DECAY = 0.3
+# predicates evaluated on survivors only still learn their pass rate from (about) this many rows of the whole frame
+SELECTIVITY_SAMPLE = 256
+
+# frame column -> MarketRequest param for ==, or (min param, max param) for range ops.
+# both the raw gamma names and the strategy's renamed columns are accepted.
+EQUALITY_PARAMS = {
+    'closed': 'closed',
+    'active': 'active',
+    'archived': 'archived',
+    'tag_id': 'tag_id',
+}
+MEMBERSHIP_PARAMS = {
+    'id': 'id',
+    'slug': 'slug',
+    'conditionId': 'condition_ids',
+    'condition_id': 'condition_ids',
+    'clobTokenIds': 'clob_token_ids',
+}
+RANGE_PARAMS = {
+    'volumeNum': ('volume_num_min', 'volume_num_max'),
+    'liquidityNum': ('liquidity_num_min', 'liquidity_num_max'),
+    'startDate': ('start_date_min', 'start_date_max'),
+    'endDate': ('end_date_min', 'end_date_max'),
+    'end_date': ('end_date_min', 'end_date_max'),
+}
+# gamma field -> the column it becomes once a strategy prepares the frame (residual filters run on that frame)
+FRAME_COLUMNS = {'conditionId': 'condition_id', 'endDate': 'end_date'}
+# request-only params that have no column in the frame (clobTokenIds is split into clobTokenIds1 / 2):
+# these can only ever be pushed down
+SERVER_ONLY_FIELDS = {'tag_id', 'archived', 'clobTokenIds'}
+
+
+def _timestamp(value: datetime) -> pd.Timestamp:
+    return pd.Timestamp(value, tz='UTC') if value.tzinfo is None else pd.Timestamp(value)
+
+
+class Predicate(BaseModel):
+    field: str
+    op: str
+    value: Any = None
+
+    @classmethod
+    def of(cls, spec: Union["Predicate", Sequence, Dict[str, Any], str]) -> "Predicate":
+        """
+        accepts a Predicate, a (field, op, value) triple (what specs store), a {'field', 'op', 'value'} dict or
+        a single-clause expression ("spread <= 0.1").
+        """
+        if isinstance(spec, Predicate):
+            return spec
+        if isinstance(spec, str):
+            predicates = parse_expression(spec)
+            if len(predicates) != 1:
+                raise ValueError(f"expected a single filter clause, got {spec!r}")
+            return predicates[0]
+        if isinstance(spec, dict):
+            predicate = cls(**spec)
+        elif len(spec) == 2 and spec[1] in UNARY_OPS:
+            predicate = cls(field=spec[0], op=spec[1])
+        else:
+            field, op, value = spec
+            predicate = cls(field=field, op=op, value=value)
+        if predicate.op not in OPS:
+            raise ValueError(f"unknown filter op {predicate.op!r} in {spec!r} (expected one of {OPS})")
+        if predicate.op == 'between' and (not isinstance(predicate.value, (list, tuple)) or len(predicate.value) != 2):
+            raise ValueError(f"between takes a (low, high) pair, got {predicate.value!r}")
+        return predicate
+
+    def __str__(self) -> str:
+        if self.op in UNARY_OPS:
+            return f"{self.field} {self.op}"
+        if self.op == 'between':
+            return f"{self.field} between {self.value[0]!r} and {self.value[1]!r}"
+        return f"{self.field} {self.op} {self.value!r}"
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        vectorized boolean mask of the rows satisfying this predicate. missing values never match.
+        """
+        return self.mask_column(df[self.field])
+
+    def mask_column(self, column: pd.Series) -> np.ndarray:
+        """
+        mask over this predicate's column (or any slice of it).
+        """
+        if self.op == 'isnull':
+            return column.isna().to_numpy(dtype=bool)
+        if self.op == 'notnull':
+            return column.notna().to_numpy(dtype=bool)
+
+        value = self.value
+        if isinstance(value, datetime) or (self.op == 'between' and any(isinstance(v, datetime) for v in value)):
+            column = pd.to_datetime(column, utc=True, errors='coerce')
+            value = [_timestamp(v) for v in value] if self.op == 'between' else _timestamp(value)
+
+        if self.op == 'between':
+            out = (column >= value[0]) & (column <= value[1])
+        elif self.op == 'in':
+            out = column.isin(list(value))
+        elif self.op == 'not in':
+            out = ~column.isin(list(value)) & column.notna()
+        elif self.op == '==':
+            out = column == value
+        elif self.op == '!=':
+            out = (column != value) & column.notna()
+        elif self.op == '<':
+            out = column < value
+        elif self.op == '<=':
+            out = column <= value
+        elif self.op == '>':
+            out = column > value
+        else:
+            out = column >= value
+        return out.fillna(False).to_numpy(dtype=bool)
+
+
+_CLAUSE = re.compile(r"^\s*([A-Za-z_][\w.]*)\s+(not in|between|isnull|notnull|in|==|!=|<=|>=|<|>)(?:\s+(.*?))?\s*$", re.S)
+# `and` outside quoted strings
+_AND = re.compile(r"""\s+and\s+(?=(?:[^'"]|'[^']*'|"[^"]*")*$)""")
+
+
+def _literal(text: str, expression: str) -> Any:
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        raise ValueError(f"bad filter value {text!r} in {expression!r} (values are python literals, quote strings)") from None
+
+
+def parse_expression(expression: str) -> List[Predicate]:
+    """
+    "field op value and field op value ..." -> Predicates. `between` takes "low and high".
+    """
+    parts = _AND.split(expression.strip())
+    predicates = []
+    while parts:
+        clause = parts.pop(0)
+        match = _CLAUSE.match(clause)
+        if match is None:
+            raise ValueError(f"can't parse filter clause {clause!r} in {expression!r}")
+        field, op, rest = match.groups()
+        if op in UNARY_OPS:
+            if rest:
+                raise ValueError(f"{op} takes no value: {clause!r}")
+            predicates.append(Predicate(field=field, op=op))
+            continue
+        if rest is None:
+            raise ValueError(f"missing value in filter clause {clause!r}")
+        if op == 'between':
+            if not parts:
+                raise ValueError(f"between needs 'low and high': {clause!r}")
+            value = (_literal(rest, expression), _literal(parts.pop(0), expression))
+        else:
+            value = _literal(rest, expression)
+        predicates.append(Predicate.of((field, op, value)))
+    return predicates
+
+
+def as_predicates(spec: Union[Predicate, Sequence, Dict[str, Any], str]) -> List[Predicate]:
+    """
+    one spec filter entry -> its predicates: an expression may hold several clauses, anything else is one predicate.
+    """
+    if isinstance(spec, str):
+        return parse_expression(spec)
+    return [Predicate.of(spec)]
+
+
+_selectivity: Dict[Tuple[str, str, Any], float] = {}
+_selectivity_lock = threading.Lock()
+
+
+def _stat_key(predicate: Predicate) -> Tuple[str, str, Any]:
+    # times are relative to "now", which moves every run: those predicates share one entry per (field, op)
+    value = predicate.value
+    if isinstance(value, datetime) or (isinstance(value, (list, tuple)) and any(isinstance(v, datetime) for v in value)):
+        value = None
+    elif isinstance(value, (list, tuple, set)):
+        value = tuple(value)
+    try:
+        hash(value)
+    except TypeError:
+        value = repr(value)
+    return predicate.field, predicate.op, value
+
+
+class CompiledFilter:
+    """
+    a conjunction of predicates evaluated as one mask, most selective predicate first.
+
+    pass rates are remembered per predicate (per (field, op) for time bounds - "now" changes every run, the
+    selectivity doesn't) so the ordering carries over between the plans a strategy builds every cycle. they're
+    always measured over the whole frame, never just the rows earlier predicates let through, or a predicate
+    would be ranked by how it does after the others. declared order breaks ties.
+    """
+
+    def __init__(self, predicates: Sequence[Union[Predicate, Sequence, Dict[str, Any], str]]):
+        self.predicates = [p for spec in predicates for p in as_predicates(spec)]
+
+    def order(self) -> List[Predicate]:
+        with _selectivity_lock:
+            rates = [_selectivity.get(_stat_key(p), 1.0) for p in self.predicates]
+        return [self.predicates[i] for i in sorted(range(len(rates)), key=rates.__getitem__)]
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        n = len(df)
+        mask = np.ones(n, dtype=bool)
+        alive = n
+        for predicate in self.order():
+            if not alive:
+                break
+            column = df[predicate.field]
+            if alive < n * SUBSET_FRACTION:
+                # few rows left: only look at those, and learn the pass rate off a strided sample of every row
+                rows = np.flatnonzero(mask)
+                mask[rows] = predicate.mask_column(column.iloc[rows])
+                self._observe(predicate, predicate.mask_column(column.iloc[::max(1, n // SELECTIVITY_SAMPLE)]))
+            else:
+                passed = predicate.mask_column(column)
+                mask &= passed
+                self._observe(predicate, passed)
+            alive = int(mask.sum())
+        return mask
+
+    @staticmethod
+    def _observe(predicate: Predicate, passed: np.ndarray):
+        if not len(passed):
+            return
+        rate = float(passed.mean())
+        key = _stat_key(predicate)
+        with _selectivity_lock:
+            previous = _selectivity.get(key)
+            _selectivity[key] = rate if previous is None else previous + SELECTIVITY_DECAY * (rate - previous)
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df[self.mask(df)]
+
+    def __str__(self) -> str:
+        return " and ".join(map(str, self.predicates)) or "true"
+
+
+def _param_value(value: Any) -> Any:
+    return format_datetime(value) if isinstance(value, datetime) else value
+
+
+def push_down(predicate: Predicate) -> Optional[Tuple[str, Any, bool]]:
+    """
+    (request param, value, exact) for a predicate gamma can evaluate, None if it has to stay local.
+    `exact` is False when the server side filter is looser than the predicate.
+    """
+    field, op, value = predicate.field, predicate.op, predicate.value
+    if op == '==' and field in EQUALITY_PARAMS:
+        return EQUALITY_PARAMS[field], value, True
+    if op == 'in' and field in MEMBERSHIP_PARAMS:
+        return MEMBERSHIP_PARAMS[field], list(value), True
+    if op == '==' and field in MEMBERSHIP_PARAMS:
+        return MEMBERSHIP_PARAMS[field], [value], True
+    if op in ('>=', '>', '<=', '<') and field in RANGE_PARAMS:
+        low, high = RANGE_PARAMS[field]
+        return (low if op in ('>=', '>') else high), _param_value(value), op in ('>=', '<=')
+    return None
+
+
+def _tighten(param: str, current: Any, new: Any) -> Any:
+    """
+    two predicates pushed onto the same request param -> keep the stricter one.
+    """
+    if current is None:
+        return new
+    if param.endswith('_min'):
+        return max(current, new)
+    if param.endswith('_max'):
+        return min(current, new)
+    if isinstance(current, list):
+        return [v for v in current if v in set(new)]
+    if current != new:
+        raise ValueError(f"contradictory filters on {param}: {current!r} vs {new!r}")
+    return current
+
+
+class QueryPlan:
+    """
+    a MarketRequest for the server plus the residual predicates to apply to what comes back.
+    after execution, `transfer` holds what the plan cost on the wire: {'requests', 'bytes', 'rows', 'kept'}.
+    """
+
+    def __init__(self, request: MarketRequest, pushed: List[Predicate], residual: List[Predicate]):
+        self.request = request
+        self.pushed = pushed
+        self.residual = residual
+        self.transfer: Dict[str, int] = {}
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        applies the residual predicates (one combined mask, one copy). raises ValueError for predicates on
+        columns the frame doesn't carry.
+        """
+        if not self.residual or df.empty:
+            return df
+        missing = sorted({p.field for p in self.residual} - set(df.columns))
+        if missing:
+            raise ValueError(f"can't filter on {missing} locally: the market frame has no such columns")
+        return CompiledFilter(self.residual)(df).reset_index(drop=True)
+
+    def explain(self) -> str:
+        params = self.request.model_dump(exclude_none=True)
+        return (
+            f"server: {params} | "
+            f"local: {[str(p) for p in self.residual] or 'none'}"
+            + (f" | transferred {self.transfer}" if self.transfer else "")
+        )
+
+
+def expand(predicates: Sequence[Union[Predicate, Sequence, Dict[str, Any], str]]) -> List[Predicate]:
+    """
+    predicates as plan_query sees them: expressions split into clauses, `between` into its two range bounds
+    (so both can be pushed down).
+    """
+    out = []
+    for predicate in (p for spec in predicates for p in as_predicates(spec)):
+        if predicate.op == 'between':
+            low, high = predicate.value
+            out += [Predicate(field=predicate.field, op='>=', value=low), Predicate(field=predicate.field, op='<=', value=high)]
+        else:
+            out.append(predicate)
+    return out
+
+
+def _frame_predicate(predicate: Predicate) -> Predicate:
+    field = FRAME_COLUMNS.get(predicate.field)
+    return predicate if field is None else predicate.model_copy(update={'field': field})
+
+
+def plan_query(
+    predicates: Sequence[Union[Predicate, Sequence, Dict[str, Any]]],
+    base: Optional[MarketRequest] = None,
+    supported: Optional[Collection[str]] = None,
+) -> QueryPlan:
+    """
+    splits predicates into MarketRequest params (merged over `base`, e.g. limit / order) and a residual local filter.
+    `supported` is the set of request params the market source answers (None = all of them, i.e. gamma; the
+    catalog passes CATALOG_REQUEST_FIELDS): predicates on any other param stay in the residual instead.
+    """
+    params = (base or MarketRequest()).model_dump(exclude_none=True)
+    pushed, residual = [], []
+    for predicate in expand(predicates):
+        target = push_down(predicate)
+        if target is not None and supported is not None and target[0] not in supported:
+            target = None
+        if target is None:
+            if predicate.field in SERVER_ONLY_FIELDS:
+                raise ValueError(f"{predicate} can't be evaluated: {predicate.field} has no local column and the market source can't filter on it that way")
+            residual.append(_frame_predicate(predicate))
+            continue
+        param, value, exact = target
+        params[param] = _tighten(param, params.get(param), value)
+        pushed.append(predicate)
+        if not exact:
+            residual.append(_frame_predicate(predicate))
+    return QueryPlan(MarketRequest(**params), pushed, residual)
@@ -0,0 +1,238 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from prometheus_client import Counter
+
+from trading.datamodel.polymarket import LimitOrder, MarketBuy, MarketSell, OrderResult
+from utils.log import logger
+
+"""
+    cross-strategy order netting for strategies trading the same account under the StrategyManager.
+
+    one strategy buying a token while another sells it in the same minute pays the spread twice and makes
+    two api calls for what is, on the shared wallet, almost no change at all. the netter collects the market
+    orders every strategy submits within `window_seconds`, and per (account, token):
+
+      - crosses buys against sells internally at the token's mid price - no order, the shares just change
+        hands between the strategies' books (the wallet holds them either way)
+      - sends only the residual (one MarketBuy for the excess usdc, or one MarketSell for the excess shares)
+        through the first submitter's normal execution path (router / batching / parallel per its spec)
+      - hands every strategy an OrderResult for each of its own orders: the crossed side fills in full at mid,
+        the residual side shares the crossed shares and whatever the residual order filled pro rata to size
+
+    limit orders, virtual sells and orders carrying a price cap (max_price / min_price) aren't nettable - they
+    go out on their owner's own path, untouched. tokens nobody can price aren't netted either.
+
+    the first strategy to submit in a window waits it out and then does the work for everyone; the others
+    block until their results are in. a window holding a single strategy's orders is sent as is.
+"""
+
+# seconds the first submitter waits for other strategies' orders
+NETTING_WINDOW_SECONDS = 1.0
+
+netted_orders = Counter(
+    "polymarket_netted_orders",
+    "market orders submitted to the cross-strategy netter, by outcome (crossed / residual / sent)",
+    ["outcome"],
+)
+
+Order = Union[MarketBuy, MarketSell, LimitOrder]
+
+
+def nettable(order: Order) -> bool:
+    if isinstance(order, MarketBuy):
+        return order.max_price is None
+    if isinstance(order, MarketSell):
+        return not order.virtual and order.min_price is None
+    return False
+
+
+class _Batch:
+    def __init__(self):
+        self.entries: List[Tuple[Any, List[Order]]] = []   # (strategy, nettable orders)
+        self.results: List[Optional[List[OrderResult]]] = []
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+def net_token(orders: List[Order], mid: float) -> Tuple[Optional[Order], float]:
+    """
+    the residual order for one token's buys and sells (None when they cancel out) and the shares crossed internally.
+    """
+    buy_usd = sum(o.amount_usd for o in orders if isinstance(o, MarketBuy))
+    sell_shares = sum(o.amount_shares for o in orders if isinstance(o, MarketSell))
+    crossed = min(buy_usd / mid, sell_shares)
+    template = next(o for o in orders if isinstance(o, MarketBuy if buy_usd / mid > sell_shares else MarketSell))
+    if isinstance(template, MarketBuy):
+        residual = buy_usd - crossed * mid
+        return (template.model_copy(update={'amount_usd': residual}) if residual > 1e-9 else None), crossed
+    residual = sell_shares - crossed
+    return (template.model_copy(update={'amount_shares': residual}) if residual > 1e-9 else None), crossed
+
+
+def allocate(orders: List[Order], mid: float, crossed: float, residual: Optional[OrderResult]) -> List[OrderResult]:
+    """
+    one OrderResult per order of a netted token: crossed shares at `mid` plus the residual's fill, pro rata.
+    """
+    filled = residual is not None and residual.success and float(residual.makingAmount or 0) > 0
+    residual_making = float(residual.makingAmount) if filled else 0.0
+    residual_taking = float(residual.takingAmount or 0) if filled else 0.0
+    residual_buy = residual is not None and isinstance(residual.order, MarketBuy)
+
+    # each side in (shares, usd)
+    buy_shares, buy_usd = crossed, crossed * mid
+    sell_shares, sell_usd = crossed, crossed * mid
+    if residual_buy:
+        buy_shares, buy_usd = buy_shares + residual_taking, buy_usd + residual_making
+    elif residual is not None:
+        sell_shares, sell_usd = sell_shares + residual_making, sell_usd + residual_taking
+
+    buy_total = sum(o.amount_usd for o in orders if isinstance(o, MarketBuy))
+    sell_total = sum(o.amount_shares for o in orders if isinstance(o, MarketSell))
+    out = []
+    for order in orders:
+        buy = isinstance(order, MarketBuy)
+        weight = order.amount_usd / buy_total if buy else order.amount_shares / sell_total
+        shares, usd = (buy_shares, buy_usd) if buy else (sell_shares, sell_usd)
+        # the side the residual was on only completes if the residual did
+        complete = residual is None or buy != residual_buy or filled
+        if shares <= 1e-12:
+            out.append(OrderResult(order=order, success=False, status='unmatched', errorMsg=residual.errorMsg or "residual order failed"))
+            continue
+        result = {
+            'order': order,
+            'success': True,
+            'status': 'matched' if complete else 'partial',
+            # making = what the strategy gives up (usd on buys, shares on sells), taking = what it gets
+            'makingAmount': str(weight * (usd if buy else shares)),
+            'takingAmount': str(weight * (shares if buy else usd)),
+        }
+        if not complete and residual.errorMsg:
+            result['errorMsg'] = f"netted, residual: {residual.errorMsg}"
+        if residual is not None and buy == residual_buy and residual.transactionsHashes:
+            result['transactionsHashes'] = residual.transactionsHashes
+        out.append(OrderResult(**result))
+    return out
+
+
+class OrderNetter:
+    """
+    shared by every strategy of a StrategyManager. PolymarketStrategy.execute submits through it when set.
+    """
+
+    def __init__(self, window_seconds: float = NETTING_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._batch: Optional[_Batch] = None
+
+    def submit(self, strategy, orders: List[Order]) -> List[OrderResult]:
+        """
+        results for `orders`, in order. blocks for up to the window (plus the execution).
+        """
+        own = [i for i, o in enumerate(orders) if not nettable(o)]
+        pooled = [i for i, o in enumerate(orders) if nettable(o)]
+        results: List[Optional[OrderResult]] = [None] * len(orders)
+
+        if own:
+            for i, res in zip(own, strategy.route_orders([orders[i] for i in own])):
+                results[i] = res
+        if pooled:
+            for i, res in zip(pooled, self._join(strategy, [orders[i] for i in pooled])):
+                results[i] = res
+        return results
+
+    def _join(self, strategy, orders: List[Order]) -> List[OrderResult]:
+        with self._lock:
+            leader = self._batch is None
+            if leader:
+                self._batch = _Batch()
+            batch = self._batch
+            slot = len(batch.entries)
+            batch.entries.append((strategy, orders))
+            batch.results.append(None)
+
+        if leader:
+            time.sleep(self.window_seconds)
+            with self._lock:
+                self._batch = None
+            try:
+                self._run(batch)
+            except BaseException as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[slot]
+
+    def _run(self, batch: _Batch):
+        # only the same wallet can cross internally
+        accounts: Dict[Any, List[int]] = defaultdict(list)
+        for slot, (strategy, _) in enumerate(batch.entries):
+            accounts[strategy.clob_client.proxy_address].append(slot)
+        for slots in accounts.values():
+            self._run_account(batch, slots)
+
+    def _run_account(self, batch: _Batch, slots: List[int]):
+        executor = batch.entries[slots[0]][0]
+        flat: List[Tuple[int, int, Order]] = [
+            (slot, k, order) for slot in slots for k, order in enumerate(batch.entries[slot][1])
+        ]
+        for slot in slots:
+            batch.results[slot] = [None] * len(batch.entries[slot][1])
+
+        by_token: Dict[str, List[int]] = defaultdict(list)
+        for n, (_, _, order) in enumerate(flat):
+            by_token[order.token_id].append(n)
+        # worth netting: the token is bought and sold, or several strategies send the same side
+        candidates = [t for t, ns in by_token.items() if len(ns) > 1]
+        mids = self._mids(executor, candidates)
+
+        outgoing: List[Order] = []
+        plan: List[Tuple[List[int], Optional[int], float, float]] = []   # (flat indices, outgoing index, mid, crossed)
+        for token_id, ns in by_token.items():
+            mid = mids.get(token_id)
+            if len(ns) == 1 or mid is None:
+                for n in ns:
+                    plan.append(([n], len(outgoing), None, 0.0))
+                    outgoing.append(flat[n][2])
+                continue
+            residual, crossed = net_token([flat[n][2] for n in ns], mid)
+            plan.append((ns, len(outgoing) if residual is not None else None, mid, crossed))
+            if residual is not None:
+                outgoing.append(residual)
+            # crossed: some of the token's orders were matched internally; residual: same side only, merged into one order
+            netted_orders.labels("crossed" if crossed > 1e-12 else "residual").inc(len(ns))
+
+        sent = executor.route_orders(outgoing) if outgoing else []
+        netted_orders.labels("sent").inc(len(outgoing))
+        logger.info(f"netting: {len(flat)} orders from {len(slots)} strategies -> {len(outgoing)} sent, {sum(p[3] for p in plan):.2f} shares crossed internally")
+
+        for ns, out_idx, mid, crossed in plan:
+            residual = sent[out_idx] if out_idx is not None else None
+            if mid is None:
+                # sent as is: the result goes back untouched
+                allocated = [residual]
+            else:
+                allocated = allocate([flat[n][2] for n in ns], mid, crossed, residual)
+            for n, res in zip(ns, allocated):
+                slot, k, _ = flat[n]
+                batch.results[slot][k] = res
+
+    @staticmethod
+    def _mids(strategy, token_ids: List[str]) -> Dict[str, float]:
+        if not token_ids:
+            return {}
+        buys = strategy.get_current_prices(token_ids, side='BUY')
+        sells = strategy.get_current_prices(token_ids, side='SELL')
+        mids = {}
+        for token_id in token_ids:
+            prices = [p for p in (buys.get(token_id), sells.get(token_id)) if p]
+            if prices:
+                mids[token_id] = sum(prices) / len(prices)
+        return mids
@@ -1,5 +1,6 @@
 import os
-from typing import Any, Dict, List, Union
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -15,7 +16,8 @@ from trading.strategies.polymarket.base import (
     PolymarketStrategy,
     StrategyState,
 )
-from py_clob_client.clob_types import BookParams
+from trading.strategies.polymarket.filters import Predicate, as_predicates, plan_query
+from polymarket.gamma_api.schemas import MarketRequest
 
 
 load_dotenv()
@@ -58,10 +60,81 @@ class SpecConfig(BaseModel):
     cash_out_price: float = 0.99
     sell_on_cash_out: bool = False
     consider_global_exposure: bool = True # do we look at JUST this srategies exposure or my total exposure wrt an event?
+    use_catalog: bool = False # read candidate markets from the local market catalog (delta-synced) instead of hitting gamma
+    batch_orders: bool = False # sign everything, then submit through batched clob post_orders instead of one request per order
+    signing_workers: int = 0 # >0: sign batched orders on a process pool of this many workers instead of the thread pool
+    max_slippage: Optional[float] = None # set (e.g. 0.02) to route market orders as children within this slippage of the best price
+    max_child_usd: Optional[float] = None # cap on a single child order's size
+    child_waves: int = 1 # >1: route what didn't fill again after child_interval_seconds, against the refreshed book
+    child_interval_seconds: float = 0
+    max_price_age: Optional[float] = None # seconds; tighter staleness bound than the shared price cache's for this strategy's clob prices
+    risk_gate: bool = True # check the whole order batch before execution: cash, caps, duplicate tokens, oversized sells
+    max_order_usd: Optional[float] = None # risk gate: cap on a single buy
+    max_event_usd: Optional[float] = None # risk gate: cap on held + bought usdc per event
+    min_order_usd: float = 1 # risk gate: buys clipped below this are dropped (polymarket's minimum market buy)
+    use_book_mirror: bool = False # keep live order books for held / candidate tokens off the clob market websocket
+    filters: List[Any] = [] # extra market filters, (field, op, value) triples or expressions, e.g. ["tag_id", "==", 2] / "spread between 0.01 and 0.05" - pushed to gamma where it can take them
+
+
+def candidate_filters(spec: Dict[str, Any]) -> List[Predicate]:
+    """
+    the spec's market selection as declarative predicates; plan_query decides what runs where.
+    """
+    # floored to the minute so strategies waking up a few seconds apart share a cached response
+    now = datetime.now().replace(second=0, microsecond=0)
+    predicates = [
+        Predicate(field='closed', op='==', value=False),
+        Predicate(field='volumeNum', op='>=', value=spec['minimum_volume']),
+        Predicate(field='liquidityNum', op='>=', value=spec['minimum_liquidity']),
+        Predicate(field='startDate', op='>=', value=now - timedelta(days=spec['look_back_days'])),
+        Predicate(field='end_date', op='>=', value=now),
+        Predicate(field='spread', op='<=', value=spec['maximum_spread']),
+    ]
+    if spec.get('days_to_end') is not None:
+        predicates.append(Predicate(field='end_date', op='<=', value=now + timedelta(days=spec['days_to_end'])))
+    return predicates + [p for f in spec.get('filters') or () for p in as_predicates(f)]
+
+
+def select_candidates(cands: pd.DataFrame, spec: Dict[str, Any]) -> pd.DataFrame:
+    """
+    one market per (single-market) event: the one whose expensive side is a "No" within the price bounds and
+    closest to the target price (first one on ties). rows come out sorted by event_id, with event_id as the
+    last column - exactly what the old groupby('event_id').apply(select_row) produced, without a python call per event.
+    """
+    # the expensive side of every market
+    msk = (cands['outcomePrices1'] < cands['outcomePrices2'])
+    cands['expensivePrice'] = np.maximum(cands['outcomePrices1'], cands['outcomePrices2'])
+    cands['expensiveToken'] = cands['clobTokenIds1']
+    cands.loc[msk, 'expensiveToken'] = cands['clobTokenIds2'][msk]
+    cands['expensiveBet'] = cands['outcomes1']
+    cands.loc[msk, 'expensiveBet'] = cands['outcomes2'][msk]
+    cands['eventCount'] = cands['events'].str.len()
+    cands = cands[cands['eventCount'] == 1].reset_index()
+
+    target_price = spec.get('target_price') or (spec['price_lower_bound'] + spec['price_upper_bound']) / 2
+    price = cands['expensivePrice']
+    msk = (
+        (cands['expensiveBet'] == 'No') &
+        price.notna() &
+        (price <= spec['price_upper_bound']) &
+        (price >= spec['price_lower_bound']) &
+        cands['event_id'].notna()   # groupby used to drop these
+    )
+    # stable sort: among equally close markets the first one (in frame order) stays first, like idxmin
+    ranked = (
+        cands[msk]
+            .assign(_distance=(price[msk] - target_price).abs())
+            .sort_values(['event_id', '_distance'], kind='mergesort')
+            .drop_duplicates('event_id', keep='first')
+            .drop(columns='_distance')
+    )
+    columns = [c for c in ranked.columns if c != 'event_id'] + ['event_id']
+    return ranked[columns].reset_index(drop=True)
 
 
 # TODO: calculate corelation between events and make connected components before entering -> else we end up entering 5 positions which all depend on the epstein files NOT being released
 class NothingEverHappens(PolymarketStrategy):
+    spec_config = SpecConfig
 
     @footprint()
     def __init__(self, state: StrategyState, SessionFactory = None):
@@ -70,53 +143,10 @@ class NothingEverHappens(PolymarketStrategy):
     @footprint()
     def get_candidate_markets(self):
         logger.info("retrieving candidate markets..")
-        cands = self.get_recent_markets(
-            look_back_days=self.state.spec['look_back_days'],
-            minimum_volume=self.state.spec['minimum_volume'],
-            minimum_liquidity=self.state.spec['minimum_liquidity'],
-            limit=self.state.spec['limit'],
-            days_to_end=self.state.spec['days_to_end']
-        )
+        plan = plan_query(candidate_filters(self.state.spec), MarketRequest(limit=self.state.spec['limit']), supported=self.request_fields)
+        cands = self.get_planned_markets(plan)
         logger.info("cleaning market data..")
-
-        # clean and filter candidate markets
-        msk = (cands['outcomePrices1'] < cands['outcomePrices2'])
-        cands['expensivePrice'] = np.maximum(cands['outcomePrices1'], cands['outcomePrices2'])
-        cands['expensiveToken'] = cands['clobTokenIds1']
-        cands.loc[msk, 'expensiveToken'] = cands['clobTokenIds2'][msk]
-        cands['expensiveBet'] = cands['outcomes1']
-        cands.loc[msk, 'expensiveBet'] = cands['outcomes2'][msk]
-        cands['eventCount'] = cands['events'].apply(lambda i: len(i))
-        cands = cands[cands['eventCount'] == 1]
-        cands = cands[cands['spread'] <= self.state.spec['maximum_spread']].reset_index()
-
-        target_price = self.state.spec.get('target_price') or (self.state.spec['price_lower_bound'] + self.state.spec['price_upper_bound']) / 2
-
-        def select_row(grp):
-            msk = (
-                (grp['expensiveBet'] == 'No') &
-                (~pd.isnull(grp['expensivePrice'])) &
-                (grp['expensivePrice'] <= self.state.spec['price_upper_bound']) &
-                (grp['expensivePrice'] >= self.state.spec['price_lower_bound'])
-            )
-            if not msk.any():
-                return pd.DataFrame()
-
-            _cands = grp[msk]
-            row = _cands.loc[[_cands['expensivePrice'].sub(target_price).abs().idxmin()]]
-
-            # add the group key manually (we can get it from the group index)
-            row['event_id'] = grp.name
-            return row
-
-
-        final_cands = (
-            cands.groupby('event_id', group_keys=False)
-                .apply(select_row, include_groups=False)
-                .reset_index(drop=True)
-        )
-
-        return final_cands
+        return select_candidates(cands, self.state.spec)
 
     @footprint()
     def rebalance(self, positions: Dict[str, Dict[str, Any]]) -> List[Union[MarketBuy, MarketSell]]:
@@ -128,34 +158,41 @@ class NothingEverHappens(PolymarketStrategy):
         if final_cands.shape[0] == 0:
             return []
 
+        if self.book_mirror is not None:
+            self.book_mirror.watch(final_cands['expensiveToken'])
+
         logger.info(f"no. of candidates: {final_cands.shape[0]}")
         logger.info("retrieving user positions..")
 
         # these are NOT the positions of THIS portfolio -> they are TOTAL positions on polymarket
         global_positions = self.get_user_positions().to_dict('records')
 
-        cur_prices = self.clob_client.get_prices(
-            [
-                BookParams(token_id = i.token_id, side="BUY")
-                for i in positions.values()
-            ] 
-        ) if len(positions) else {}
+        # live book where we mirror one, one batched get_prices for everything else
+        cur_prices = self.get_current_prices(positions.keys())
 
-        # the clob client returns get_prices as a dict: {token_id: {side: price}}
         # i now update our in-memory positions
         for k, v in cur_prices.items():
-            positions[k].cur_price = float(v['BUY'])
+            positions[k].cur_price = v
 
         
+        # data-api positions carry the event slug; the market index maps their token to the event ticker we key on
+        index = self.market_index.current
         global_event_exposure = set(i["eventSlug"] for i in global_positions)
-        local_event_exposure = set(pos.event_id for pos in positions.values())
+        global_event_exposure |= {index.event_for_token(i["asset"]) for i in global_positions if index.event_for_token(i["asset"])}
+        local_event_exposure = set(pos.event_id for pos in positions.values() if pos.event_id is not None)
 
         orders_to_place = []
-        cash_balance = self.state.cash_usd
+        # cash as of the positions snapshot, less what our resting limit buys hold
+        cash_balance = self.available_cash_usd
+
 
+        # exits are decided on this round's prices only: a position we couldn't price now waits for the next one
+        unpriced = [k for k in positions if k not in cur_prices]
+        if unpriced:
+            logger.warning(f"no current price for {len(unpriced)} positions, skipping their exit checks: {unpriced}")
 
         # positions which we'll cash out (already resolved/close to resolution)
-        for pos in positions.values():
+        for pos in (positions[k] for k in positions if k in cur_prices):
             if pos.cur_price > self.state.spec['cash_out_price']:
                 orders_to_place.append(
                     MarketSell(token_id=pos.token_id, amount_shares=pos.amount, expected_price=pos.cur_price, event_id=pos.event_id, virtual=True)
@@ -0,0 +1,200 @@
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from trading.datamodel.polymarket import LimitOrder, MarketBuy, MarketSell, PolymarketPosition
+
+"""
+    pre-trade risk gate over a whole order batch, between rebalance and execute.
+
+    rebalance builds its orders one at a time, so nothing looks at the batch as a whole: NEH's
+    cash_per_cand = max(cash / n, minimum_position_size) spends more than the cash there is as soon as
+    n * minimum_position_size > cash, two orders can hit the same token, and nothing caps an event.
+
+    the batch becomes a handful of arrays (one row per order) and every limit is one vectorized pass:
+      1. duplicates      - the first order per (token, side) is kept; a buy of a token we're also selling is dropped
+      2. sell size       - sells clipped to the shares we hold (virtual sells included)
+      3. max_order_usd   - each buy clipped to it
+      4. max_event_usd   - buys of an event scaled down pro rata so the event (held + bought) stays under it
+                           (buys without an event_id aren't capped here)
+      5. min_order_usd   - buys the caps clipped below it are dropped (the clob rejects them anyway)
+      6. cash            - as many whole buys as fit in the cash there is, in batch order; the rest are dropped.
+                           scaling everything down instead would push every buy under min_order_usd together
+                           whenever cash < n * min_order_usd
+
+    buys are measured in usdc (amount_usd, or price * size for limit buys), sells in shares. clipped orders
+    are model_copy'd, untouched ones passed through as they are.
+"""
+
+# slack for float noise when comparing clipped amounts
+EPSILON = 1e-9
+
+Order = Union[MarketBuy, MarketSell, LimitOrder]
+
+
+class RiskLimits(NamedTuple):
+    cash_usd: float = float('inf')
+    max_order_usd: Optional[float] = None
+    max_event_usd: Optional[float] = None
+    min_order_usd: float = 0.0
+
+
+class RiskReport(NamedTuple):
+    orders_in: int
+    orders_out: int
+    buy_usd_requested: float
+    buy_usd_approved: float
+    dropped: List[Tuple[Order, str]]                # (order, reason)
+    clipped: List[Tuple[Order, float, str]]         # (original order, approved amount, reason)
+
+    def summary(self) -> str:
+        return (
+            f"risk gate: {self.orders_out}/{self.orders_in} orders, buys ${self.buy_usd_approved:.2f} "
+            f"of ${self.buy_usd_requested:.2f} requested, {len(self.clipped)} clipped, {len(self.dropped)} dropped"
+        )
+
+
+def _is_buy(order: Order) -> bool:
+    if isinstance(order, LimitOrder):
+        return order.side.upper() == 'BUY'
+    return isinstance(order, MarketBuy)
+
+
+def _amount(order: Order) -> float:
+    # usdc for buys, shares for sells
+    if isinstance(order, MarketBuy):
+        return order.amount_usd
+    if isinstance(order, MarketSell):
+        return order.amount_shares
+    return order.price * order.size if order.side.upper() == 'BUY' else order.size
+
+
+def _with_amount(order: Order, amount: float) -> Order:
+    if isinstance(order, MarketBuy):
+        return order.model_copy(update={'amount_usd': amount})
+    if isinstance(order, MarketSell):
+        return order.model_copy(update={'amount_shares': amount})
+    return order.model_copy(update={'size': amount / order.price if order.side.upper() == 'BUY' else amount})
+
+
+def _codes(values: List[Any]) -> Tuple[np.ndarray, int]:
+    """
+    dense integer codes for arbitrary hashables (first seen = 0), and how many distinct ones there are.
+    """
+    lookup: Dict[Any, int] = {}
+    codes = np.fromiter((lookup.setdefault(v, len(lookup)) for v in values), dtype=np.int64, count=len(values))
+    return codes, len(lookup)
+
+
+def event_exposure(positions: Mapping[str, PolymarketPosition]) -> Dict[str, float]:
+    """
+    {event_id: usdc held}, valued at the current price where known, else the average entry price.
+    positions of unknown events aren't attributed to any.
+    """
+    exposure: Dict[str, float] = {}
+    for pos in positions.values():
+        if pos.event_id is None:
+            continue
+        price = pos.cur_price if pos.cur_price is not None else pos.avg_price
+        exposure[pos.event_id] = exposure.get(pos.event_id, 0.0) + pos.amount * price
+    return exposure
+
+
+def check_orders(
+    orders: List[Order],
+    positions: Mapping[str, PolymarketPosition],
+    limits: RiskLimits,
+) -> Tuple[List[Order], RiskReport]:
+    """
+    the orders that pass `limits` (clipped where needed, in their original order) and a report of what changed.
+    """
+    n = len(orders)
+    buys = np.fromiter((_is_buy(o) for o in orders), dtype=bool, count=n)
+    requested = np.fromiter((_amount(o) for o in orders), dtype=float, count=n)
+    tokens, _ = _codes([o.token_id for o in orders])
+    reason = np.full(n, '', dtype=object)
+    amount = requested.copy()
+
+    # 1. duplicates: first (token, side) wins, and we don't buy what we're selling in the same batch
+    pair = tokens * 2 + buys
+    _, first = np.unique(pair, return_index=True)
+    keep = np.zeros(n, dtype=bool)
+    keep[first] = True
+    reason[~keep] = 'duplicate order for token'
+    sold = np.isin(tokens, tokens[~buys])
+    conflict = keep & buys & sold
+    keep &= ~conflict
+    reason[conflict] = 'token is also being sold'
+
+    # 2. can't sell shares we don't hold
+    held = np.fromiter((positions[o.token_id].amount if o.token_id in positions else 0.0 for o in orders), dtype=float, count=n)
+    over = keep & ~buys & (amount > held + EPSILON)
+    amount[over] = held[over]
+    reason[over] = 'sell clipped to position'
+
+    # 3. per order cap
+    if limits.max_order_usd is not None:
+        over = keep & buys & (amount > limits.max_order_usd + EPSILON)
+        amount[over] = limits.max_order_usd
+        reason[over] = 'max_order_usd'
+
+    # 4. per event cap, pro rata within the event
+    live_buys = keep & buys
+    if limits.max_event_usd is not None and live_buys.any():
+        # orders without an event can't be attributed to one, so they're outside the event cap
+        has_event = np.fromiter((o.event_id is not None for o in orders), dtype=bool, count=n)
+        events, n_events = _codes([o.event_id for o in orders])
+        exposure = event_exposure(positions)
+        first_of = np.zeros(n_events, dtype=np.int64)
+        first_of[events] = np.arange(n)   # any order of the event will do, they share its event_id
+        held_usd = np.array([exposure.get(orders[i].event_id, 0.0) for i in first_of], dtype=float)
+        bought = np.bincount(events, weights=np.where(live_buys, amount, 0.0), minlength=n_events)
+        headroom = np.clip(limits.max_event_usd - held_usd, 0.0, None)
+        scale = np.minimum(1.0, np.divide(headroom, bought, out=np.ones_like(bought), where=bought > 0))
+        over = live_buys & has_event & (scale[events] < 1.0 - EPSILON)
+        amount[over] *= scale[events][over]
+        reason[over] = 'max_event_usd'
+
+    # 5. whatever the caps left too small to send, plus anything clipped to nothing
+    small = keep & ((buys & (amount < limits.min_order_usd - EPSILON)) | (amount <= EPSILON))
+    keep &= ~small
+    reason[small] = np.where(reason[small] == '', 'below min_order_usd', reason[small] + ', below min_order_usd')
+
+    # 6. cash: whole buys in order while they fit
+    live_buys = keep & buys
+    if amount[live_buys].sum() > limits.cash_usd + EPSILON:
+        rows = np.flatnonzero(live_buys)
+        spent = np.cumsum(amount[rows])
+        # the prefix that fits goes as is; past it, smaller buys may still fit in what's left
+        fit = int(np.searchsorted(spent, limits.cash_usd + EPSILON, side='right'))
+        left = limits.cash_usd - (spent[fit - 1] if fit else 0.0)
+        over = []
+        for i in rows[fit:]:
+            if amount[i] <= left + EPSILON:
+                left -= amount[i]
+            else:
+                over.append(i)
+        keep[over] = False
+        reason[over] = np.where(reason[over] == '', 'cash', reason[over] + ', cash')
+
+    out: List[Order] = []
+    dropped: List[Tuple[Order, str]] = []
+    clipped: List[Tuple[Order, float, str]] = []
+    changed = keep & (amount < requested - EPSILON)
+    for i in np.flatnonzero(~keep | changed):
+        if keep[i]:
+            clipped.append((orders[i], float(amount[i]), reason[i]))
+        else:
+            dropped.append((orders[i], reason[i]))
+    for i in np.flatnonzero(keep):
+        out.append(_with_amount(orders[i], float(amount[i])) if changed[i] else orders[i])
+
+    report = RiskReport(
+        orders_in=n,
+        orders_out=len(out),
+        buy_usd_requested=float(requested[buys].sum()),
+        buy_usd_approved=float(amount[keep & buys].sum()),
+        dropped=dropped,
+        clipped=clipped,
+    )
+    return out, report
@@ -0,0 +1,184 @@
+import math
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+from trading.datamodel.polymarket import LimitOrder, MarketBuy, MarketSell, OrderResult
+from trading.strategies.polymarket.fills import book_levels
+from utils.log import logger
+
+"""
+    child order router for large market orders.
+
+    one big FOK MarketBuy either dies on a thin book or walks deep into it. the router looks at the current
+    book, works out how much of the parent fits within `max_slippage` of the best price, and sends that as
+    FOK children capped at the slippage limit price (max_price / min_price), at most `max_child` each.
+
+    waves: with waves=1 every child of every parent goes out at once (through the strategy's normal, parallel /
+    batched execution). with waves > 1 the router sleeps `interval_seconds` after each wave, re-reads the
+    books and routes whatever the previous waves didn't fill - giving the book time to refill.
+
+    the children's results are folded back into one OrderResult per parent, so update_state books the parent
+    exactly as if it had been one order. whatever can't be routed within the budget simply isn't bought / sold.
+"""
+
+
+def slippage_limit(best: float, buy: bool, max_slippage: float, tick: float = 0.01) -> float:
+    """
+    the worst price a child may fill at: `max_slippage` (relative) off the best price, on the tick grid,
+    never inside the best price itself.
+    """
+    if buy:
+        limit = max(best, math.floor(best * (1 + max_slippage) / tick + 1e-9) * tick)
+        return round(min(limit, 1 - tick), 6)
+    limit = min(best, math.ceil(best * (1 - max_slippage) / tick - 1e-9) * tick)
+    return round(max(limit, tick), 6)
+
+
+def slice_order(
+    parent: Union[MarketBuy, MarketSell],
+    book: Any,
+    max_slippage: float,
+    max_child: Optional[float] = None,
+    amount: Optional[float] = None,
+    tick: float = 0.01,
+) -> List[Union[MarketBuy, MarketSell]]:
+    """
+    children for `amount` (default: the parent's whole amount - usdc for buys, shares for sells) that fit within
+    `max_slippage` of `book`'s best price. empty when the book has nothing within the budget.
+    """
+    buy = isinstance(parent, MarketBuy)
+    amount = (parent.amount_usd if buy else parent.amount_shares) if amount is None else amount
+    levels = book_levels(book, 'asks' if buy else 'bids')
+    if not len(levels) or amount <= 0:
+        return []
+
+    limit = slippage_limit(levels[0, 0], buy, max_slippage, tick)
+    prices, sizes = levels[:, 0], levels[:, 1]
+    within = prices <= limit + 1e-9 if buy else prices >= limit - 1e-9
+    capacity = float(((prices * sizes) if buy else sizes)[within].sum())
+    routable = min(amount, capacity)
+    if routable <= 0:
+        return []
+
+    n = max(1, math.ceil(routable / max_child - 1e-9)) if max_child else 1
+    if buy:
+        return [parent.model_copy(update={'amount_usd': routable / n, 'max_price': limit}) for _ in range(n)]
+    return [parent.model_copy(update={'amount_shares': routable / n, 'min_price': limit}) for _ in range(n)]
+
+
+def aggregate(parent: Union[MarketBuy, MarketSell], results: Sequence[OrderResult]) -> OrderResult:
+    """
+    one parent OrderResult out of its children's: amounts summed over the filled ones, errors joined.
+    """
+    filled = [r for r in results if r.success and float(r.makingAmount or 0) > 0]
+    errors = [r.errorMsg for r in results if r.errorMsg]
+    if not filled:
+        return OrderResult(
+            order=parent,
+            success=False,
+            status='unmatched',
+            errorMsg="; ".join(dict.fromkeys(errors)) or "nothing routable within the slippage budget",
+        )
+    making = sum(float(r.makingAmount) for r in filled)
+    taking = sum(float(r.takingAmount or 0) for r in filled)
+    wanted = parent.amount_usd if isinstance(parent, MarketBuy) else parent.amount_shares
+    optional = {
+        'orderID': ",".join(r.orderID for r in filled if r.orderID),
+        'transactionsHashes': [h for r in filled for h in (r.transactionsHashes or [])],
+        'errorMsg': "; ".join(dict.fromkeys(errors)),
+    }
+    return OrderResult(
+        order=parent,
+        success=True,
+        status='matched' if making >= wanted * (1 - 1e-9) else 'partial',
+        makingAmount=str(making),
+        takingAmount=str(taking),
+        **{k: v for k, v in optional.items() if v},
+    )
+
+
+class ExecutionRouter:
+    """
+    routes market orders as sliced children through `execute` (orders -> results, same order), using `books`
+    (token ids -> {token_id: book}) for depth. limit orders, virtual sells and tokens without a book pass straight through.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[List[Any]], List[OrderResult]],
+        books: Callable[[List[str]], Mapping[str, Any]],
+        max_slippage: float,
+        max_child: Optional[float] = None,
+        waves: int = 1,
+        interval_seconds: float = 0.0,
+        tick_size: Callable[[str], Optional[str]] = lambda token_id: None,
+    ):
+        self.execute_fn = execute
+        self.books_fn = books
+        self.max_slippage = max_slippage
+        self.max_child = max_child
+        self.waves = max(1, waves)
+        self.interval_seconds = interval_seconds
+        self.tick_size = tick_size
+
+    def execute(self, orders: List[Union[MarketBuy, MarketSell, LimitOrder]]) -> List[OrderResult]:
+        results: List[Optional[OrderResult]] = [None] * len(orders)
+        children: Dict[int, List[OrderResult]] = {}
+        remaining: Dict[int, float] = {}
+        passthrough: List[int] = []
+        for i, order in enumerate(orders):
+            if isinstance(order, (MarketBuy, MarketSell)) and not order.virtual:
+                children[i] = []
+                remaining[i] = order.amount_usd if isinstance(order, MarketBuy) else order.amount_shares
+            else:
+                passthrough.append(i)
+
+        for wave in range(self.waves):
+            pending = [i for i, left in remaining.items() if left > 1e-9]
+            if not pending and (wave or not passthrough):
+                break
+            if wave:
+                time.sleep(self.interval_seconds)
+            books = self.books_fn([orders[i].token_id for i in pending]) if pending else {}
+
+            batch: List[Any] = []
+            owners: List[int] = []
+            for i in pending:
+                order = orders[i]
+                if order.token_id not in books:
+                    if wave == 0:
+                        # no depth to route against: send the parent as is, like without the router
+                        passthrough.append(i)
+                    del remaining[i]
+                    continue
+                tick = float(self.tick_size(order.token_id) or 0.01)
+                sliced = slice_order(order, books[order.token_id], self.max_slippage, self.max_child, remaining[i], tick)
+                if not sliced:
+                    logger.info(f"router: nothing within {self.max_slippage:.1%} of the best price for {order.token_id}, {remaining[i]:.2f} left unrouted")
+                    del remaining[i]
+                    continue
+                batch += sliced
+                owners += [i] * len(sliced)
+
+            # parents without a book go out with the first wave
+            if wave == 0 and passthrough:
+                batch += [orders[i] for i in passthrough]
+                owners += [None] * len(passthrough)
+            if not batch:
+                break
+
+            logger.info(f"router: wave {wave + 1}/{self.waves}, {len(batch)} orders")
+            batch_results = self.execute_fn(batch)
+            pt = iter(passthrough)
+            for owner, res in zip(owners, batch_results):
+                if owner is None:
+                    results[next(pt)] = res
+                    continue
+                children[owner].append(res)
+                if res.success and res.makingAmount:
+                    remaining[owner] -= float(res.makingAmount)
+
+        for i, child_results in children.items():
+            if results[i] is None:
+                results[i] = aggregate(orders[i], child_results)
+        return results
@@ -45,3 +45,27 @@ def footprint(time_limit_seconds=2.0, memory_limit_mb=100.0):
         return wrapper
     return decorator
 
+
+
+class PhaseTimer:
+    """
+    wall-clock breakdown of a multi-step method: call .mark('phase') after each step, log str(timer) at the end.
+    """
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase: str) -> float:
+        now = time.perf_counter()
+        elapsed = now - self.last
+        self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+        self.last = now
+        return elapsed
+
+    @property
+    def total(self) -> float:
+        return self.last - self.start
+
+    def __str__(self) -> str:
+        parts = [f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in self.phases.items()]
+        return " | ".join(parts + [f"total {self.total * 1000:.1f}ms"])